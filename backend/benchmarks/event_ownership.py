@@ -0,0 +1,103 @@
+"""
+Event listing/counting benchmark: IN (...) over decision ids vs events.user_id.
+
+Seeds a throwaway user with N decisions (and a few events each) for several
+N, then times the old "collect every decision id, then IN (...)" pattern
+against filtering on the denormalized events.user_id column. Runs against
+DATABASE_URL, so point it at a development database.
+
+Usage:
+    python -m benchmarks.event_ownership --decisions 10 100 1000 10000
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, delete, func
+
+from core.database import SessionLocal
+from core.init_db import init_db
+from core import models
+
+
+def seed_user(db, decisions: int, events_per_decision: int) -> int:
+    """Create a user with the given number of decisions and events."""
+    tag = uuid.uuid4().hex[:12]
+    user = models.User(email=f"bench-{tag}@example.com", username=f"bench-{tag}", password_hash="x", status="approved")
+    db.add(user)
+    db.flush()
+
+    now = datetime.utcnow()
+    db.execute(insert(models.Decision), [
+        {"user_id": user.id, "title": f"Decision {i}", "created_at": now - timedelta(minutes=i), "updated_at": now}
+        for i in range(decisions)
+    ])
+    decision_ids = db.execute(select(models.Decision.id).filter(models.Decision.user_id == user.id)).scalars().all()
+    db.execute(insert(models.Event), [
+        {"decision_id": d, "user_id": user.id, "event_type": "update", "created_at": now}
+        for d in decision_ids
+        for _ in range(events_per_decision)
+    ])
+    db.commit()
+    return user.id
+
+
+def drop_user(db, user_id: int):
+    """Remove the benchmark user and everything it owns."""
+    db.execute(delete(models.Event).filter(models.Event.user_id == user_id))
+    db.execute(delete(models.Decision).filter(models.Decision.user_id == user_id))
+    db.execute(delete(models.User).filter(models.User.id == user_id))
+    db.commit()
+
+
+def legacy_pattern(db, user_id: int, limit: int):
+    """Fetch every decision id, then list and count events with IN (...)."""
+    decision_ids = db.execute(select(models.Decision.id).filter(models.Decision.user_id == user_id)).scalars().all()
+    db.execute(select(models.Event).filter(
+        models.Event.decision_id.in_(decision_ids)
+    ).order_by(models.Event.created_at, models.Event.id).limit(limit)).scalars().all()
+    db.execute(select(func.count(models.Event.id)).filter(models.Event.decision_id.in_(decision_ids))).scalar()
+
+
+def owner_pattern(db, user_id: int, limit: int):
+    """List and count events filtered on events.user_id."""
+    db.execute(select(models.Event).filter(
+        models.Event.user_id == user_id
+    ).order_by(models.Event.created_at, models.Event.id).limit(limit)).scalars().all()
+    db.execute(select(func.count(models.Event.id)).filter(models.Event.user_id == user_id)).scalar()
+
+
+def median_ms(func_, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func_()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(args):
+    init_db()
+    db = SessionLocal()
+    try:
+        print(f"{'decisions':>10} {'IN (...) ms':>12} {'user_id ms':>11} {'speedup':>8}")
+        for decisions in args.decisions:
+            user_id = seed_user(db, decisions, args.events_per_decision)
+            try:
+                legacy = median_ms(lambda: legacy_pattern(db, user_id, args.limit), args.repeat)
+                owner = median_ms(lambda: owner_pattern(db, user_id, args.limit), args.repeat)
+                print(f"{decisions:>10} {legacy:>12.2f} {owner:>11.2f} {legacy / owner:>7.1f}x")
+            finally:
+                drop_user(db, user_id)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--decisions", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--events-per-decision", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
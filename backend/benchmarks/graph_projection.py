@@ -0,0 +1,138 @@
+"""
+Graph traversal benchmark: in-memory CSR projection vs Neo4j.
+
+Synthetic mode (default) builds a projection of random decisions, events and
+CAUSES links in memory and times build, related-decision and shortest-path
+queries. The synthetic links stand in for graph_edges rows; a live graph
+without any has no related decisions to find. Live mode loads the
+projection from DATABASE_URL and runs the same lookups against it and
+against Neo4j (GraphQueries) for sampled decisions.
+
+Usage:
+    python -m benchmarks.graph_projection --decisions 100000 --queries 2000
+    python -m benchmarks.graph_projection --live --queries 200
+"""
+import time
+import random
+import asyncio
+import argparse
+from sqlalchemy import select
+
+from core import models
+from core.database import AsyncSessionLocal
+from core.graph_projection import GraphProjection, GraphProjectionManager, EVENT
+from core.graph_queries import GraphQueries
+from core.neo4j_db import close_async_neo4j
+
+
+def percentiles_us(samples: list) -> str:
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1e6
+    p95 = samples[min(int(len(samples) * 0.95), len(samples) - 1)] * 1e6
+    return f"p50 {p50:>10.1f} us   p95 {p95:>10.1f} us"
+
+
+def time_calls(func, args_list: list) -> list:
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def time_async_calls(func, args_list: list) -> list:
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        await func(*args)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def synthetic(args):
+    rng = random.Random(42)
+    users = max(args.decisions // 1000, 1)
+    decisions = [(d, d % users + 1, True) for d in range(1, args.decisions + 1)]
+    events = []
+    event_id = 0
+    for decision_id, user_id, _ in decisions:
+        for _ in range(args.events_per_decision):
+            event_id += 1
+            events.append((event_id, decision_id, user_id))
+    owner_of_event = {e[0]: e[2] for e in events}
+    # CAUSES links between events of the same user
+    edges = []
+    while len(edges) < args.causes:
+        a, b = rng.randint(1, event_id), rng.randint(1, event_id)
+        if a != b and owner_of_event[a] == owner_of_event[b]:
+            edges.append(((EVENT, a), (EVENT, b)))
+
+    projection = GraphProjection()
+    started = time.perf_counter()
+    projection.load(decisions, events, edges)
+    print(f"build: {len(decisions)} decisions, {len(events)} events, {len(edges)} links in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    sample = [rng.randint(1, args.decisions) for _ in range(args.queries)]
+    related = time_calls(projection.related_decisions, [(d, args.hops, 10) for d in sample])
+    print(f"related_decisions (hops={args.hops}):  {percentiles_us(related)}")
+
+    pairs = [(d, d + users if d + users <= args.decisions else d) for d in sample]
+    paths = time_calls(projection.shortest_path, [(a, b, args.hops * 2) for a, b in pairs])
+    print(f"shortest_path (max {args.hops * 2} hops): {percentiles_us(paths)}")
+
+    started = time.perf_counter()
+    for i in range(args.queries):
+        projection.add_event(event_id + i + 1, sample[i], (sample[i] - 1) % users + 1)
+    print(f"incremental add_event: {(time.perf_counter() - started) / args.queries * 1e6:.1f} us/event")
+
+
+async def live(args):
+    projection = GraphProjection()
+    manager = GraphProjectionManager(projection)
+    started = time.perf_counter()
+    await manager.rebuild()
+    print(f"build from Postgres: {projection.size} nodes in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select(models.Decision.id, models.Decision.user_id).filter(models.Decision.is_active == True)
+        )).all()
+    if not rows:
+        print("No decisions to sample")
+        return
+    sample = [random.choice(rows) for _ in range(args.queries)]
+
+    related = time_calls(projection.related_decisions, [(d, args.hops, 10) for d, _ in sample])
+    print(f"projection related_decisions: {percentiles_us(related)}")
+
+    try:
+        neo4j_related = await time_async_calls(
+            lambda d, u: GraphQueries.get_related_decisions(d, u, depth=args.hops, limit=10),
+            sample
+        )
+        print(f"neo4j related_decisions:      {percentiles_us(neo4j_related)}")
+    except Exception as e:
+        print(f"neo4j unavailable: {e}")
+    finally:
+        await close_async_neo4j()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--live", action="store_true", help="Use DATABASE_URL and Neo4j instead of synthetic data")
+    parser.add_argument("--decisions", type=int, default=20000)
+    parser.add_argument("--events-per-decision", type=int, default=5)
+    parser.add_argument("--causes", type=int, default=20000, help="Random CAUSES links between events")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--hops", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.live:
+        asyncio.run(live(args))
+    else:
+        synthetic(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+LLM client benchmark against a local OpenAI-compatible stub server.
+
+Starts a stub /v1/chat/completions endpoint that answers after a fixed
+delay, points LLMService at it (OPENAI_BASE_URL) and fires concurrent
+calls. With the shared async client the batch finishes in about one delay
+rather than one delay per call, and a ticker coroutine running alongside
+shows how long the event loop was ever blocked.
+
+With --stream the stub sends its reply as SSE chunks spread over the delay
+and the benchmark reports time to first token next to total time.
+
+Usage:
+    python -m benchmarks.llm_client --concurrency 50 --delay-ms 500
+    python -m benchmarks.llm_client --concurrency 50 --delay-ms 3000 --stream
+"""
+import os
+import time
+import asyncio
+import argparse
+import threading
+import statistics
+
+PORT = 8765
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{PORT}/v1"
+
+import json
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from core.llm_service import LLMService
+
+EVENTS = [
+    {"event_type": "created", "description": f"Step {i}", "source": "bench"}
+    for i in range(20)
+]
+
+
+STUB_TOKENS = 30
+
+
+def stub_app(delay_seconds: float) -> FastAPI:
+    app = FastAPI()
+
+    async def chunks(model: str):
+        for i in range(STUB_TOKENS):
+            await asyncio.sleep(delay_seconds / STUB_TOKENS)
+            chunk = {
+                "id": "stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": f"tok{i} "}, "finish_reason": None}]
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    @app.post("/v1/chat/completions")
+    async def completions(body: dict):
+        if body.get("stream"):
+            return StreamingResponse(chunks(body.get("model", "stub")), media_type="text/event-stream")
+        await asyncio.sleep(delay_seconds)
+        return {
+            "id": "stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "Stub summary."},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        }
+
+    return app
+
+
+def start_stub(delay_seconds: float) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(stub_app(delay_seconds), port=PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def ticker(stop: asyncio.Event, gaps: list, interval: float = 0.01):
+    """Record how late each 10 ms tick fires (event loop blocking)"""
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        gaps.append(now - last - interval)
+        last = now
+
+
+async def run(args):
+    llm = LLMService()
+    # Warm the pool so the measured batch reuses open connections
+    await llm.fold_summary("Warm-up", None, EVENTS)
+
+    stop = asyncio.Event()
+    gaps = []
+    tick = asyncio.create_task(ticker(stop, gaps))
+
+    latencies = []
+    first_tokens = []
+
+    async def one():
+        started = time.perf_counter()
+        if args.stream:
+            first = None
+            async for _ in llm.stream_fold_summary("Benchmark decision", None, EVENTS):
+                first = first or time.perf_counter() - started
+            first_tokens.append(first)
+        else:
+            await llm.fold_summary("Benchmark decision", None, EVENTS)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await tick
+    await llm.close()
+
+    print(f"{args.concurrency} concurrent {'streamed ' if args.stream else ''}calls, stub delay {args.delay_ms} ms")
+    print(f"  wall time:        {elapsed * 1000:8.1f} ms (serial would be ~{args.concurrency * args.delay_ms} ms)")
+    print(f"  per-call p50:     {statistics.median(latencies) * 1000:8.1f} ms")
+    if first_tokens:
+        print(f"  first token p50:  {statistics.median(first_tokens) * 1000:8.1f} ms")
+    print(f"  max loop stall:   {max(gaps, default=0) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--delay-ms", type=int, default=500)
+    parser.add_argument("--stream", action="store_true", help="use the streaming summary method")
+    args = parser.parse_args()
+
+    server = start_stub(args.delay_ms / 1000)
+    try:
+        asyncio.run(run(args))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
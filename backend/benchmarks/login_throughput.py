@@ -0,0 +1,64 @@
+"""
+Login throughput benchmark.
+
+Fires concurrent logins at a running API and reports logins/sec,
+shed (503) responses and latency at several concurrency levels.
+
+Usage:
+    python -m benchmarks.login_throughput --url http://localhost:8000 \
+        --email admin@contexweave.com --password admin123secure
+"""
+import argparse
+import asyncio
+import time
+import httpx
+
+
+async def run_level(client: httpx.AsyncClient, concurrency: int, total: int, email: str, password: str) -> dict:
+    """Run `total` logins with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = {}
+    latencies = []
+
+    async def one_login():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post("/api/auth/login", json={"email": email, "password": password})
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_login() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "logins_per_sec": statuses.get(200, 0) / elapsed,
+        "shed": statuses.get(503, 0),
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "statuses": statuses
+    }
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        print(f"{'concurrency':>11} {'logins/s':>9} {'shed':>6} {'p50 ms':>8} {'p99 ms':>8}")
+        for concurrency in args.concurrency:
+            result = await run_level(client, concurrency, args.requests, args.email, args.password)
+            print(
+                f"{result['concurrency']:>11} {result['logins_per_sec']:>9.1f} {result['shed']:>6} "
+                f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@contexweave.com")
+    parser.add_argument("--password", default="admin123secure")
+    parser.add_argument("--requests", type=int, default=200, help="logins per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,103 @@
+import os
+import json
+from typing import Awaitable, Callable, Optional
+from fastapi.encoders import jsonable_encoder
+from dotenv import load_dotenv
+
+from .redis_client import get_redis
+
+load_dotenv()
+
+ANALYTICS_CACHE_TTL_SECONDS = int(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "300"))
+
+
+class AnalyticsCache:
+    """
+    Redis cache for per-user analytics results.
+
+    Keys embed a per-user version number; any write to the user's decisions
+    or events bumps the version (see invalidate_user), so stale results are
+    never read again and simply expire. Without Redis every call computes.
+    """
+
+    def __init__(self, ttl_seconds: int = ANALYTICS_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"hits": 0, "misses": 0, "errors": 0, "invalidations": 0}
+
+    @staticmethod
+    def _version_key(user_id: int) -> str:
+        return f"analytics:version:{user_id}"
+
+    @staticmethod
+    def _result_key(user_id: int, version: int, name: str, params: Optional[dict]) -> str:
+        param_text = json.dumps(params or {}, sort_keys=True, separators=(",", ":"))
+        return f"analytics:{user_id}:v{version}:{name}:{param_text}"
+
+    async def get_or_compute(
+        self,
+        user_id: int,
+        name: str,
+        compute: Callable[[], Awaitable[dict]],
+        params: Optional[dict] = None
+    ) -> dict:
+        """
+        Return a cached result for (user, endpoint, params), computing it on a miss.
+
+        Args:
+            user_id: Owner of the data
+            name: Endpoint/metric name
+            compute: Coroutine factory producing the result
+            params: Endpoint parameters that change the result
+        """
+        redis = get_redis()
+        if redis is None:
+            return await compute()
+
+        try:
+            version = int(await redis.get(self._version_key(user_id)) or 0)
+            key = self._result_key(user_id, version, name, params)
+            cached = await redis.get(key)
+        except Exception as e:
+            print(f"Error reading analytics cache: {e}")
+            self.stats["errors"] += 1
+            return await compute()
+
+        if cached is not None:
+            self.stats["hits"] += 1
+            return json.loads(cached)
+
+        self.stats["misses"] += 1
+        result = jsonable_encoder(await compute())
+
+        try:
+            await redis.set(key, json.dumps(result), ex=self.ttl_seconds)
+        except Exception as e:
+            print(f"Error writing analytics cache: {e}")
+            self.stats["errors"] += 1
+
+        return result
+
+    async def invalidate_user(self, user_id: int):
+        """Invalidate every cached result for a user after a write"""
+        redis = get_redis()
+        if redis is None:
+            return
+
+        try:
+            await redis.incr(self._version_key(user_id))
+            self.stats["invalidations"] += 1
+        except Exception as e:
+            print(f"Error invalidating analytics cache: {e}")
+            self.stats["errors"] += 1
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters for this worker"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0
+        }
+
+
+# Global analytics cache instance
+analytics_cache = AnalyticsCache()
@@ -1,71 +1,116 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc, case, literal_column
+from typing import Optional
 from datetime import datetime, timedelta
 from core import models
 
 class AnalyticsService:
-    """Analytics and metrics for decisions."""
+    """
+    Analytics and metrics for decisions.
+
+    Every method is a fixed number of set-based queries (GROUP BY / window
+    functions), independent of how many decisions or events exist. Pass
+    user_id to scope results to one user's decisions. Timeline and event
+    type distribution read the daily rollups maintained by RollupService.
+    """
+
+    @staticmethod
+    def _scope(query, user_id: Optional[int]):
+        """Restrict a query that selects from decisions to one user."""
+        if user_id is not None:
+            query = query.filter(models.Decision.user_id == user_id)
+        return query
 
     @staticmethod
-    def get_decision_metrics(db: Session, decision_id: int):
+    async def get_decision_metrics(db: AsyncSession, decision_id: int):
         """Get metrics for a single decision."""
-        decision = db.query(models.Decision).filter(
-            models.Decision.id == decision_id,
-            models.Decision.is_active == True
-        ).first()
+        decision = (await db.execute(
+            select(models.Decision).filter(
+                models.Decision.id == decision_id,
+                models.Decision.is_active == True
+            )
+        )).scalars().first()
 
         if not decision:
             return None
 
-        events = db.query(models.Event).filter(
-            models.Event.decision_id == decision_id
-        ).all()
+        rows = (await db.execute(
+            select(
+                models.Event.event_type,
+                func.count(models.Event.id),
+                func.max(models.Event.created_at)
+            ).filter(
+                models.Event.decision_id == decision_id
+            ).group_by(models.Event.event_type)
+        )).all()
 
         return {
             "decision_id": decision_id,
             "title": decision.title,
             "created_at": decision.created_at,
-            "event_count": len(events),
-            "event_types": AnalyticsService._count_event_types(events),
+            "event_count": sum(r[1] for r in rows),
+            "event_types": {r[0]: r[1] for r in rows},
             "days_active": AnalyticsService._days_since(decision.created_at),
-            "last_update": max([e.created_at for e in events], default=decision.created_at)
+            "last_update": max([r[2] for r in rows], default=decision.created_at)
         }
 
     @staticmethod
-    def get_all_decisions_metrics(db: Session):
-        """Get aggregate metrics for all decisions."""
-        decisions = db.query(models.Decision).filter(
+    async def get_all_decisions_metrics(db: AsyncSession, user_id: Optional[int] = None):
+        """Get aggregate metrics for all active decisions."""
+        event_count = func.count(models.Event.id).label("event_count")
+        query = select(
+            models.Decision.id,
+            models.Decision.title,
+            models.Decision.created_at,
+            event_count
+        ).outerjoin(
+            models.Event, models.Event.decision_id == models.Decision.id
+        ).filter(
             models.Decision.is_active == True
-        ).all()
-
-        total_events = db.query(func.count(models.Event.id)).scalar() or 0
-
-        decision_metrics = []
-        for d in decisions:
-            events = db.query(models.Event).filter(
-                models.Event.decision_id == d.id
-            ).all()
-            decision_metrics.append({
-                "id": d.id,
-                "title": d.title,
-                "event_count": len(events),
-                "created_at": d.created_at
-            })
+        ).group_by(
+            models.Decision.id
+        ).order_by(models.Decision.id)
+
+        rows = (await db.execute(AnalyticsService._scope(query, user_id))).all()
+
+        total_events = sum(r.event_count for r in rows)
 
         return {
-            "total_decisions": len(decisions),
+            "total_decisions": len(rows),
             "total_events": total_events,
-            "avg_events_per_decision": round(total_events / len(decisions), 1) if decisions else 0,
-            "decisions": sorted(decision_metrics, key=lambda x: x['event_count'], reverse=True)
+            "avg_events_per_decision": total_events / len(rows) if rows else 0,
+            "decisions": [
+                {
+                    "id": r.id,
+                    "title": r.title,
+                    "event_count": r.event_count,
+                    "created_at": r.created_at
+                }
+                for r in rows
+            ]
         }
 
     @staticmethod
-    def get_event_type_distribution(db: Session):
-        """Get distribution of event types."""
-        result = db.query(
-            models.Event.event_type,
-            func.count(models.Event.id).label('count')
-        ).group_by(models.Event.event_type).all()
+    def _cutoff_day(days: Optional[int]):
+        """First day (UTC) included in a window of the last N days."""
+        if days is None:
+            return None
+        return (datetime.utcnow() - timedelta(days=days)).date()
+
+    @staticmethod
+    async def get_event_type_distribution(db: AsyncSession, user_id: Optional[int] = None, days: Optional[int] = None):
+        """Get distribution of event types (optionally over the last N days), from daily rollups."""
+        rollup = models.DailyEventRollup
+        count = func.sum(rollup.events_created)
+        query = select(rollup.event_type, count).group_by(rollup.event_type).having(count > 0)
+
+        if user_id is not None:
+            query = query.filter(rollup.user_id == user_id)
+        cutoff_day = AnalyticsService._cutoff_day(days)
+        if cutoff_day is not None:
+            query = query.filter(rollup.day >= cutoff_day)
+
+        result = (await db.execute(query)).all()
 
         return {
             "event_types": [
@@ -75,16 +120,20 @@ class AnalyticsService:
         }
 
     @staticmethod
-    def get_decision_timeline_stats(db: Session, days: int = 30):
-        """Get decision creation timeline for last N days."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        decisions = db.query(
-            func.date(models.Decision.created_at).label('date'),
-            func.count(models.Decision.id).label('count')
+    async def get_decision_timeline_stats(db: AsyncSession, days: int = 30, user_id: Optional[int] = None):
+        """Get decision creation timeline for last N days, from daily rollups."""
+        rollup = models.DailyDecisionRollup
+        query = select(
+            rollup.day,
+            func.sum(rollup.decisions_created)
         ).filter(
-            models.Decision.created_at >= cutoff_date
-        ).group_by(func.date(models.Decision.created_at)).all()
+            rollup.day >= AnalyticsService._cutoff_day(days)
+        ).group_by(rollup.day).order_by(rollup.day)
+
+        if user_id is not None:
+            query = query.filter(rollup.user_id == user_id)
+
+        decisions = (await db.execute(query)).all()
 
         return {
             "period_days": days,
@@ -94,39 +143,77 @@ class AnalyticsService:
         }
 
     @staticmethod
-    def get_decision_status_summary(db: Session):
-        """Get summary of decision statuses."""
-        events = db.query(models.Event).all()
-        decisions = db.query(models.Decision).filter(
+    async def get_decision_status_summary(db: AsyncSession, user_id: Optional[int] = None):
+        """Get summary of decision statuses (last event type of each active decision)."""
+        # Rank each decision's events newest first; rank 1 is its current status
+        ranked_events = select(
+            models.Event.decision_id,
+            models.Event.event_type,
+            func.row_number().over(
+                partition_by=models.Event.decision_id,
+                order_by=(desc(models.Event.created_at), desc(models.Event.id))
+            ).label("rank")
+        )
+        if user_id is not None:
+            ranked_events = ranked_events.filter(models.Event.user_id == user_id)
+        ranked_events = ranked_events.subquery()
+
+        # Literal (not a bind param) so SELECT and GROUP BY render identically
+        status = func.coalesce(ranked_events.c.event_type, literal_column("'pending'"))
+        status_query = select(
+            status,
+            func.count(models.Decision.id)
+        ).outerjoin(
+            ranked_events,
+            (ranked_events.c.decision_id == models.Decision.id) & (ranked_events.c.rank == 1)
+        ).filter(
             models.Decision.is_active == True
-        ).all()
-
-        # Group by last event type
-        decision_status = {}
-        for d in decisions:
-            last_event = db.query(models.Event).filter(
-                models.Event.decision_id == d.id
-            ).order_by(desc(models.Event.created_at)).first()
+        ).group_by(status)
 
-            status = last_event.event_type if last_event else "pending"
-            decision_status[d.id] = status
+        status_rows = (await db.execute(AnalyticsService._scope(status_query, user_id))).all()
 
-        status_counts = {}
-        for status in decision_status.values():
-            status_counts[status] = status_counts.get(status, 0) + 1
+        active_query = select(
+            func.count(models.Decision.id),
+            func.coalesce(func.sum(case((models.Decision.is_active == True, 1), else_=0)), 0)
+        )
+        total, active = (await db.execute(AnalyticsService._scope(active_query, user_id))).one()
 
         return {
-            "statuses": status_counts,
-            "total_decisions": len(decisions)
+            "statuses": {r[0]: r[1] for r in status_rows},
+            "total_decisions": total,
+            "active_decisions": active,
+            "inactive_decisions": total - active
         }
 
     @staticmethod
-    def _count_event_types(events):
-        """Count event types."""
-        counts = {}
-        for e in events:
-            counts[e.event_type] = counts.get(e.event_type, 0) + 1
-        return counts
+    async def get_dashboard(db: AsyncSession, user_id: int, days: int = 30):
+        """
+        Everything the analytics dashboard shows, in one call.
+
+        Graph stats are derived from the other results (total decisions from
+        the status summary, total events from the all-time distribution), so
+        the whole payload costs five statements.
+        """
+        overview = await AnalyticsService.get_all_decisions_metrics(db, user_id=user_id)
+        event_types = await AnalyticsService.get_event_type_distribution(db, user_id=user_id)
+        timeline = await AnalyticsService.get_decision_timeline_stats(db, days=days, user_id=user_id)
+        status_summary = await AnalyticsService.get_decision_status_summary(db, user_id=user_id)
+
+        decisions_in_graph = status_summary["total_decisions"]
+        events_in_graph = event_types["total"]
+
+        return {
+            "stats": {
+                "status": "healthy",
+                "decisions_in_graph": decisions_in_graph,
+                "events_in_graph": events_in_graph,
+                "relationships": events_in_graph * 2
+            },
+            "overview": overview,
+            "event_types": event_types,
+            "status_summary": status_summary,
+            "timeline": timeline
+        }
 
     @staticmethod
     def _days_since(date):
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import bcrypt
 import jwt
 from pydantic import BaseModel
@@ -14,6 +16,12 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production"
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 
+# bcrypt cost factor and worker pool limits
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(os.cpu_count() or 2)))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", str(BCRYPT_WORKERS * 4)))
+BCRYPT_RETRY_AFTER_SECONDS = int(os.getenv("BCRYPT_RETRY_AFTER_SECONDS", "1"))
+
 
 # ==================== SCHEMAS ====================
 
@@ -34,6 +42,16 @@ class TokenData(BaseModel):
     email: str
 
 
+class Principal(BaseModel):
+    """Authenticated caller (scalar user columns only, no relationships)"""
+    id: int
+    email: str
+    username: str
+    role: str
+    status: str
+    is_active: Optional[bool] = True
+
+
 class Token(BaseModel):
     """Token response"""
     access_token: str
@@ -77,7 +95,7 @@ def hash_password(password: str) -> str:
     Example:
         hashed = hash_password("mypassword123")
     """
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 
@@ -91,6 +109,49 @@ def verify_password(password: str, password_hash: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when the bcrypt pool already has BCRYPT_MAX_PENDING jobs"""
+
+
+# Dedicated bcrypt pool (bcrypt releases the GIL, so threads run in parallel)
+_bcrypt_executor = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_bcrypt_pending = 0
+
+
+async def _run_bcrypt(func, *args):
+    """Run a bcrypt call on the dedicated pool, shedding work when the queue is full"""
+    global _bcrypt_pending
+    if _bcrypt_pending >= BCRYPT_MAX_PENDING:
+        raise PasswordHasherBusy()
+    
+    _bcrypt_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_bcrypt_executor, func, *args)
+    finally:
+        _bcrypt_pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password on the bcrypt pool.
+    
+    Raises:
+        PasswordHasherBusy if the pool queue is full
+    """
+    return await _run_bcrypt(hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    """
+    Verify a password on the bcrypt pool.
+    
+    Raises:
+        PasswordHasherBusy if the pool queue is full
+    """
+    return await _run_bcrypt(verify_password, password, password_hash)
+
+
 # ==================== JWT TOKENS ====================
 
 def create_access_token(user_id: int, email: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -0,0 +1,310 @@
+import os
+import time
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+import numpy as np
+from sqlalchemy import update, bindparam, select, func, text
+from dotenv import load_dotenv
+
+from . import models
+from .database import AsyncSessionLocal
+from .graph_projection import GraphProjection, graph_projection, DECISION, EVENT
+from .graph_queries import GRAPH_MAX_DEPTH
+from .neo4j_db import get_neo4j_driver
+
+load_dotenv()
+
+CENTRALITY_ENABLED = os.getenv("CENTRALITY_ENABLED", "true").lower() == "true"
+CENTRALITY_INTERVAL_SECONDS = float(os.getenv("CENTRALITY_INTERVAL_SECONDS", "3600"))
+PAGERANK_DAMPING = float(os.getenv("PAGERANK_DAMPING", "0.85"))
+PAGERANK_MAX_ITERATIONS = int(os.getenv("PAGERANK_MAX_ITERATIONS", "50"))
+PAGERANK_TOLERANCE = float(os.getenv("PAGERANK_TOLERANCE", "1e-6"))
+
+# Postgres advisory lock key: one score write at a time across API workers
+CENTRALITY_LOCK_KEY = 0x63656e74
+
+# Rows per UPDATE executemany / Neo4j UNWIND
+SCORE_WRITE_BATCH = 5000
+
+# Decisions per vectorized downstream-reach BFS (bounds the frontier arrays)
+REACH_BATCH = 4096
+
+
+class CentralityService:
+    """
+    Whole-graph importance scores for decisions.
+
+    Computed from a snapshot of the in-memory graph projection with
+    vectorized NumPy iteration (no Neo4j GDS plugin needed):
+
+    - importance: PageRank over the undirected decision/event graph, scaled
+      so the average live node scores 1.0
+    - degree: live neighbors of the decision (its events plus linked decisions)
+    - downstream_reach: events and decisions reachable by following edges
+      forward (CAUSES links, SUCCESSOR links and reversed PREDECESSOR links)
+      within GRAPH_MAX_DEPTH hops, not counting the decision's own events
+
+    Scores are written to the decisions table and the Decision nodes so list
+    and search endpoints can sort by them without traversing per request.
+    """
+
+    @staticmethod
+    def pagerank(size: int, src: np.ndarray, dst: np.ndarray, alive: np.ndarray) -> np.ndarray:
+        """
+        Power-iteration PageRank on an undirected edge list.
+
+        Returns:
+            Scores per node (dead nodes 0), summing to the number of live nodes
+        """
+        live_count = int(alive.sum())
+        if live_count == 0:
+            return np.zeros(size)
+
+        u = np.concatenate([src, dst])
+        v = np.concatenate([dst, src])
+        degree = np.bincount(u, minlength=size).astype(np.float64)
+        dangling = alive & (degree == 0)
+        safe_degree = np.where(degree > 0, degree, 1.0)
+
+        rank = np.where(alive, 1.0 / live_count, 0.0)
+        for _ in range(PAGERANK_MAX_ITERATIONS):
+            # Sparse matrix-vector product as a weighted bincount over the edge list
+            spread = np.bincount(v, weights=(rank / safe_degree)[u], minlength=size)
+            leaked = rank[dangling].sum()
+            updated = (1 - PAGERANK_DAMPING) / live_count + PAGERANK_DAMPING * (spread + leaked / live_count)
+            updated[~alive] = 0.0
+            converged = np.abs(updated - rank).sum() < PAGERANK_TOLERANCE
+            rank = updated
+            if converged:
+                break
+
+        return rank * live_count
+
+    @staticmethod
+    def downstream_reach(size: int, src: np.ndarray, dst: np.ndarray, kind: np.ndarray,
+                         alive: np.ndarray, decisions: np.ndarray, max_hops: int) -> np.ndarray:
+        """
+        Count nodes reachable forward from each decision, excluding its own events.
+
+        Decisions are expanded REACH_BATCH at a time as one multi-source BFS:
+        the frontier is a sorted array of (decision row, node) keys, each hop
+        gathers the CSR successors of all of them at once, and np.unique /
+        np.isin drop keys already seen.
+
+        Returns:
+            Reach per entry of decisions
+        """
+        order = np.argsort(src, kind="stable")
+        forward = dst[order]
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=size), out=indptr[1:])
+
+        def successors(keys: np.ndarray) -> np.ndarray:
+            """(row, node) keys → keys of their live successors (with duplicates)"""
+            rows, nodes = np.divmod(keys, size)
+            starts = indptr[nodes]
+            lengths = indptr[nodes + 1] - starts
+            total = int(lengths.sum())
+            if not total:
+                return np.zeros(0, dtype=np.int64)
+            slice_base = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+            found = forward[slice_base + np.arange(total)]
+            found_rows = np.repeat(rows, lengths)
+            live = alive[found]
+            return found_rows[live] * size + found[live]
+
+        reach = np.zeros(len(decisions), dtype=np.int64)
+        for start in range(0, len(decisions), REACH_BATCH):
+            batch = decisions[start:start + REACH_BATCH].astype(np.int64)
+            rows = np.arange(len(batch), dtype=np.int64)
+            origin = rows * size + batch
+
+            # Hop 1 is the decision's own events (and any directly linked decisions)
+            frontier = np.setdiff1d(successors(origin), origin)
+            own_events = frontier[kind[frontier % size] == EVENT]
+            seen = np.union1d(origin, frontier)
+            for _ in range(max_hops):
+                if not len(frontier):
+                    break
+                found = np.unique(successors(frontier))
+                frontier = found[~np.isin(found, seen, assume_unique=True)]
+                seen = np.union1d(seen, frontier)
+
+            reach[start:start + len(batch)] = (
+                np.bincount(seen // size, minlength=len(batch))
+                - 1
+                - np.bincount(own_events // size, minlength=len(batch))
+            )
+        return reach
+
+    @staticmethod
+    def compute(snapshot: dict) -> list:
+        """
+        Score every live decision in a projection snapshot (CPU bound; run off the event loop).
+
+        Returns:
+            [{"id", "importance", "degree", "downstream_reach"}]
+        """
+        size = snapshot["size"]
+        kind = snapshot["kind"]
+        alive = snapshot["alive"]
+        src = snapshot["edge_src"]
+        dst = snapshot["edge_dst"]
+
+        live_edges = alive[src] & alive[dst]
+        src, dst = src[live_edges], dst[live_edges]
+
+        importance = CentralityService.pagerank(size, src, dst, alive)
+        degree = np.bincount(np.concatenate([src, dst]), minlength=size)
+        decisions = np.nonzero((kind == DECISION) & alive)[0]
+        reach = CentralityService.downstream_reach(size, src, dst, kind, alive, decisions, GRAPH_MAX_DEPTH)
+
+        ext_id = snapshot["ext_id"]
+        return [
+            {
+                "id": int(ext_id[node]),
+                "importance": round(float(importance[node]), 6),
+                "degree": int(degree[node]),
+                "downstream_reach": int(reach[i])
+            }
+            for i, node in enumerate(decisions.tolist())
+        ]
+
+    @staticmethod
+    async def store(db, scores: list):
+        """Write scores to the decisions table (updated_at is left untouched)"""
+        table = models.Decision.__table__
+        statement = update(table).where(table.c.id == bindparam("b_id")).values(
+            importance=bindparam("b_importance"),
+            degree=bindparam("b_degree"),
+            downstream_reach=bindparam("b_reach"),
+            scores_updated_at=bindparam("b_now"),
+            updated_at=table.c.updated_at
+        )
+        now = datetime.utcnow()
+        for start in range(0, len(scores), SCORE_WRITE_BATCH):
+            await db.execute(statement, [
+                {
+                    "b_id": s["id"],
+                    "b_importance": s["importance"],
+                    "b_degree": s["degree"],
+                    "b_reach": s["downstream_reach"],
+                    "b_now": now
+                }
+                for s in scores[start:start + SCORE_WRITE_BATCH]
+            ])
+
+    @staticmethod
+    def store_in_graph(scores: list):
+        """Write scores onto Decision nodes, one UNWIND per batch"""
+        neo4j = get_neo4j_driver()
+        for start in range(0, len(scores), SCORE_WRITE_BATCH):
+            neo4j.set_decision_scores(scores[start:start + SCORE_WRITE_BATCH])
+
+    @staticmethod
+    async def is_fresh(db) -> bool:
+        """Whether scores were written less than CENTRALITY_INTERVAL_SECONDS ago"""
+        last_run = (await db.execute(select(func.max(models.Decision.scores_updated_at)))).scalar()
+        return bool(last_run) and datetime.utcnow() - last_run < timedelta(seconds=CENTRALITY_INTERVAL_SECONDS)
+
+    @staticmethod
+    async def run(projection: GraphProjection = graph_projection, force: bool = False) -> Optional[dict]:
+        """
+        Compute and store scores unless scores are fresher than
+        CENTRALITY_INTERVAL_SECONDS or another worker stored them first.
+
+        No connection is held while computing: a short read checks freshness,
+        the scores are computed from the projection, and a short write
+        transaction takes the advisory lock, re-checks freshness and stores.
+
+        Returns:
+            Run summary, or None if skipped
+        """
+        if not projection.ready:
+            return None
+
+        if not force:
+            async with AsyncSessionLocal() as db:
+                if await CentralityService.is_fresh(db):
+                    return None
+
+        started = time.perf_counter()
+        scores = await asyncio.to_thread(CentralityService.compute, projection.snapshot())
+        computed = time.perf_counter()
+
+        async with AsyncSessionLocal() as db:
+            if db.bind.dialect.name == "postgresql":
+                locked = (await db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": CENTRALITY_LOCK_KEY}
+                )).scalar()
+                if not locked:
+                    return None
+            # Another worker may have stored its run while this one computed
+            if not force and await CentralityService.is_fresh(db):
+                return None
+            await CentralityService.store(db, scores)
+            await db.commit()
+
+        try:
+            await asyncio.to_thread(CentralityService.store_in_graph, scores)
+        except Exception as e:
+            print(f"Error writing scores to graph: {e}")
+
+        return {
+            "decisions": len(scores),
+            "compute_ms": round((computed - started) * 1000, 2),
+            "total_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+
+class CentralityJob:
+    """Background task running CentralityService.run periodically."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Optional[dict] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                result = await CentralityService.run()
+                if result:
+                    self.last_run = {**result, "finished_at": datetime.utcnow()}
+                    print(f"✓ Scored {result['decisions']} decisions in {result['total_ms']} ms")
+            except Exception as e:
+                print(f"Error computing decision scores: {e}")
+            # Short poll until the projection is ready; the interval check skips early runs
+            await asyncio.sleep(min(60.0, CENTRALITY_INTERVAL_SECONDS))
+
+
+# Global centrality job instance
+centrality_job = CentralityJob()
+
+
+if __name__ == "__main__":
+    # One-off run (e.g. from cron): load the projection, score, exit
+    from .graph_projection import GraphProjectionManager
+    from .neo4j_db import close_neo4j
+
+    async def run_once():
+        projection = GraphProjection()
+        await GraphProjectionManager(projection).rebuild()
+        print(await CentralityService.run(projection, force=True))
+
+    asyncio.run(run_once())
+    close_neo4j()
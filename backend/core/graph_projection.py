@@ -0,0 +1,485 @@
+import os
+import time
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+import numpy as np
+from sqlalchemy import select, func, or_
+from dotenv import load_dotenv
+
+from . import models
+from .database import AsyncSessionLocal
+
+load_dotenv()
+
+GRAPH_PROJECTION_ENABLED = os.getenv("GRAPH_PROJECTION_ENABLED", "true").lower() == "true"
+GRAPH_PROJECTION_REFRESH_SECONDS = float(os.getenv("GRAPH_PROJECTION_REFRESH_SECONDS", "5"))
+GRAPH_PROJECTION_REBUILD_SECONDS = float(os.getenv("GRAPH_PROJECTION_REBUILD_SECONDS", "600"))
+# Changes this recent are re-read on every refresh, so ones that commit out of id order are not missed
+GRAPH_PROJECTION_LOOKBACK_SECONDS = float(os.getenv("GRAPH_PROJECTION_LOOKBACK_SECONDS", "60"))
+
+DECISION = 0
+EVENT = 1
+
+
+class GraphProjection:
+    """
+    In-memory, array-backed copy of the decision/event graph for traversals.
+
+    Nodes (decisions and events) are dense integer indexes with parallel
+    NumPy arrays for kind, external id, owner and liveness. Edges keep their
+    direction in edge_src/edge_dst (decision → event for HAS_EVENT, forward
+    in time for links, see edge_endpoints) and are indexed undirected in CSR
+    form (indptr/indices) for traversals. Edges added since the last
+    compaction live in a small per-node delta and are merged into the CSR
+    once they grow past a fraction of it. Removed nodes are tombstoned.
+
+    Built from Postgres at startup and kept current by in-process write
+    hooks plus a poll of the graph_changes feed (which carries the writes of
+    other API workers, including soft deletes and event deletes) and a
+    periodic full rebuild. Neo4j stays the system of record; callers fall
+    back to it while the projection is not ready.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.built_at = None
+        self.build_ms = 0.0
+        self._reset()
+
+    def _reset(self, capacity: int = 1024):
+        self.size = 0
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.ext_id = np.zeros(capacity, dtype=np.int64)
+        self.owner = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.index = {DECISION: {}, EVENT: {}}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.edge_src = np.zeros(0, dtype=np.int64)
+        self.edge_dst = np.zeros(0, dtype=np.int64)
+        self.delta = {}
+        self.delta_pairs = []
+        self.delta_edges = 0
+        self.edge_ids = set()
+
+    # ==================== BUILDING ====================
+
+    def _grow(self, needed: int):
+        capacity = len(self.kind)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name in ("kind", "ext_id", "owner", "alive"):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            setattr(self, name, grown)
+
+    def _add_node(self, kind: int, ext_id: int, owner: int, alive: bool = True) -> int:
+        node = self.index[kind].get(ext_id)
+        if node is not None:
+            self.owner[node] = owner
+            self.alive[node] = alive
+            return node
+        self._grow(self.size + 1)
+        node = self.size
+        self.kind[node] = kind
+        self.ext_id[node] = ext_id
+        self.owner[node] = owner
+        self.alive[node] = alive
+        self.index[kind][ext_id] = node
+        self.size += 1
+        return node
+
+    def _compact(self):
+        """Merge delta edges into the CSR arrays"""
+        if self.delta_pairs:
+            extra = np.asarray(self.delta_pairs, dtype=np.int64)
+            self.edge_src = np.concatenate([self.edge_src, extra[:, 0]])
+            self.edge_dst = np.concatenate([self.edge_dst, extra[:, 1]])
+            self.delta = {}
+            self.delta_pairs = []
+            self.delta_edges = 0
+
+        # Undirected: store each edge in both directions, grouped by source
+        src = np.concatenate([self.edge_src, self.edge_dst])
+        dst = np.concatenate([self.edge_dst, self.edge_src])
+        order = np.argsort(src, kind="stable")
+        self.indices = dst[order]
+        counts = np.bincount(src, minlength=self.size)
+        self.indptr = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+
+    def load(self, decisions: list, events: list, edges: list = ()):
+        """
+        Replace the projection with the given rows.
+
+        Args:
+            decisions: (id, user_id, is_active) rows
+            events: (id, decision_id, user_id) rows
+            edges: ((kind, id), (kind, id)) pairs beyond HAS_EVENT, or
+                ((kind, id), (kind, id), edge_id) for graph_edges rows
+        """
+        self._reset(capacity=max(len(decisions) + len(events), 1024))
+        for decision_id, user_id, is_active in decisions:
+            self._add_node(DECISION, decision_id, user_id, bool(is_active))
+
+        src = []
+        dst = []
+        for event_id, decision_id, user_id in events:
+            event_node = self._add_node(EVENT, event_id, user_id)
+            decision_node = self.index[DECISION].get(decision_id)
+            if decision_node is not None:
+                src.append(decision_node)
+                dst.append(event_node)
+
+        for edge in edges:
+            (kind_a, id_a), (kind_b, id_b) = edge[0], edge[1]
+            if len(edge) > 2:
+                self.edge_ids.add(edge[2])
+            a = self.index[kind_a].get(id_a)
+            b = self.index[kind_b].get(id_b)
+            if a is not None and b is not None and a != b:
+                src.append(a)
+                dst.append(b)
+
+        self.edge_src = np.asarray(src, dtype=np.int64)
+        self.edge_dst = np.asarray(dst, dtype=np.int64)
+        self._compact()
+
+    # ==================== INCREMENTAL UPDATES ====================
+
+    def _link(self, a: int, b: int):
+        self.delta.setdefault(a, []).append(b)
+        self.delta.setdefault(b, []).append(a)
+        self.delta_pairs.append((a, b))
+        self.delta_edges += 1
+        # Keep the delta small relative to the CSR so neighbor lookups stay vectorized
+        if self.delta_edges > max(1024, len(self.edge_src) // 10):
+            self._compact()
+
+    def add_decision(self, decision_id: int, user_id: int, is_active: bool = True):
+        """Add or update a decision node"""
+        self._add_node(DECISION, decision_id, user_id, is_active)
+
+    def add_event(self, event_id: int, decision_id: int, user_id: int):
+        """Add an event node and its HAS_EVENT edge"""
+        if event_id in self.index[EVENT]:
+            return
+        decision_node = self.index[DECISION].get(decision_id)
+        if decision_node is None:
+            decision_node = self._add_node(DECISION, decision_id, user_id)
+        event_node = self._add_node(EVENT, event_id, user_id)
+        self._link(decision_node, event_node)
+
+    def add_edge(self, a: tuple, b: tuple, edge_id: Optional[int] = None):
+        """Add an edge between two existing nodes given as (kind, id); edge_id dedupes graph_edges rows"""
+        if edge_id is not None and edge_id in self.edge_ids:
+            return
+        node_a = self.index[a[0]].get(a[1])
+        node_b = self.index[b[0]].get(b[1])
+        if node_a is not None and node_b is not None and node_a != node_b:
+            # Only recorded once linked, so a replay after the endpoints arrive still applies it
+            if edge_id is not None:
+                self.edge_ids.add(edge_id)
+            self._link(node_a, node_b)
+
+    def remove_event(self, event_id: int):
+        """Tombstone an event node (edges are dropped at the next rebuild)"""
+        node = self.index[EVENT].get(event_id)
+        if node is not None:
+            self.alive[node] = False
+
+    # ==================== QUERIES ====================
+
+    def _neighbors(self, nodes: np.ndarray) -> tuple:
+        """
+        All live neighbors of a frontier, vectorized over the CSR slices.
+
+        Returns:
+            (neighbors, sources) arrays of equal length
+        """
+        in_csr = nodes[nodes < len(self.indptr) - 1]
+        starts = self.indptr[in_csr]
+        lengths = self.indptr[in_csr + 1] - starts
+        total = int(lengths.sum())
+        if total:
+            # Offsets of every neighbor slot: each slice start repeated, plus a running index within it
+            slice_base = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+            neighbors = self.indices[slice_base + np.arange(total)]
+            sources = np.repeat(in_csr, lengths)
+        else:
+            neighbors = np.zeros(0, dtype=np.int64)
+            sources = np.zeros(0, dtype=np.int64)
+
+        if self.delta:
+            extra_neighbors = []
+            extra_sources = []
+            for node in nodes.tolist():
+                linked = self.delta.get(node)
+                if linked:
+                    extra_neighbors.extend(linked)
+                    extra_sources.extend([node] * len(linked))
+            if extra_neighbors:
+                neighbors = np.concatenate([neighbors, np.asarray(extra_neighbors, dtype=np.int64)])
+                sources = np.concatenate([sources, np.asarray(extra_sources, dtype=np.int64)])
+
+        live = self.alive[neighbors]
+        return neighbors[live], sources[live]
+
+    def _bfs(self, source: int, max_hops: int, target: Optional[int] = None) -> tuple:
+        """
+        Breadth-first search from source, restricted to the source owner's nodes.
+
+        Returns:
+            (distance, parent) dicts keyed by node index
+        """
+        owner = self.owner[source]
+        distance = {source: 0}
+        parent = {source: -1}
+        frontier = np.asarray([source], dtype=np.int64)
+
+        for hop in range(1, max_hops + 1):
+            neighbors, sources = self._neighbors(frontier)
+            keep = self.owner[neighbors] == owner
+            neighbors, sources = neighbors[keep], sources[keep]
+            # First occurrence of each new node defines its parent
+            neighbors, first = np.unique(neighbors, return_index=True)
+            sources = sources[first]
+
+            next_frontier = []
+            for node, via in zip(neighbors.tolist(), sources.tolist()):
+                if node not in distance:
+                    distance[node] = hop
+                    parent[node] = via
+                    next_frontier.append(node)
+            if not next_frontier or (target is not None and target in distance):
+                break
+            frontier = np.asarray(next_frontier, dtype=np.int64)
+
+        return distance, parent
+
+    def related_decisions(self, decision_id: int, max_hops: int = 3, limit: int = 10) -> Optional[list]:
+        """
+        Active decisions of the same owner within max_hops (through events and links).
+
+        Events belong to one decision, so other decisions are only reachable
+        through graph_edges links (CAUSES between events, PREDECESSOR /
+        SUCCESSOR between decisions); without any, the result is empty.
+
+        Returns:
+            [{"decision_id", "distance"}] nearest first, or None if unknown
+        """
+        source = self.index[DECISION].get(decision_id)
+        if source is None or not self.alive[source]:
+            return None
+
+        distance, _ = self._bfs(source, max_hops)
+        related = [
+            (hops, int(self.ext_id[node]))
+            for node, hops in distance.items()
+            if node != source and self.kind[node] == DECISION and self.alive[node]
+        ]
+        related.sort()
+        return [{"decision_id": ext_id, "distance": hops} for hops, ext_id in related[:limit]]
+
+    def k_hop(self, decision_id: int, max_hops: int = 2) -> Optional[dict]:
+        """
+        Decision and event ids within max_hops of a decision.
+
+        Returns:
+            {"decisions": [...], "events": [...]} or None if unknown
+        """
+        source = self.index[DECISION].get(decision_id)
+        if source is None:
+            return None
+
+        distance, _ = self._bfs(source, max_hops)
+        nodes = np.fromiter(distance.keys(), dtype=np.int64, count=len(distance))
+        nodes = nodes[nodes != source]
+        return {
+            "decisions": self.ext_id[nodes[self.kind[nodes] == DECISION]].tolist(),
+            "events": self.ext_id[nodes[self.kind[nodes] == EVENT]].tolist()
+        }
+
+    def shortest_path(self, from_decision_id: int, to_decision_id: int, max_hops: int = 6) -> Optional[list]:
+        """
+        Shortest path between two decisions of the same owner.
+
+        Returns:
+            [{"type": "decision"|"event", "id"}] from start to end, or None
+        """
+        source = self.index[DECISION].get(from_decision_id)
+        target = self.index[DECISION].get(to_decision_id)
+        if source is None or target is None or self.owner[source] != self.owner[target]:
+            return None
+
+        _, parent = self._bfs(source, max_hops, target=target)
+        if target not in parent:
+            return None
+
+        path = []
+        node = target
+        while node != -1:
+            path.append({
+                "type": "decision" if self.kind[node] == DECISION else "event",
+                "id": int(self.ext_id[node])
+            })
+            node = parent[node]
+        return path[::-1]
+
+    def snapshot(self) -> dict:
+        """
+        Copies of the node arrays and forward-directed edges, safe to use off the event loop.
+        """
+        src = self.edge_src
+        dst = self.edge_dst
+        if self.delta_pairs:
+            extra = np.asarray(self.delta_pairs, dtype=np.int64)
+            src = np.concatenate([src, extra[:, 0]])
+            dst = np.concatenate([dst, extra[:, 1]])
+        return {
+            "size": self.size,
+            "kind": self.kind[:self.size].copy(),
+            "ext_id": self.ext_id[:self.size].copy(),
+            "alive": self.alive[:self.size].copy(),
+            "edge_src": src.copy(),
+            "edge_dst": dst.copy()
+        }
+
+    def owns_decision(self, decision_id: int, user_id: int) -> bool:
+        node = self.index[DECISION].get(decision_id)
+        return node is not None and self.owner[node] == user_id
+
+    def get_stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "nodes": self.size,
+            "edges": len(self.edge_src) + self.delta_edges,
+            "delta_edges": self.delta_edges,
+            "build_ms": self.build_ms,
+            "built_at": self.built_at
+        }
+
+
+def edge_endpoints(edge_id: int, kind: str, source_id: int, target_id: int) -> tuple:
+    """
+    graph_edges row → ((kind, id), (kind, id), edge_id) for load() / add_edge().
+
+    Oriented forward: (d)-[:PREDECESSOR]->(d2) makes d2 the earlier decision,
+    so it is returned as d2 → d like the equivalent SUCCESSOR link.
+    """
+    node_kind = EVENT if models.GRAPH_EDGE_KINDS[kind] == "event" else DECISION
+    if kind == "PREDECESSOR":
+        source_id, target_id = target_id, source_id
+    return (node_kind, source_id), (node_kind, target_id), edge_id
+
+
+class GraphProjectionManager:
+    """
+    Builds the process-wide projection and keeps it current in the background.
+
+    Every graph write also appends a graph_changes row (see
+    GraphOutboxService), and refresh() applies the rows this worker has not
+    seen. Ids are handed out before commit, so a change can become visible
+    after one with a higher id; refresh() therefore re-reads the last
+    GRAPH_PROJECTION_LOOKBACK_SECONDS of changes as well (applying a change
+    twice is harmless). Only a write transaction open for longer than that
+    window can be missed, until the next full rebuild.
+    """
+
+    def __init__(self, projection: GraphProjection):
+        self.projection = projection
+        self._task: Optional[asyncio.Task] = None
+        self._last_change_id = 0
+
+    async def rebuild(self):
+        """Reload the whole projection from Postgres and swap it in"""
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            # Read before the tables: later changes are replayed by refresh()
+            last_change_id = (await db.execute(select(func.max(models.GraphChange.id)))).scalar() or 0
+            decisions = (await db.execute(
+                select(models.Decision.id, models.Decision.user_id, models.Decision.is_active)
+            )).all()
+            events = (await db.execute(
+                select(models.Event.id, models.Event.decision_id, models.Event.user_id)
+            )).all()
+            edges = (await db.execute(
+                select(models.GraphEdge.id, models.GraphEdge.kind, models.GraphEdge.source_id, models.GraphEdge.target_id)
+            )).all()
+
+        # The Python build loop runs in a thread so requests keep being served;
+        # only the swap happens on the event loop
+        fresh = GraphProjection()
+        await asyncio.to_thread(lambda: fresh.load(decisions, events, [edge_endpoints(*edge) for edge in edges]))
+        self._swap(fresh)
+        self._last_change_id = last_change_id
+        self.projection.build_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.projection.built_at = time.time()
+        self.projection.ready = True
+        # Writes that landed while loading
+        await self.refresh()
+
+    def _swap(self, fresh: GraphProjection):
+        # Swap state in place so references to the global projection stay valid
+        self.projection.__dict__.update({
+            key: value for key, value in fresh.__dict__.items()
+            if key not in ("ready", "built_at", "build_ms")
+        })
+
+    async def refresh(self):
+        """Apply graph changes made (by any worker) since the last refresh"""
+        since = datetime.utcnow() - timedelta(seconds=GRAPH_PROJECTION_LOOKBACK_SECONDS)
+        async with AsyncSessionLocal() as db:
+            changes = (await db.execute(
+                select(models.GraphChange.id, models.GraphChange.entity, models.GraphChange.op, models.GraphChange.payload).filter(
+                    or_(models.GraphChange.id > self._last_change_id, models.GraphChange.created_at >= since)
+                ).order_by(models.GraphChange.id)
+            )).all()
+
+        projection = self.projection
+        for change_id, entity, op, payload in changes:
+            if entity == "decision":
+                projection.add_decision(payload["id"], payload["user_id"], bool(payload["is_active"]))
+            elif entity == "event" and op == "delete":
+                projection.remove_event(payload["id"])
+            elif entity == "event":
+                projection.add_event(payload["id"], payload["decision_id"], payload["user_id"])
+            elif entity == "edge":
+                projection.add_edge(*edge_endpoints(
+                    payload["id"], payload["kind"], payload["source_id"], payload["target_id"]
+                ))
+            self._last_change_id = max(self._last_change_id, change_id)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        last_rebuild = 0.0
+        while True:
+            try:
+                if time.monotonic() - last_rebuild >= GRAPH_PROJECTION_REBUILD_SECONDS:
+                    await self.rebuild()
+                    last_rebuild = time.monotonic()
+                else:
+                    await self.refresh()
+            except Exception as e:
+                print(f"Error updating graph projection: {e}")
+            await asyncio.sleep(GRAPH_PROJECTION_REFRESH_SECONDS)
+
+
+# Global graph projection instance
+graph_projection = GraphProjection()
+graph_projection_manager = GraphProjectionManager(graph_projection)
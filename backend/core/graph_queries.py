@@ -1,110 +1,253 @@
-from neo4j import Session
-from datetime import datetime
+import os
 from typing import List, Dict, Optional
+from dotenv import load_dotenv
+from core.neo4j_db import get_async_neo4j_driver
+
+load_dotenv()
+
+# Traversal bounds. Variable-length upper bounds cannot be parameters, so
+# GRAPH_MAX_DEPTH is baked into the query text once at import and the
+# requested depth is applied as a $depth predicate: the text never changes
+# between requests and Neo4j reuses the cached plan.
+GRAPH_MAX_DEPTH = int(os.getenv("GRAPH_MAX_DEPTH", "4"))
+GRAPH_MAX_RESULTS = int(os.getenv("GRAPH_MAX_RESULTS", "100"))
+GRAPH_QUERY_TIMEOUT_SECONDS = float(os.getenv("GRAPH_QUERY_TIMEOUT_SECONDS", "5"))
+
+# Valid time. Nodes and relationships carry valid_from/valid_to (epoch ms,
+# valid_to null while current). Every query below is evaluated at instant t:
+# $as_of when given, otherwise now (which hides deleted events).
+AS_OF = "WITH coalesce($as_of, timestamp()) AS t"
+
+
+def valid_at(alias: str) -> str:
+    """Cypher predicate: alias (node or relationship) existed at instant t"""
+    return f"({alias}.valid_from <= t AND ({alias}.valid_to IS NULL OR {alias}.valid_to > t))"
+
+
+def path_valid_at(path: str) -> str:
+    """Cypher predicate: every node and relationship on path existed at instant t"""
+    return (
+        f"all(n IN nodes({path}) WHERE n.user_id = $user_id AND {valid_at('n')})"
+        f" AND all(r IN relationships({path}) WHERE {valid_at('r')})"
+    )
+
+
+# One constant text per sort order so each keeps its own cached plan
+SEARCH_DECISIONS_QUERY = """
+MATCH (d:Decision)
+WHERE d.user_id = $user_id
+  AND coalesce(d.is_active, true)
+  AND (d.title CONTAINS $pattern OR d.description CONTAINS $pattern)
+WITH d
+ORDER BY %s
+LIMIT $limit
+RETURN d.id as decision_id,
+       d.title as title,
+       d.description as description,
+       coalesce(d.importance, 0.0) as importance,
+       COUNT { (d)-[:HAS_EVENT]->(e:Event) WHERE e.valid_to IS NULL } as event_count
+"""
+SEARCH_BY_ID_QUERY = SEARCH_DECISIONS_QUERY % "d.id ASC"
+SEARCH_BY_IMPORTANCE_QUERY = SEARCH_DECISIONS_QUERY % "coalesce(d.importance, 0.0) DESC, d.id ASC"
 
 class GraphQueries:
-    """Advanced Neo4j graph queries for decision analysis."""
+    """Advanced Neo4j graph queries for decision analysis (coroutines on the async driver)."""
 
     @staticmethod
-    def get_decision_timeline(session: Session, decision_id: int) -> List[Dict]:
-        """Get all events for a decision in chronological order."""
+    async def get_decision_timeline(decision_id: int, user_id: int, as_of: Optional[int] = None,
+                                    after: Optional[tuple] = None, limit: int = 200) -> List[Dict]:
+        """
+        The decision's events as of an instant, in valid-time order, one page at a time.
+        Served by the (decision_id, valid_from) range index.
+
+        Args:
+            as_of: Epoch ms (None for now)
+            after: (valid_from, id) of the last event of the previous page
+        """
         query = """
-        MATCH (d:Decision {id: $decision_id})-[:HAS_EVENT]->(e:Event)
-        RETURN e.id as event_id, 
-               e.event_type as event_type, 
+        %s
+        MATCH (e:Event)
+        WHERE e.decision_id = $decision_id AND e.user_id = $user_id
+          AND %s
+          AND (e.valid_from > $after_from OR (e.valid_from = $after_from AND e.id > $after_id))
+        RETURN e.id as event_id,
+               e.event_type as event_type,
                e.description as description,
-               e.timestamp as timestamp,
-               e.source as source
-        ORDER BY e.timestamp ASC
+               e.source as source,
+               e.valid_from as valid_from,
+               e.valid_to as valid_to
+        ORDER BY e.valid_from ASC, e.id ASC
+        LIMIT $limit
+        """ % (AS_OF, valid_at("e"))
+        after_from, after_id = after or (-1, 0)
+        return await get_async_neo4j_driver().execute_read(query, {
+            "decision_id": decision_id,
+            "user_id": user_id,
+            "as_of": as_of,
+            "after_from": after_from,
+            "after_id": after_id,
+            "limit": limit
+        }, timeout=GRAPH_QUERY_TIMEOUT_SECONDS)
+
+    @staticmethod
+    async def get_related_decisions(decision_id: int, user_id: int, depth: int = 2, limit: int = 10,
+                                    as_of: Optional[int] = None) -> List[Dict]:
         """
-        result = session.run(query, decision_id=decision_id)
-        return [dict(record) for record in result]
+        Find the user's decisions related through linked events or sequential decisions (as of an instant).
+        An event belongs to one decision, so other decisions are only reached through CAUSES links
+        between events or PREDECESSOR / SUCCESSOR links between decisions.
+        """
+        query = """
+        %s
+        MATCH path = (d1:Decision {id: $decision_id})-[:HAS_EVENT|CAUSES|PREDECESSOR|SUCCESSOR*1..%d]-(d2:Decision)
+        WHERE d1 <> d2 AND length(path) <= $depth AND %s
+        WITH d2, min(length(path)) as distance
+        RETURN d2.id as decision_id,
+               d2.title as title,
+               d2.description as description,
+               distance
+        ORDER BY distance ASC, decision_id ASC
+        LIMIT $limit
+        """ % (AS_OF, GRAPH_MAX_DEPTH, path_valid_at("path"))
+
+        return await get_async_neo4j_driver().execute_read(query, {
+            "decision_id": decision_id,
+            "user_id": user_id,
+            "depth": depth,
+            "limit": limit,
+            "as_of": as_of
+        }, timeout=GRAPH_QUERY_TIMEOUT_SECONDS)
 
     @staticmethod
-    def get_related_decisions(session: Session, decision_id: int, depth: int = 2) -> List[Dict]:
-        """Find decisions related through shared events or sequential decisions."""
+    async def get_shortest_path(from_decision_id: int, to_decision_id: int, user_id: int, max_hops: int = 6) -> Optional[List[Dict]]:
+        """Shortest path between two of the user's decisions over any relationship."""
         query = """
-        MATCH path = (d1:Decision {id: $decision_id})-[:HAS_EVENT*1..{depth}]-(d2:Decision)
-        WHERE d1 <> d2
-        WITH d2, path, length(path) as distance
-        RETURN DISTINCT d2.id as decision_id, 
-                        d2.title as title,
-                        d2.description as description,
-                        distance,
-                        path
-        ORDER BY distance ASC
-        LIMIT 10
-        """.format(depth=depth)
-        
-        result = session.run(query, decision_id=decision_id)
-        return [dict(record) for record in result]
+        %s
+        MATCH (a:Decision {id: $from_id}), (b:Decision {id: $to_id})
+        WHERE a.user_id = $user_id AND b.user_id = $user_id
+        MATCH path = shortestPath((a)-[*..%d]-(b))
+        WHERE length(path) <= $max_hops AND %s
+        RETURN [n IN nodes(path) | {type: CASE WHEN n:Decision THEN 'decision' ELSE 'event' END, id: n.id}] as path
+        """ % (AS_OF, GRAPH_MAX_DEPTH * 2, path_valid_at("path"))
+        records = await get_async_neo4j_driver().execute_read(query, {
+            "from_id": from_decision_id,
+            "to_id": to_decision_id,
+            "user_id": user_id,
+            "max_hops": max_hops,
+            "as_of": None
+        }, timeout=GRAPH_QUERY_TIMEOUT_SECONDS)
+        return records[0]["path"] if records else None
 
     @staticmethod
-    def get_event_causality_chain(session: Session, event_id: int, depth: int = 3) -> Dict:
-        """Trace the cause-effect chain of an event."""
+    async def get_event_causality_chain(event_id: int, user_id: int, depth: int = 3, limit: int = 20,
+                                        as_of: Optional[int] = None) -> Optional[Dict]:
+        """Trace the cause-effect chain of an event (CAUSES edges, both directions, up to depth hops, as of an instant)."""
         query = """
+        %(as_of)s
         MATCH (e:Event {id: $event_id})
-        OPTIONAL MATCH (cause:Event)-[:CAUSES]->(e)
-        OPTIONAL MATCH (e)-[:CAUSES]->(effect:Event)
+        WHERE e.user_id = $user_id AND %(event_valid)s
+        CALL {
+            WITH e, t
+            OPTIONAL MATCH path = (cause:Event)-[:CAUSES*1..%(max_depth)d]->(e)
+            WHERE length(path) <= $depth AND %(path_valid)s
+            WITH cause, min(length(path)) as distance
+            WHERE cause IS NOT NULL
+            ORDER BY distance ASC, cause.id ASC
+            LIMIT $limit
+            RETURN collect({id: cause.id, type: cause.event_type, desc: cause.description, distance: distance}) as causes
+        }
+        CALL {
+            WITH e, t
+            OPTIONAL MATCH path = (e)-[:CAUSES*1..%(max_depth)d]->(effect:Event)
+            WHERE length(path) <= $depth AND %(path_valid)s
+            WITH effect, min(length(path)) as distance
+            WHERE effect IS NOT NULL
+            ORDER BY distance ASC, effect.id ASC
+            LIMIT $limit
+            RETURN collect({id: effect.id, type: effect.event_type, desc: effect.description, distance: distance}) as effects
+        }
         RETURN e.id as event_id,
                e.event_type as event_type,
                e.description as description,
-               collect({id: cause.id, type: cause.event_type, desc: cause.description}) as causes,
-               collect({id: effect.id, type: effect.event_type, desc: effect.description}) as effects
-        """
-        result = session.run(query, event_id=event_id)
-        record = result.single()
-        return dict(record) if record else None
-
-    @staticmethod
-    def get_decision_impact(session: Session, decision_id: int) -> Dict:
-        """Analyze the impact of a decision across the graph."""
-        query = """
-        MATCH (d:Decision {id: $decision_id})-[:HAS_EVENT]->(e:Event)
-        WITH d, collect(e) as events
-        OPTIONAL MATCH (d)-[:HAS_EVENT]->(e1:Event)-[:CAUSES]->(e2:Event)
-        OPTIONAL MATCH (d)-[:PREDECESSOR]->(d2:Decision)
-        OPTIONAL MATCH (d)-[:SUCCESSOR]->(d3:Decision)
-        RETURN d.id as decision_id,
-               d.title as title,
-               size(events) as event_count,
-               count(DISTINCT e2) as downstream_events,
-               count(DISTINCT d2) as predecessor_decisions,
-               count(DISTINCT d3) as successor_decisions
-        """
-        result = session.run(query, decision_id=decision_id)
-        record = result.single()
-        return dict(record) if record else None
+               causes,
+               effects
+        """ % {
+            "as_of": AS_OF,
+            "event_valid": valid_at("e"),
+            "path_valid": path_valid_at("path"),
+            "max_depth": GRAPH_MAX_DEPTH
+        }
+        records = await get_async_neo4j_driver().execute_read(query, {
+            "event_id": event_id,
+            "user_id": user_id,
+            "depth": depth,
+            "limit": limit,
+            "as_of": as_of
+        }, timeout=GRAPH_QUERY_TIMEOUT_SECONDS)
+        return records[0] if records else None
 
     @staticmethod
-    def search_decisions_by_pattern(session: Session, pattern: str) -> List[Dict]:
-        """Search decisions by title or description pattern."""
+    async def get_decision_impact(decision_id: int, user_id: int, depth: int = 3,
+                                  as_of: Optional[int] = None) -> Optional[Dict]:
+        """Analyze the impact of a decision across the user's graph (downstream events up to depth CAUSES hops, as of an instant)."""
         query = """
-        MATCH (d:Decision)
-        WHERE d.title CONTAINS $pattern OR d.description CONTAINS $pattern
-        OPTIONAL MATCH (d)-[:HAS_EVENT]->(e:Event)
+        %(as_of)s
+        MATCH (d:Decision {id: $decision_id})
+        WHERE d.user_id = $user_id AND %(decision_valid)s
+        CALL {
+            WITH d, t
+            OPTIONAL MATCH (d)-[rel:HAS_EVENT]->(e:Event)
+            WHERE %(rel_valid)s AND %(event_valid)s
+            RETURN count(e) as event_count
+        }
+        CALL {
+            WITH d, t
+            OPTIONAL MATCH path = (d)-[:HAS_EVENT]->(:Event)-[:CAUSES*1..%(max_depth)d]->(downstream:Event)
+            WHERE length(path) <= $depth + 1 AND %(path_valid)s
+            RETURN count(DISTINCT downstream) as downstream_events
+        }
+        CALL {
+            WITH d, t
+            OPTIONAL MATCH (d)-[rel:PREDECESSOR]->(d2:Decision)
+            WHERE d2.user_id = $user_id AND %(rel_valid)s AND %(d2_valid)s
+            RETURN count(DISTINCT d2) as predecessor_decisions
+        }
+        CALL {
+            WITH d, t
+            OPTIONAL MATCH (d)-[rel:SUCCESSOR]->(d3:Decision)
+            WHERE d3.user_id = $user_id AND %(rel_valid)s AND %(d3_valid)s
+            RETURN count(DISTINCT d3) as successor_decisions
+        }
         RETURN d.id as decision_id,
                d.title as title,
-               d.description as description,
-               count(e) as event_count
-        LIMIT 20
-        """
-        result = session.run(query, pattern=pattern)
-        return [dict(record) for record in result]
+               event_count,
+               downstream_events,
+               predecessor_decisions,
+               successor_decisions
+        """ % {
+            "as_of": AS_OF,
+            "decision_valid": valid_at("d"),
+            "rel_valid": valid_at("rel"),
+            "event_valid": valid_at("e"),
+            "d2_valid": valid_at("d2"),
+            "d3_valid": valid_at("d3"),
+            "path_valid": path_valid_at("path"),
+            "max_depth": GRAPH_MAX_DEPTH
+        }
+        records = await get_async_neo4j_driver().execute_read(query, {
+            "decision_id": decision_id,
+            "user_id": user_id,
+            "depth": depth,
+            "as_of": as_of
+        }, timeout=GRAPH_QUERY_TIMEOUT_SECONDS)
+        return records[0] if records else None
 
     @staticmethod
-    def get_decision_stats() -> Dict:
-        """Get overall graph statistics."""
-        from core.neo4j_db import get_neo4j_driver
-        driver = get_neo4j_driver()
-        
-        with driver.session() as session:
-            decisions = session.run("MATCH (d:Decision) RETURN count(d) as count").single()["count"]
-            events = session.run("MATCH (e:Event) RETURN count(e) as count").single()["count"]
-            relationships = session.run("MATCH ()-[r:HAS_EVENT]->() RETURN count(r) as count").single()["count"]
-            
-        return {
-            "decisions": decisions,
-            "events": events,
-            "relationships": relationships
-        }
+    async def search_decisions_by_pattern(pattern: str, user_id: int, limit: int = 20, by_importance: bool = False) -> List[Dict]:
+        """Search the user's active decisions by title or description pattern (by id, or most important first)."""
+        query = SEARCH_BY_IMPORTANCE_QUERY if by_importance else SEARCH_BY_ID_QUERY
+        return await get_async_neo4j_driver().execute_read(query, {
+            "pattern": pattern,
+            "user_id": user_id,
+            "limit": limit
+        }, timeout=GRAPH_QUERY_TIMEOUT_SECONDS)
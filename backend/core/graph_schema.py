@@ -0,0 +1,78 @@
+import os
+from neo4j.exceptions import Neo4jError
+from dotenv import load_dotenv
+
+from .neo4j_db import get_neo4j_driver
+
+load_dotenv()
+
+# Create missing constraints/indexes at startup (otherwise only report them)
+GRAPH_SCHEMA_AUTO_CREATE = os.getenv("GRAPH_SCHEMA_AUTO_CREATE", "true").lower() == "true"
+
+# name → idempotent DDL. Unique constraints also give MERGE/MATCH on id an index.
+GRAPH_CONSTRAINTS = {
+    "decision_id_unique": "CREATE CONSTRAINT decision_id_unique IF NOT EXISTS FOR (d:Decision) REQUIRE d.id IS UNIQUE",
+    "event_id_unique": "CREATE CONSTRAINT event_id_unique IF NOT EXISTS FOR (e:Event) REQUIRE e.id IS UNIQUE",
+}
+
+GRAPH_INDEXES = {
+    "event_created_at": "CREATE INDEX event_created_at IF NOT EXISTS FOR (e:Event) ON (e.created_at)",
+    "event_type": "CREATE INDEX event_type IF NOT EXISTS FOR (e:Event) ON (e.event_type)",
+    "decision_user_id": "CREATE INDEX decision_user_id IF NOT EXISTS FOR (d:Decision) ON (d.user_id)",
+    # Valid-time ranges for as-of queries (epoch ms, see Neo4jDriver.sync_batch)
+    "decision_valid_from": "CREATE INDEX decision_valid_from IF NOT EXISTS FOR (d:Decision) ON (d.valid_from)",
+    "event_valid_from": "CREATE INDEX event_valid_from IF NOT EXISTS FOR (e:Event) ON (e.valid_from)",
+    "event_decision_valid_from": "CREATE INDEX event_decision_valid_from IF NOT EXISTS FOR (e:Event) ON (e.decision_id, e.valid_from)",
+    "has_event_valid_from": "CREATE INDEX has_event_valid_from IF NOT EXISTS FOR ()-[r:HAS_EVENT]-() ON (r.valid_from)",
+    "causes_valid_from": "CREATE INDEX causes_valid_from IF NOT EXISTS FOR ()-[r:CAUSES]-() ON (r.valid_from)",
+}
+
+
+def check_graph_schema() -> dict:
+    """
+    Compare the live Neo4j schema with the expected one.
+
+    Returns:
+        {"missing": [names], "not_online": [names]}
+    """
+    neo4j = get_neo4j_driver()
+    constraints = {r["name"] for r in neo4j.execute_read("SHOW CONSTRAINTS YIELD name")}
+    indexes = {r["name"]: r["state"] for r in neo4j.execute_read("SHOW INDEXES YIELD name, state")}
+
+    missing = [name for name in GRAPH_CONSTRAINTS if name not in constraints]
+    missing += [name for name in GRAPH_INDEXES if name not in indexes]
+    not_online = [
+        name for name in list(GRAPH_CONSTRAINTS) + list(GRAPH_INDEXES)
+        if name in indexes and indexes[name] != "ONLINE"
+    ]
+    return {"missing": missing, "not_online": not_online}
+
+
+def ensure_graph_schema(create: bool = GRAPH_SCHEMA_AUTO_CREATE) -> dict:
+    """
+    Create any missing constraints/indexes (idempotent), then report what is
+    still missing or populating. Safe to call on every startup.
+
+    Args:
+        create: Run the DDL; if False only check
+
+    Returns:
+        Result of check_graph_schema()
+    """
+    if create:
+        neo4j = get_neo4j_driver()
+        for name, statement in {**GRAPH_CONSTRAINTS, **GRAPH_INDEXES}.items():
+            try:
+                neo4j.execute_write(statement)
+            except Neo4jError as e:
+                # e.g. duplicate ids already in the graph block a unique constraint
+                print(f"❌ Error creating graph schema {name}: {e}")
+
+    status = check_graph_schema()
+    if status["missing"]:
+        print(f"⚠️  Graph schema missing: {', '.join(status['missing'])}")
+    if status["not_online"]:
+        print(f"⚠️  Graph indexes still populating: {', '.join(status['not_online'])}")
+    if not status["missing"] and not status["not_online"]:
+        print("✓ Graph schema ready!")
+    return status
@@ -0,0 +1,473 @@
+import os
+import time
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import select, delete, func, text
+from neo4j.exceptions import ServiceUnavailable, SessionExpired
+from dotenv import load_dotenv
+
+from . import models
+from .database import AsyncSessionLocal
+from .neo4j_db import get_neo4j_driver
+
+load_dotenv()
+
+GRAPH_SYNC_ENABLED = os.getenv("GRAPH_SYNC_ENABLED", "true").lower() == "true"
+GRAPH_SYNC_BATCH_SIZE = int(os.getenv("GRAPH_SYNC_BATCH_SIZE", "500"))
+GRAPH_SYNC_INTERVAL_SECONDS = float(os.getenv("GRAPH_SYNC_INTERVAL_SECONDS", "1"))
+GRAPH_SYNC_MAX_ATTEMPTS = int(os.getenv("GRAPH_SYNC_MAX_ATTEMPTS", "8"))
+GRAPH_SYNC_RETRY_BASE_SECONDS = float(os.getenv("GRAPH_SYNC_RETRY_BASE_SECONDS", "2"))
+GRAPH_SYNC_RETRY_MAX_SECONDS = float(os.getenv("GRAPH_SYNC_RETRY_MAX_SECONDS", "300"))
+# graph_changes rows older than this are pruned, every GRAPH_CHANGES_PRUNE_SECONDS
+GRAPH_CHANGES_RETENTION_SECONDS = float(os.getenv("GRAPH_CHANGES_RETENTION_SECONDS", "3600"))
+GRAPH_CHANGES_PRUNE_SECONDS = float(os.getenv("GRAPH_CHANGES_PRUNE_SECONDS", "600"))
+
+# Postgres advisory lock key: one drainer at a time across API workers
+GRAPH_SYNC_LOCK_KEY = 0x67726170
+
+
+def epoch_ms(value: datetime) -> int:
+    """UTC datetime (naive values are taken as UTC) → epoch milliseconds (the unit Neo4j timestamp() uses)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+class GraphOutboxService:
+    """
+    Appends graph changes to the outbox (for Neo4j) and the change feed (for
+    the in-memory projections of all API workers).
+    Call from the same transaction as the decision/event write (after flush,
+    so ids and defaults are set); the rows commit or roll back with it.
+    """
+
+    @staticmethod
+    def _enqueue(db, decision_id: int, entity: str, entity_id: int, op: str, payload: dict):
+        db.add(models.GraphOutbox(
+            decision_id=decision_id,
+            entity=entity,
+            entity_id=entity_id,
+            op=op,
+            payload=payload
+        ))
+        db.add(models.GraphChange(
+            entity=entity,
+            entity_id=entity_id,
+            op=op,
+            payload=payload
+        ))
+
+    @staticmethod
+    def decision_payload(decision: models.Decision) -> dict:
+        # Valid-time interval: open from creation; a soft delete closes it at
+        # enqueue time (updated_at is only bumped at flush, after this runs)
+        return {
+            "id": decision.id,
+            "user_id": decision.user_id,
+            "title": decision.title,
+            "description": decision.description or "",
+            "is_active": bool(decision.is_active),
+            "created_at": epoch_ms(decision.created_at),
+            "valid_to": None if decision.is_active is not False else epoch_ms(datetime.utcnow())
+        }
+
+    @staticmethod
+    def stored_decision_payload(decision) -> dict:
+        """
+        decision_payload for a stored row (resync, requeue): a soft delete
+        closes at updated_at rather than now, and updated_at is included so
+        sync_batch(keep_closed=True) can tell a stale row from a reopen
+        """
+        payload = GraphOutboxService.decision_payload(decision)
+        payload["updated_at"] = epoch_ms(decision.updated_at) if decision.updated_at else None
+        if payload["valid_to"] is not None and payload["updated_at"] is not None:
+            payload["valid_to"] = payload["updated_at"]
+        return payload
+
+    @staticmethod
+    def event_payload(event: models.Event) -> dict:
+        return {
+            "id": event.id,
+            "decision_id": event.decision_id,
+            "user_id": event.user_id,
+            "event_type": event.event_type,
+            "description": event.description or "",
+            "source": event.source,
+            "created_at": epoch_ms(event.created_at)
+        }
+
+    @staticmethod
+    def edge_payload(edge: models.GraphEdge) -> dict:
+        return {
+            "id": edge.id,
+            "user_id": edge.user_id,
+            "kind": edge.kind,
+            "source_id": edge.source_id,
+            "target_id": edge.target_id,
+            "created_at": epoch_ms(edge.created_at)
+        }
+
+    @staticmethod
+    def enqueue_decision(db, decision: models.Decision):
+        """Queue a decision upsert (create, update and soft delete alike)"""
+        GraphOutboxService._enqueue(
+            db, decision.id, "decision", decision.id, "upsert",
+            GraphOutboxService.decision_payload(decision)
+        )
+
+    @staticmethod
+    def enqueue_event(db, event: models.Event):
+        """Queue an event upsert and its HAS_EVENT link"""
+        GraphOutboxService._enqueue(
+            db, event.decision_id, "event", event.id, "upsert",
+            GraphOutboxService.event_payload(event)
+        )
+
+    @staticmethod
+    def enqueue_edge(db, edge: models.GraphEdge, decision_id: int):
+        """Queue an edge upsert, ordered with the changes of decision_id (its source's decision)"""
+        GraphOutboxService._enqueue(
+            db, decision_id, "edge", edge.id, "upsert",
+            GraphOutboxService.edge_payload(edge)
+        )
+
+    @staticmethod
+    def enqueue_event_delete(db, event: models.Event):
+        """Queue closing an event's valid-time interval (the node is kept for as-of queries)"""
+        GraphOutboxService._enqueue(
+            db, event.decision_id, "event", event.id, "delete",
+            {"id": event.id, "deleted_at": epoch_ms(datetime.utcnow())}
+        )
+
+
+class GraphSyncWorker:
+    """
+    Background task draining the graph outbox into Neo4j.
+
+    Each pass takes the oldest pending rows (skipping decisions that have a
+    row waiting on a retry, so one decision's changes never apply out of
+    order), coalesces them to the latest state per node and applies them with
+    one UNWIND statement per kind in a single Neo4j transaction. If the batch
+    fails (other than Neo4j being unreachable), its decisions are retried one
+    by one so a bad row only holds back its own decision. Failing rows back
+    off exponentially and are dead-lettered (failed_at) after
+    GRAPH_SYNC_MAX_ATTEMPTS. Neo4j being unreachable is not held against
+    the rows: the worker stops claiming for a backoff that grows with
+    consecutive outages, and the rows keep their attempt counts.
+    Dead-lettered rows can be put back with requeue_failed().
+    """
+
+    def __init__(
+        self,
+        batch_size: int = GRAPH_SYNC_BATCH_SIZE,
+        interval_seconds: float = GRAPH_SYNC_INTERVAL_SECONDS,
+        max_attempts: int = GRAPH_SYNC_MAX_ATTEMPTS
+    ):
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.max_attempts = max_attempts
+        self.stats = {
+            "batches": 0,
+            "applied": 0,
+            "retried": 0,
+            "dead_lettered": 0,
+            "outages": 0,
+            "last_batch_size": 0,
+            "last_batch_ms": 0.0,
+            "last_batch_at": None,
+            "last_error": None
+        }
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self._consecutive_outages = 0
+        self._paused_until: Optional[datetime] = None
+
+    def start(self):
+        """Start draining in the background (call from app startup)"""
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout_seconds: float = 5.0):
+        """Stop after the current pass (call from app shutdown); unapplied rows stay queued"""
+        if self._task is None:
+            return
+        self._stopping.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            print("Graph sync worker did not stop in time; pending rows stay in the outbox")
+        self._task = None
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                drained = await self.drain_once()
+            except Exception as e:
+                print(f"Error draining graph outbox: {e}")
+                self.stats["last_error"] = str(e)
+                drained = 0
+
+            # Keep going while there is a backlog, otherwise poll
+            if drained < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def drain_once(self) -> int:
+        """
+        Apply one batch of pending outbox rows.
+
+        Returns:
+            Number of rows claimed
+        """
+        if self._paused_until is not None and datetime.utcnow() < self._paused_until:
+            return 0
+
+        async with AsyncSessionLocal() as db:
+            if db.bind.dialect.name == "postgresql":
+                locked = (await db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": GRAPH_SYNC_LOCK_KEY}
+                )).scalar()
+                if not locked:
+                    return 0
+
+            now = datetime.utcnow()
+            outbox = models.GraphOutbox
+            backing_off = select(outbox.decision_id).filter(
+                outbox.failed_at.is_(None),
+                outbox.next_attempt_at > now
+            )
+            rows = (await db.execute(
+                select(outbox).filter(
+                    outbox.failed_at.is_(None),
+                    outbox.decision_id.not_in(backing_off)
+                ).order_by(outbox.id).limit(self.batch_size)
+            )).scalars().all()
+
+            if not rows:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._apply, rows)
+                applied = rows
+            except (ServiceUnavailable, SessionExpired) as e:
+                # Neo4j unreachable: not the rows' fault, so pause claiming instead of spending their attempts
+                self._pause(e)
+                await db.rollback()
+                return 0
+            except Exception as e:
+                print(f"Error applying graph batch, retrying per decision: {e}")
+                applied = await self._apply_per_decision(rows, now)
+
+            self._consecutive_outages = 0
+            self._paused_until = None
+            if applied:
+                await db.execute(delete(outbox).filter(outbox.id.in_([r.id for r in applied])))
+            await db.commit()
+
+            self.stats["batches"] += 1
+            self.stats["applied"] += len(applied)
+            self.stats["last_batch_size"] = len(rows)
+            self.stats["last_batch_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            self.stats["last_batch_at"] = datetime.utcnow()
+            return len(rows)
+
+    async def _apply_per_decision(self, rows: list, now: datetime) -> list:
+        """Apply each decision's rows separately; schedule retries for the ones that fail"""
+        groups = {}
+        for row in rows:
+            groups.setdefault(row.decision_id, []).append(row)
+
+        applied = []
+        for group in groups.values():
+            try:
+                await asyncio.to_thread(self._apply, group)
+                applied.extend(group)
+            except Exception as e:
+                self._schedule_retry(group, e, now)
+        return applied
+
+    def _pause(self, error: Exception):
+        self._consecutive_outages += 1
+        backoff = min(
+            GRAPH_SYNC_RETRY_BASE_SECONDS * 2 ** (self._consecutive_outages - 1),
+            GRAPH_SYNC_RETRY_MAX_SECONDS
+        )
+        self._paused_until = datetime.utcnow() + timedelta(seconds=backoff)
+        self.stats["outages"] += 1
+        self.stats["last_error"] = str(error)
+        print(f"Graph unavailable, pausing sync for {backoff:.0f}s: {error}")
+
+    def _schedule_retry(self, rows: list, error: Exception, now: datetime):
+        self.stats["last_error"] = str(error)
+        for row in rows:
+            row.attempts += 1
+            row.last_error = str(error)[:2000]
+            if row.attempts >= self.max_attempts:
+                row.failed_at = now
+                self.stats["dead_lettered"] += 1
+            else:
+                backoff = min(
+                    GRAPH_SYNC_RETRY_BASE_SECONDS * 2 ** (row.attempts - 1),
+                    GRAPH_SYNC_RETRY_MAX_SECONDS
+                )
+                row.next_attempt_at = now + timedelta(seconds=backoff)
+                self.stats["retried"] += 1
+
+    @staticmethod
+    def _apply(rows: list):
+        """Coalesce rows (in id order) to the latest state per node and write them to Neo4j"""
+        decisions = {}
+        events = {}
+        closed_events = {}
+        edges = {}
+        for row in rows:
+            if row.entity == "decision":
+                decisions[row.entity_id] = row.payload
+            elif row.entity == "edge":
+                edges[row.entity_id] = row.payload
+            elif row.op == "delete":
+                closed_events[row.entity_id] = row.payload
+            else:
+                events[row.entity_id] = row.payload
+
+        get_neo4j_driver().sync_batch(
+            list(decisions.values()),
+            list(events.values()),
+            list(closed_events.values()),
+            list(edges.values())
+        )
+
+    @staticmethod
+    async def requeue_failed(decision_id: Optional[int] = None) -> int:
+        """
+        Put dead-lettered rows (of one decision, or all) back in the queue.
+
+        Decision rows get the decision's current payload, since newer changes
+        may have been applied past them. Event and edge upserts whose row has
+        since been deleted are dropped instead (the delete already applied).
+
+        Returns:
+            Number of rows requeued
+        """
+        outbox = models.GraphOutbox
+        async with AsyncSessionLocal() as db:
+            query = select(outbox).filter(outbox.failed_at.is_not(None))
+            if decision_id is not None:
+                query = query.filter(outbox.decision_id == decision_id)
+            rows = (await db.execute(query.order_by(outbox.id))).scalars().all()
+            if not rows:
+                return 0
+
+            def ids(entity: str) -> set:
+                return {r.entity_id for r in rows if r.entity == entity and r.op == "upsert"}
+
+            decisions = {
+                d.id: d for d in (await db.execute(
+                    select(models.Decision).filter(models.Decision.id.in_(ids("decision")))
+                )).scalars()
+            }
+            events = set((await db.execute(
+                select(models.Event.id).filter(models.Event.id.in_(ids("event")))
+            )).scalars())
+            edges = set((await db.execute(
+                select(models.GraphEdge.id).filter(models.GraphEdge.id.in_(ids("edge")))
+            )).scalars())
+            existing = {"decision": decisions.keys(), "event": events, "edge": edges}
+
+            requeued = 0
+            for row in rows:
+                if row.op == "upsert" and row.entity_id not in existing[row.entity]:
+                    await db.delete(row)
+                    continue
+                if row.entity == "decision":
+                    row.payload = GraphOutboxService.stored_decision_payload(decisions[row.entity_id])
+                row.attempts = 0
+                row.failed_at = None
+                row.next_attempt_at = None
+                requeued += 1
+            await db.commit()
+        return requeued
+
+    async def get_stats(self) -> dict:
+        """Worker counters plus outbox backlog and lag"""
+        outbox = models.GraphOutbox
+        async with AsyncSessionLocal() as db:
+            pending, oldest = (await db.execute(
+                select(func.count(outbox.id), func.min(outbox.created_at)).filter(
+                    outbox.failed_at.is_(None)
+                )
+            )).one()
+            dead = (await db.execute(
+                select(func.count(outbox.id)).filter(outbox.failed_at.is_not(None))
+            )).scalar()
+
+        return {
+            **self.stats,
+            "running": self._task is not None,
+            "paused_until": self._paused_until,
+            "pending": pending,
+            "dead_lettered_rows": dead,
+            "lag_seconds": round((datetime.utcnow() - oldest).total_seconds(), 3) if oldest else 0
+        }
+
+
+class GraphChangePruner:
+    """
+    Background task deleting graph_changes rows older than
+    GRAPH_CHANGES_RETENTION_SECONDS.
+
+    Every graph write appends a change row whether or not a projection or
+    sync worker runs, so this is started unconditionally at app startup.
+    Workers pruning at the same time delete the same rows; that is harmless.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @staticmethod
+    async def prune_once() -> int:
+        """
+        Delete expired change rows.
+
+        Returns:
+            Number of rows deleted
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=GRAPH_CHANGES_RETENTION_SECONDS)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(delete(models.GraphChange).filter(models.GraphChange.created_at < cutoff))
+            await db.commit()
+            return result.rowcount
+
+    async def _run(self):
+        while True:
+            try:
+                await self.prune_once()
+            except Exception as e:
+                print(f"Error pruning graph changes: {e}")
+            await asyncio.sleep(GRAPH_CHANGES_PRUNE_SECONDS)
+
+
+# Global graph sync worker instance
+graph_sync_worker = GraphSyncWorker()
+
+# Global graph change pruner instance
+graph_change_pruner = GraphChangePruner()
@@ -1,24 +1,89 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import inspect, text
 from core.database import engine, SessionLocal
 from core.models import Base, User
 from core.auth import hash_password
+from core.rollup_service import RollupService
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def migrate_event_owner():
+    """
+    Add and backfill events.user_id on databases created before it existed.
+    
+    Returns:
+        True if the column was added
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns("events")}
+    if "user_id" in columns:
+        return False
+    
+    with engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE events ADD COLUMN user_id INTEGER "
+            "REFERENCES users(id) ON DELETE CASCADE"
+        ))
+        conn.execute(text(
+            "UPDATE events SET user_id = "
+            "(SELECT decisions.user_id FROM decisions WHERE decisions.id = events.decision_id)"
+        ))
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("ALTER TABLE events ALTER COLUMN user_id SET NOT NULL"))
+    return True
+
+def migrate_decision_scores():
+    """
+    Add the graph importance columns on databases created before they existed.
+    
+    Returns:
+        True if any column was added
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns("decisions")}
+    missing = [
+        (name, ddl) for name, ddl in (
+            ("importance", "FLOAT NOT NULL DEFAULT 0"),
+            ("degree", "INTEGER NOT NULL DEFAULT 0"),
+            ("downstream_reach", "INTEGER NOT NULL DEFAULT 0"),
+            ("scores_updated_at", "TIMESTAMP"),
+        )
+        if name not in columns
+    ]
+    if not missing:
+        return False
+    
+    with engine.begin() as conn:
+        for name, ddl in missing:
+            conn.execute(text(f"ALTER TABLE decisions ADD COLUMN {name} {ddl}"))
+    return True
+
 def init_db():
     """Initialize database with tables and default admin user"""
     
     # Create all tables
     print("📊 Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    
+    if migrate_event_owner():
+        print("✓ Backfilled events.user_id!")
+    if migrate_decision_scores():
+        print("✓ Added decision importance columns!")
+    
+    # create_all skips existing tables, so add any indexes they are missing
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
     print("✓ Tables created!")
     
     # Get session
     db = SessionLocal()
     
     try:
+        # Backfill analytics rollups for databases created before they existed
+        if RollupService.backfill(db):
+            print("✓ Analytics rollups backfilled!")
+        
         # Check if admin exists
         admin = db.query(User).filter(User.email == "admin@contexweave.com").first()
         
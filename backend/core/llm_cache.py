@@ -0,0 +1,171 @@
+import os
+import json
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from dotenv import load_dotenv
+
+from . import models
+from .database import AsyncSessionLocal
+
+load_dotenv()
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+
+class LLMInsightCache:
+    """
+    Postgres cache for LLM analyses of a decision (llm_insights table).
+
+    One row per (decision, method). A row answers a request only if its
+    cache_key matches: a hash of method, model, prompt version and the
+    decision title plus ordered timeline, so any change to what the model
+    would see is a miss. Rows also expire after LLM_CACHE_TTL_SECONDS and are
+    deleted in the same transaction as any event write for the decision.
+    Failed calls (error payloads) are never stored. Concurrent misses for
+    the same key in one worker share a single model call.
+    """
+
+    def __init__(self, ttl_seconds: int = LLM_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"hits": 0, "misses": 0, "errors": 0, "invalidations": 0, "shared": 0}
+        self._inflight = {}
+
+    @staticmethod
+    def fingerprint(method: str, model: str, prompt_version: int, title: str, events: list) -> str:
+        """Hash of everything the completion depends on"""
+        timeline = [
+            [e.get("event_id"), e.get("event_type"), e.get("description"), e.get("source"), str(e.get("timestamp"))]
+            for e in events
+        ]
+        text = json.dumps([method, model, prompt_version, title, timeline], separators=(",", ":"), default=str)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_error(result) -> bool:
+        """LLMService reports failures in-band; those must not be cached"""
+        if isinstance(result, dict):
+            return "error" in result
+        if isinstance(result, str):
+            return result.startswith("Error ")
+        if isinstance(result, list):
+            return any(isinstance(item, str) and item.startswith("Error ") for item in result)
+        return False
+
+    async def get(self, decision_id: int, method: str, cache_key: str):
+        """Cached result for the key, or None"""
+        if not LLM_CACHE_ENABLED:
+            return None
+        try:
+            async with AsyncSessionLocal() as db:
+                row = (await db.execute(
+                    select(models.LLMInsight.result).filter(
+                        models.LLMInsight.decision_id == decision_id,
+                        models.LLMInsight.method == method,
+                        models.LLMInsight.cache_key == cache_key,
+                        models.LLMInsight.expires_at > datetime.utcnow()
+                    )
+                )).first()
+        except Exception as e:
+            print(f"Error reading LLM cache: {e}")
+            self.stats["errors"] += 1
+            return None
+
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return row.result
+
+    async def put(self, decision_id: int, method: str, cache_key: str, result):
+        """Store (replace) the result for a decision and method"""
+        if not LLM_CACHE_ENABLED or self.is_error(result):
+            return
+        now = datetime.utcnow()
+        values = {
+            "decision_id": decision_id,
+            "method": method,
+            "cache_key": cache_key,
+            "result": jsonable_encoder(result),
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=self.ttl_seconds)
+        }
+        try:
+            async with AsyncSessionLocal() as db:
+                insert_fn = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+                stmt = insert_fn(models.LLMInsight.__table__).values(**values)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["decision_id", "method"],
+                    set_={key: stmt.excluded[key] for key in ("cache_key", "result", "created_at", "expires_at")}
+                )
+                await db.execute(stmt)
+                await db.commit()
+        except Exception as e:
+            print(f"Error writing LLM cache: {e}")
+            self.stats["errors"] += 1
+
+    async def get_or_compute(
+        self,
+        decision_id: int,
+        method: str,
+        cache_key: str,
+        compute: Callable[[], Awaitable]
+    ):
+        """
+        Return the cached result for (decision, method, key), computing it on a miss.
+
+        Args:
+            decision_id: Decision the analysis is about
+            method: Analysis name (insights, summarize, ...)
+            cache_key: fingerprint() of the inputs
+            compute: Coroutine factory calling the model
+        """
+        flight_key = (decision_id, method, cache_key)
+        pending = self._inflight.get(flight_key)
+        if pending is not None:
+            self.stats["shared"] += 1
+            return await asyncio.shield(pending)
+
+        cached = await self.get(decision_id, method, cache_key)
+        if cached is not None:
+            return cached
+
+        pending = self._inflight.get(flight_key)
+        if pending is not None:
+            self.stats["shared"] += 1
+            return await asyncio.shield(pending)
+
+        async def compute_and_store():
+            try:
+                result = await compute()
+                await self.put(decision_id, method, cache_key, result)
+                return result
+            finally:
+                self._inflight.pop(flight_key, None)
+
+        # A task, so one caller disconnecting doesn't cancel the others' result
+        task = asyncio.ensure_future(compute_and_store())
+        self._inflight[flight_key] = task
+        return await asyncio.shield(task)
+
+    async def invalidate_decision(self, db, decision_id: int):
+        """Drop a decision's cached analyses; call in the transaction that changes its events"""
+        await db.execute(delete(models.LLMInsight).filter(models.LLMInsight.decision_id == decision_id))
+        self.stats["invalidations"] += 1
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters for this worker"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0
+        }
+
+
+# Global LLM insight cache instance
+llm_insight_cache = LLMInsightCache()
@@ -1,180 +1,306 @@
 import os
-from openai import OpenAI
-from typing import Optional, Dict, List
+import httpx
+from openai import AsyncOpenAI
+from typing import Optional, Dict, List, AsyncIterator
 import json
+from dotenv import load_dotenv
 
-class LLMService:
-    """Service for AI-powered decision and event analysis."""
-    
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.model = "gpt-3.5-turbo"  # or gpt-4 if available
-    
-    def summarize_decision_timeline(self, decision_title: str, events: List[Dict]) -> str:
-        """Generate AI summary of decision timeline."""
-        if not events:
-            return "No events recorded yet for this decision."
-        
-        # Format events for LLM
-        event_text = "\n".join([
+load_dotenv()
+
+LLM_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")  # or gpt-4 if available
+
+# Client settings. OPENAI_BASE_URL points the client at a compatible server
+# (e.g. the local stub in benchmarks/llm_client.py).
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+# Bump a method's version whenever its prompt changes so cached results (core/llm_cache.py) are not reused
+PROMPT_VERSIONS = {
+    "insights": 2,
+    "rolling_summary": 1,
+}
+
+
+def _init_openai_client() -> AsyncOpenAI:
+    """Async client on a keep-alive connection pool (one per process)"""
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS)
+    )
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        base_url=OPENAI_BASE_URL,
+        max_retries=LLM_MAX_RETRIES,
+        http_client=http_client
+    )
+
+
+def _format_events(events: List[Dict], with_source: bool = False) -> str:
+    if with_source:
+        return "\n".join([
             f"- {e['event_type'].upper()}: {e['description']} (Source: {e.get('source', 'Unknown')})"
             for e in events
         ])
-        
-        prompt = f"""
+    return "\n".join([
+        f"- {e['event_type'].upper()}: {e['description']}"
+        for e in events
+    ])
+
+
+SUMMARY_SYSTEM = "You are a decision analyst. Provide clear, concise insights."
+INSIGHTS_SYSTEM = "You are a decision analyst. Provide clear, concise, actionable insights."
+
+# Combined insights for a decision with no events, in the model's reply format
+NO_EVENTS_INSIGHTS = {
+    "summary": "No events recorded yet for this decision.",
+    "risks": [],
+    "opportunities": [],
+    "next_steps": ["Define the decision scope", "Gather more information"],
+    "score": 0,
+    "reason": "No events to evaluate"
+}
+
+
+def _summary_prompt(decision_title: str, events: List[Dict]) -> str:
+    return f"""
 Analyze this decision timeline and provide a concise executive summary (2-3 sentences).
 
 Decision: {decision_title}
 
 Events:
-{event_text}
+{_format_events(events, with_source=True)}
 
 Summary:
 """
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a decision analyst. Provide clear, concise insights."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=150
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            return f"Error generating summary: {str(e)}"
-    
-    def analyze_decision_risks(self, decision_title: str, events: List[Dict]) -> Dict:
-        """Identify potential risks and opportunities."""
-        if not events:
-            return {"risks": [], "opportunities": []}
-        
-        event_text = "\n".join([
-            f"- {e['event_type'].upper()}: {e['description']}"
-            for e in events
-        ])
-        
-        prompt = f"""
-Analyze this decision and identify risks and opportunities.
+
+
+def _fold_prompt(decision_title: str, previous: str, events: List[Dict]) -> str:
+    return f"""
+Here is the current executive summary of a decision and the events recorded since it was written.
+Update the summary so it also reflects the new events. Keep it concise (2-3 sentences).
 
 Decision: {decision_title}
 
-Events:
-{event_text}
+Current summary:
+{previous}
 
-Respond in JSON format:
-{{
-    "risks": ["risk1", "risk2"],
-    "opportunities": ["opportunity1", "opportunity2"],
-    "confidence": "high/medium/low"
-}}
+New events:
+{_format_events(events, with_source=True)}
+
+Updated summary:
 """
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a risk analyst. Identify real, actionable risks and opportunities."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=300
-            )
-            
-            # Parse JSON response
-            try:
-                result = json.loads(response.choices[0].message.content)
-                return result
-            except json.JSONDecodeError:
-                return {"risks": [], "opportunities": [], "error": "Failed to parse response"}
-        except Exception as e:
-            return {"risks": [], "opportunities": [], "error": str(e)}
-    
-    def generate_next_steps(self, decision_title: str, events: List[Dict]) -> List[str]:
-        """Generate recommended next steps based on decision history."""
-        if not events:
-            return ["Define the decision scope", "Gather more information"]
-        
-        event_text = "\n".join([
-            f"- {e['event_type'].upper()}: {e['description']}"
-            for e in events
-        ])
-        
-        prompt = f"""
-Based on this decision's timeline, what are the logical next steps?
+
+
+def _combine_prompt(decision_title: str, previous: Optional[str], summaries: List[str]) -> str:
+    earlier = f"Summary of everything before these parts:\n{previous}\n\n" if previous else ""
+    parts = "\n".join(f"{i + 1}. {summary}" for i, summary in enumerate(summaries))
+    return f"""
+Combine these summaries of consecutive parts of a decision's timeline (oldest first)
+into one concise executive summary (2-3 sentences).
 
 Decision: {decision_title}
 
-Events:
-{event_text}
+{earlier}Parts:
+{parts}
 
-Provide 3-4 specific, actionable next steps. Return as a JSON list:
-["step1", "step2", "step3"]
+Summary:
 """
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a strategic advisor. Suggest concrete next steps."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=200
-            )
-            
-            try:
-                steps = json.loads(response.choices[0].message.content)
-                return steps if isinstance(steps, list) else [response.choices[0].message.content]
-            except json.JSONDecodeError:
-                return [response.choices[0].message.content]
-        except Exception as e:
-            return [f"Error generating steps: {str(e)}"]
-    
-    def evaluate_decision_quality(self, decision_title: str, events: List[Dict]) -> Dict:
-        """Score the quality of the decision-making process."""
-        if not events:
-            return {"score": 0, "feedback": "No events to evaluate"}
-        
-        event_text = "\n".join([
-            f"- {e['event_type'].upper()}: {e['description']}"
-            for e in events
-        ])
-        
-        prompt = f"""
-Score this decision's quality based on its event history (0-10 scale).
+
+
+def _insights_prompt(decision_title: str, events: List[Dict]) -> str:
+    return f"""
+Analyze this decision timeline.
 
 Decision: {decision_title}
 
 Events:
-{event_text}
+{_format_events(events, with_source=True)}
 
-Respond in JSON:
+Respond with one JSON object with exactly these keys:
 {{
+    "summary": "concise executive summary (2-3 sentences)",
+    "risks": ["risk1", "risk2"],
+    "opportunities": ["opportunity1", "opportunity2"],
+    "confidence": "high/medium/low",
+    "next_steps": ["3-4 specific, actionable next steps"],
     "score": 7,
-    "reason": "explanation",
+    "reason": "why the decision-making process earns this 0-10 quality score",
     "strengths": ["strength1"],
     "improvements": ["improvement1"]
 }}
 """
-        
+
+
+class LLMService:
+    """
+    Service for AI-powered decision and event analysis.
+
+    Methods are coroutines on a shared AsyncOpenAI client, so a slow
+    completion never blocks the event loop and requests reuse pooled
+    keep-alive connections instead of a new TLS handshake per call. Use the
+    process-wide instance from get_llm_service().
+    """
+
+    def __init__(self, client: Optional[AsyncOpenAI] = None, timeout_seconds: float = LLM_TIMEOUT_SECONDS):
+        self.client = client or _init_openai_client()
+        self.model = LLM_MODEL
+        self.timeout_seconds = timeout_seconds
+
+    async def close(self):
+        """Close the HTTP connection pool"""
+        await self.client.close()
+
+    async def _complete(self, system: str, prompt: str, temperature: float, max_tokens: int,
+                        json_output: bool = False) -> str:
+        """One chat completion, bounded by the per-call timeout"""
+        extra = {"response_format": {"type": "json_object"}} if json_output else {}
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=self.timeout_seconds,
+            **extra
+        )
+        return response.choices[0].message.content
+
+    async def _stream(self, system: str, prompt: str, temperature: float, max_tokens: int,
+                      json_output: bool = False) -> AsyncIterator[str]:
+        """One streamed chat completion; yields content deltas as they arrive"""
+        extra = {"response_format": {"type": "json_object"}} if json_output else {}
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=self.timeout_seconds,
+            stream=True,
+            **extra
+        )
+        async with stream:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    @staticmethod
+    def parse_insights(content: str) -> Dict:
+        """
+        Shape a combined-insights JSON reply into the parts the insight endpoints return.
+
+        Returns:
+            {"summary", "analysis", "next_steps", "evaluation"}, or {"error"}
+        """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a decision quality evaluator."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=250
+            result = json.loads(content)
+        except json.JSONDecodeError:
+            return {"error": "Failed to parse response"}
+        if not isinstance(result, dict):
+            return {"error": "Failed to parse response"}
+
+        steps = result.get("next_steps")
+        return {
+            "summary": str(result.get("summary", "")).strip(),
+            "analysis": {
+                "risks": result.get("risks") or [],
+                "opportunities": result.get("opportunities") or [],
+                "confidence": result.get("confidence", "low")
+            },
+            "next_steps": steps if isinstance(steps, list) else [str(steps)] if steps else [],
+            "evaluation": {
+                "score": result.get("score", 0),
+                "reason": result.get("reason", ""),
+                "strengths": result.get("strengths") or [],
+                "improvements": result.get("improvements") or []
+            }
+        }
+
+    async def generate_insights(self, decision_title: str, events: List[Dict]) -> Dict:
+        """
+        Summary, risks/opportunities, next steps and quality score from one
+        JSON-mode completion (one prompt carrying the timeline once).
+
+        Returns:
+            {"summary", "analysis", "next_steps", "evaluation"} (see parse_insights)
+        """
+        if not events:
+            return self.parse_insights(json.dumps(NO_EVENTS_INSIGHTS))
+
+        try:
+            content = await self._complete(
+                INSIGHTS_SYSTEM, _insights_prompt(decision_title, events),
+                temperature=0.5, max_tokens=800, json_output=True
             )
-            
-            try:
-                result = json.loads(response.choices[0].message.content)
-                return result
-            except json.JSONDecodeError:
-                return {"score": 0, "error": "Failed to parse response"}
+            return self.parse_insights(content)
         except Exception as e:
-            return {"score": 0, "error": str(e)}
+            return {"error": str(e)}
+
+    async def fold_summary(self, decision_title: str, previous: Optional[str], events: List[Dict]) -> str:
+        """
+        Summary of previous (an earlier summary, or None) plus events, sending
+        only those events. Used for rolling summaries; errors are raised so a
+        failed call is never stored as a summary.
+        """
+        prompt = _fold_prompt(decision_title, previous, events) if previous else _summary_prompt(decision_title, events)
+        content = await self._complete(SUMMARY_SYSTEM, prompt, temperature=0.5, max_tokens=200)
+        return content.strip()
+
+    async def combine_summaries(self, decision_title: str, previous: Optional[str], summaries: List[str]) -> str:
+        """One summary of consecutive chunk summaries (and an earlier summary). Errors are raised."""
+        content = await self._complete(
+            SUMMARY_SYSTEM, _combine_prompt(decision_title, previous, summaries),
+            temperature=0.5, max_tokens=200
+        )
+        return content.strip()
+
+    async def stream_fold_summary(self, decision_title: str, previous: Optional[str],
+                                  events: List[Dict]) -> AsyncIterator[str]:
+        """Streaming variant of fold_summary. Errors are raised."""
+        prompt = _fold_prompt(decision_title, previous, events) if previous else _summary_prompt(decision_title, events)
+        async for token in self._stream(SUMMARY_SYSTEM, prompt, temperature=0.5, max_tokens=200):
+            yield token
+
+    async def stream_insights(self, decision_title: str, events: List[Dict]) -> AsyncIterator[str]:
+        """
+        Streaming variant of generate_insights: yields the raw JSON reply as
+        it arrives; pass the joined text to parse_insights. Errors are raised.
+        """
+        if not events:
+            yield json.dumps(NO_EVENTS_INSIGHTS)
+            return
+
+        async for token in self._stream(
+            INSIGHTS_SYSTEM, _insights_prompt(decision_title, events),
+            temperature=0.5, max_tokens=800, json_output=True
+        ):
+            yield token
+
+
+# Global LLM service instance
+llm_service: Optional[LLMService] = None
+
+def get_llm_service() -> LLMService:
+    """Get or create the shared LLM service (one connection pool per process)"""
+    global llm_service
+    if llm_service is None:
+        llm_service = LLMService()
+    return llm_service
+
+async def close_llm_service():
+    """Close the shared client's connections"""
+    global llm_service
+    if llm_service is not None:
+        await llm_service.close()
+        llm_service = None
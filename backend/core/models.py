@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, Text, Date, DateTime, Boolean, ForeignKey, Index, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -33,12 +33,13 @@ class User(Base):
     approved_at = Column(DateTime, nullable=True)
     approved_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     
-    # Relationships
+    # Relationships (never loaded implicitly; use selectinload() where needed)
     decisions = relationship(
         "Decision",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        passive_deletes=True,
+        lazy="raise"
     )
     
     def __repr__(self):
@@ -57,6 +58,12 @@ class Decision(Base):
     - One User → Many Decisions (user created the decision)
     """
     __tablename__ = "decisions"
+    __table_args__ = (
+        # Keyset pagination of a user's decisions by (created_at, id)
+        Index("ix_decisions_user_created_id", "user_id", "created_at", "id"),
+        # Keyset pagination of a user's decisions by (importance, id)
+        Index("ix_decisions_user_importance_id", "user_id", "importance", "id"),
+    )
     
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
@@ -79,12 +86,19 @@ class Decision(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = Column(Boolean, default=True)
     
-    # Relationships
+    # Graph importance, recomputed periodically by CentralityService
+    importance = Column(Float, default=0.0, nullable=False)  # PageRank, scaled so the mean node scores 1.0
+    degree = Column(Integer, default=0, nullable=False)
+    downstream_reach = Column(Integer, default=0, nullable=False)
+    scores_updated_at = Column(DateTime, nullable=True)
+    
+    # Relationships (never loaded implicitly; use selectinload() where needed)
     events = relationship(
         "Event",
         back_populates="decision",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        passive_deletes=True,
+        lazy="raise"
     )
     
     user = relationship("User", back_populates="decisions")
@@ -101,6 +115,12 @@ class Event(Base):
     Used for audit trail and triggering real-time updates.
     """
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pagination of a decision's events by (created_at, id)
+        Index("ix_events_decision_created_id", "decision_id", "created_at", "id"),
+        # Keyset pagination of all of a user's events by (created_at, id)
+        Index("ix_events_user_created_id", "user_id", "created_at", "id"),
+    )
     
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
@@ -113,6 +133,13 @@ class Event(Base):
         index=True
     )
     
+    # Owner of the parent decision (denormalized so events filter by user directly)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    
     # Core Fields
     event_type = Column(String(100), nullable=False, index=True)
     source = Column(String(100), nullable=True)
@@ -126,3 +153,189 @@ class Event(Base):
     
     def __repr__(self):
         return f"<Event(id={self.id}, type='{self.event_type}', decision_id={self.decision_id})>"
+
+
+# ==================== GRAPH EDGE MODEL ====================
+
+# Relationship type → entity both ends must be
+GRAPH_EDGE_KINDS = {
+    "CAUSES": "event",
+    "PREDECESSOR": "decision",
+    "SUCCESSOR": "decision",
+}
+
+
+class GraphEdge(Base):
+    """
+    Explicit relationships between events (CAUSES) or decisions
+    (PREDECESSOR / SUCCESSOR), beyond the implicit decision → event link.
+    Source of truth for the matching Neo4j relationships and the graph projection.
+    """
+    __tablename__ = "graph_edges"
+    __table_args__ = (
+        UniqueConstraint("kind", "source_id", "target_id", name="uq_graph_edges_kind_source_target"),
+        # Reverse lookups (edges into a node)
+        Index("ix_graph_edges_kind_target", "kind", "target_id"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    
+    # Owner of both endpoints
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    
+    # Relationship type (see GRAPH_EDGE_KINDS) and endpoint ids (events or decisions)
+    kind = Column(String(20), nullable=False)
+    source_id = Column(Integer, nullable=False)
+    target_id = Column(Integer, nullable=False)
+    
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<GraphEdge(id={self.id}, {self.source_id}-[{self.kind}]->{self.target_id})>"
+
+
+# ==================== LLM INSIGHT CACHE ====================
+
+class LLMInsight(Base):
+    """
+    Last LLM result per decision and analysis method (see core/llm_cache.py).
+    cache_key fingerprints model, prompt version and the timeline the result
+    was computed from; a row only serves requests with the same key, before
+    expires_at. Rows are deleted when the decision's events change.
+    """
+    __tablename__ = "llm_insights"
+    __table_args__ = (
+        UniqueConstraint("decision_id", "method", name="uq_llm_insights_decision_method"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    decision_id = Column(
+        Integer,
+        ForeignKey("decisions.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    method = Column(String(50), nullable=False)
+    cache_key = Column(String(64), nullable=False)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<LLMInsight(decision_id={self.decision_id}, method='{self.method}')>"
+
+
+class DecisionSummary(Base):
+    """
+    Rolling LLM summary of a decision's timeline (see core/summary_service.py).
+    Covers every event with id <= last_event_id (event_count of them; a
+    late-committed event makes the count fall short and forces a rebuild);
+    new events are folded into it rather than re-summarizing the whole
+    history. The row is dropped when an event is deleted, so the next
+    refresh rebuilds it.
+    """
+    __tablename__ = "decision_summaries"
+
+    decision_id = Column(
+        Integer,
+        ForeignKey("decisions.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    summary = Column(Text, nullable=False)
+    last_event_id = Column(Integer, nullable=False)
+    event_count = Column(Integer, nullable=False, default=0)
+    model = Column(String(100), nullable=False)
+    prompt_version = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<DecisionSummary(decision_id={self.decision_id}, last_event_id={self.last_event_id})>"
+
+
+# ==================== ANALYTICS ROLLUP MODELS ====================
+
+class DailyDecisionRollup(Base):
+    """
+    Decisions created per user per day (UTC).
+    Maintained incrementally on each decision write; serves timeline analytics.
+    """
+    __tablename__ = "daily_decision_rollups"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    decisions_created = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<DailyDecisionRollup(user_id={self.user_id}, day={self.day}, decisions={self.decisions_created})>"
+
+
+class DailyEventRollup(Base):
+    """
+    Events created per user per day (UTC) and event type.
+    Maintained incrementally on each event write/delete; serves event distribution analytics.
+    """
+    __tablename__ = "daily_event_rollups"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    event_type = Column(String(100), primary_key=True)
+    events_created = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<DailyEventRollup(user_id={self.user_id}, day={self.day}, type='{self.event_type}', events={self.events_created})>"
+
+
+# ==================== GRAPH SYNC OUTBOX ====================
+
+class GraphOutbox(Base):
+    """
+    Pending Neo4j changes, written in the same transaction as the decision/event.
+    Drained in id order by the graph sync worker (see core/graph_sync.py); rows
+    are deleted once applied, so only pending and dead-lettered rows remain.
+    """
+    __tablename__ = "graph_outbox"
+    
+    id = Column(Integer, primary_key=True)
+    
+    # Decision the change belongs to; changes for one decision are applied in order
+    decision_id = Column(Integer, nullable=False, index=True)
+    
+    # What to apply: entity "decision" | "event" | "edge", op "upsert" | "delete"
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(20), nullable=False, default="upsert")
+    payload = Column(JSON, nullable=False)
+    
+    # Delivery state (failed_at set once retries are exhausted)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=True)
+    failed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<GraphOutbox(id={self.id}, {self.entity}:{self.entity_id} {self.op})>"
+
+
+class GraphChange(Base):
+    """
+    Recent graph changes, read by every API worker to keep its in-memory
+    projection current (see GraphProjectionManager.refresh). Written next to
+    the outbox row in the same transaction, but not removed once Neo4j has
+    it; rows older than GRAPH_CHANGES_RETENTION_SECONDS are pruned by GraphChangePruner.
+    """
+    __tablename__ = "graph_changes"
+    
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(20), nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<GraphChange(id={self.id}, {self.entity}:{self.entity_id} {self.op})>"
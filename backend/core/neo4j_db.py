@@ -1,14 +1,61 @@
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, AsyncGraphDatabase, unit_of_work
 from typing import Optional
+from collections import deque
 import os
+import time
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Neo4j connection settings
+# Neo4j connection settings (neo4j:// URIs route reads to followers in a cluster)
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
+NEO4J_DATABASE = os.getenv("NEO4J_DATABASE") or None
+
+# Pool and transaction tuning
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "100"))
+NEO4J_ACQUISITION_TIMEOUT_SECONDS = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT_SECONDS", "30"))
+NEO4J_CONNECTION_TIMEOUT_SECONDS = float(os.getenv("NEO4J_CONNECTION_TIMEOUT_SECONDS", "15"))
+NEO4J_MAX_CONNECTION_LIFETIME_SECONDS = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME_SECONDS", "3600"))
+NEO4J_FETCH_SIZE = int(os.getenv("NEO4J_FETCH_SIZE", "1000"))
+NEO4J_MAX_RETRY_TIME_SECONDS = float(os.getenv("NEO4J_MAX_RETRY_TIME_SECONDS", "15"))
+
+
+# Explicit relationship types → label of both endpoints. Types cannot be
+# parameters, so each gets its own constant UNWIND statement.
+EDGE_ENDPOINT_LABELS = {
+    "CAUSES": "Event",
+    "PREDECESSOR": "Decision",
+    "SUCCESSOR": "Decision",
+}
+
+EDGE_UPSERT_QUERIES = {
+    kind: """
+    UNWIND $rows AS row
+    MERGE (a:%(label)s {id: row.source_id})
+    MERGE (b:%(label)s {id: row.target_id})
+    MERGE (a)-[rel:%(kind)s]->(b)
+    SET rel.id = row.id,
+        rel.user_id = row.user_id,
+        rel.created_at = row.created_at,
+        rel.valid_from = row.created_at
+    """ % {"label": label, "kind": kind}
+    for kind, label in EDGE_ENDPOINT_LABELS.items()
+}
+
+
+def _driver_config() -> dict:
+    """Pool sizing, timeouts, fetch size and managed-transaction retry budget"""
+    return {
+        "max_connection_pool_size": NEO4J_MAX_POOL_SIZE,
+        "connection_acquisition_timeout": NEO4J_ACQUISITION_TIMEOUT_SECONDS,
+        "connection_timeout": NEO4J_CONNECTION_TIMEOUT_SECONDS,
+        "max_connection_lifetime": NEO4J_MAX_CONNECTION_LIFETIME_SECONDS,
+        "fetch_size": NEO4J_FETCH_SIZE,
+        "max_transaction_retry_time": NEO4J_MAX_RETRY_TIME_SECONDS,
+    }
 
 def _init_neo4j_driver():
     """Initialize driver with environment variables"""
@@ -19,24 +66,116 @@ def _init_neo4j_driver():
     print(f"[NEO4J] Connecting to: {uri}")
     print(f"[NEO4J] User: {user}")
     
-    return GraphDatabase.driver(uri, auth=(user, password))
+    return GraphDatabase.driver(uri, auth=(user, password), **_driver_config())
+
+def _init_async_neo4j_driver():
+    """Initialize asyncio driver with the same settings"""
+    uri = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "password")
+    return AsyncGraphDatabase.driver(uri, auth=(user, password), **_driver_config())
+
+
+class QueryStats:
+    """
+    Per access mode (read/write) query counters: latency, retries and pool
+    wait (time until the transaction function first runs, i.e. connection
+    acquisition plus BEGIN). Thread-safe; percentiles over a sliding window.
+    """
+    
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._modes = {}
+    
+    def record(self, mode: str, latency_ms: float, pool_wait_ms: float, attempts: int, error: bool):
+        with self._lock:
+            entry = self._modes.setdefault(mode, {
+                "count": 0,
+                "errors": 0,
+                "retries": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "total_pool_wait_ms": 0.0,
+                "max_pool_wait_ms": 0.0,
+                "latencies": deque(maxlen=self.window)
+            })
+            entry["count"] += 1
+            entry["errors"] += int(error)
+            entry["retries"] += max(attempts - 1, 0)
+            entry["total_ms"] += latency_ms
+            entry["max_ms"] = max(entry["max_ms"], latency_ms)
+            entry["total_pool_wait_ms"] += pool_wait_ms
+            entry["max_pool_wait_ms"] = max(entry["max_pool_wait_ms"], pool_wait_ms)
+            entry["latencies"].append(latency_ms)
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            result = {}
+            for mode, entry in self._modes.items():
+                latencies = sorted(entry["latencies"])
+                pick = lambda q: round(latencies[min(int(q * len(latencies)), len(latencies) - 1)], 2)
+                result[mode] = {
+                    "count": entry["count"],
+                    "errors": entry["errors"],
+                    "retries": entry["retries"],
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 2),
+                    "p50_ms": pick(0.5),
+                    "p95_ms": pick(0.95),
+                    "max_ms": round(entry["max_ms"], 2),
+                    "avg_pool_wait_ms": round(entry["total_pool_wait_ms"] / entry["count"], 2),
+                    "max_pool_wait_ms": round(entry["max_pool_wait_ms"], 2)
+                }
+            return result
+
 
 class Neo4jDriver:
     """
     Neo4j Graph Database connection manager.
     Handles graph queries for temporal relationships.
+    
+    All access goes through managed transactions (execute_read /
+    execute_write), which the driver retries on transient errors and leader
+    changes for up to NEO4J_MAX_RETRY_TIME_SECONDS. Transaction functions
+    may therefore run more than once and must be idempotent.
     """
     
     def __init__(self):
         self.driver = _init_neo4j_driver()
+        self.stats = QueryStats()
     
     def close(self):
         """Close the Neo4j connection"""
         self.driver.close()
     
-    def execute_query(self, query: str, parameters: dict = None):
+    def _execute(self, mode: str, work):
+        """Run work(tx) in a managed read or write transaction and record timings"""
+        started = time.perf_counter()
+        timing = {"first_attempt": None, "attempts": 0}
+        
+        def tracked(tx):
+            timing["attempts"] += 1
+            if timing["first_attempt"] is None:
+                timing["first_attempt"] = time.perf_counter()
+            return work(tx)
+        
+        error = False
+        try:
+            with self.driver.session(database=NEO4J_DATABASE) as session:
+                if mode == "read":
+                    return session.execute_read(tracked)
+                return session.execute_write(tracked)
+        except Exception:
+            error = True
+            raise
+        finally:
+            finished = time.perf_counter()
+            pool_wait = (timing["first_attempt"] or finished) - started
+            self.stats.record(mode, (finished - started) * 1000, pool_wait * 1000, timing["attempts"], error)
+    
+    def execute_read(self, query: str, parameters: dict = None):
         """
-        Execute a Cypher query and return results.
+        Execute a read-only Cypher query (routed to readers in a cluster).
         
         Args:
             query: Cypher query string
@@ -45,114 +184,200 @@ class Neo4jDriver:
         Returns:
             Query results
         """
-        with self.driver.session() as session:
-            result = session.run(query, parameters or {})
-            return result.data()
+        return self._execute("read", lambda tx: tx.run(query, parameters or {}).data())
     
-    def create_decision_node(self, decision_id: int, title: str, description: str):
+    def execute_write(self, query: str, parameters: dict = None):
         """
-        Create a Decision node in Neo4j.
+        Execute a Cypher query that writes (routed to the leader).
         
         Args:
-            decision_id: Decision ID from PostgreSQL
-            title: Decision title
-            description: Decision description
-        """
-        query = """
-        MERGE (d:Decision {id: $decision_id})
-        SET d.title = $title,
-            d.description = $description,
-            d.created_at = timestamp()
-        RETURN d
+            query: Cypher query string
+            parameters: Query parameters
+            
+        Returns:
+            Query results
         """
-        return self.execute_query(query, {
-            "decision_id": decision_id,
-            "title": title,
-            "description": description
-        })
+        return self._execute("write", lambda tx: tx.run(query, parameters or {}).data())
     
-    def create_event_node(self, event_id: int, decision_id: int, event_type: str, description: str):
-        """
-        Create an Event node and link to Decision.
-        
-        Args:
-            event_id: Event ID from PostgreSQL
-            decision_id: Parent Decision ID
-            event_type: Type of event
-            description: Event description
-        """
-        query = """
-        MERGE (e:Event {id: $event_id})
-        SET e.event_type = $event_type,
-            e.description = $description,
-            e.created_at = timestamp()
-        
-        WITH e
-        MATCH (d:Decision {id: $decision_id})
-        MERGE (d)-[rel:HAS_EVENT]->(e)
-        SET rel.created_at = timestamp()
-        
-        RETURN e, d, rel
-        """
-        return self.execute_query(query, {
-            "event_id": event_id,
-            "decision_id": decision_id,
-            "event_type": event_type,
-            "description": description
-        })
-    
-    def get_decision_timeline(self, decision_id: int):
+    def execute_query(self, query: str, parameters: dict = None):
         """
-        Get all events for a decision in chronological order (temporal timeline).
+        Execute a Cypher query and return results.
+        Runs as a write transaction; prefer execute_read for queries that only read.
         
         Args:
-            decision_id: Decision ID
+            query: Cypher query string
+            parameters: Query parameters
             
         Returns:
-            Ordered list of events
-        """
-        query = """
-        MATCH (d:Decision {id: $decision_id})-[rel:HAS_EVENT]->(e:Event)
-        RETURN d, e, rel
-        ORDER BY e.created_at ASC
+            Query results
         """
-        return self.execute_query(query, {"decision_id": decision_id})
+        return self.execute_write(query, parameters)
     
-    def get_related_decisions(self, decision_id: int):
+    def execute_write_batch(self, statements: list):
         """
-        Find decisions that are related through events or dependencies.
+        Run several Cypher statements in one write transaction.
         
         Args:
-            decision_id: Decision ID
-            
-        Returns:
-            List of related decisions
-        """
-        query = """
-        MATCH (d1:Decision {id: $decision_id})-[rel]->(e:Event)
-        MATCH (e)<-[rel2]-(d2:Decision)
-        WHERE d1.id <> d2.id
-        RETURN DISTINCT d2
-        LIMIT 10
+            statements: List of (query, parameters) pairs
         """
-        return self.execute_query(query, {"decision_id": decision_id})
+        def work(tx):
+            for query, parameters in statements:
+                tx.run(query, parameters or {}).consume()
+        
+        self._execute("write", work)
     
-    def get_event_causality(self, event_id: int):
+    def sync_batch(self, decisions: list, events: list, closed_events: list, edges: list = (),
+                   keep_closed: bool = False):
         """
-        Find what decisions/events caused this event.
+        Apply a batch of outbox changes with one UNWIND statement per kind.
+        Decisions are upserted before events, and events before explicit
+        edges, so relationships always have both ends.
+        
+        Nodes and HAS_EVENT carry a valid-time interval in epoch ms:
+        valid_from is the Postgres created_at, valid_to is null while current.
+        Deleted events are closed (with their HAS_EVENT/CAUSES relationships)
+        rather than removed, so as-of queries can still see them.
         
         Args:
-            event_id: Event ID
-            
-        Returns:
-            Causality chain
+            decisions: Decision payloads (id, user_id, title, description, is_active, created_at, valid_to)
+            events: Event payloads (id, decision_id, user_id, event_type, description, source, created_at)
+            closed_events: Deleted event payloads (id, deleted_at)
+            edges: Edge payloads (id, user_id, kind, source_id, target_id, created_at)
+            keep_closed: Keep a decision closed when the graph closed it after
+                the payload's updated_at (a payload read before a later soft
+                delete, e.g. by a resync); payloads without updated_at, or
+                newer than the close, are applied as they are
         """
-        query = """
-        MATCH (e:Event {id: $event_id})<-[rel1]-(d:Decision)-[rel2]->(prev_e:Event)
-        RETURN d, prev_e, rel1, rel2
-        ORDER BY prev_e.created_at DESC
+        statements = []
+        if decisions:
+            statements.append(("""
+            UNWIND $rows AS row
+            MERGE (d:Decision {id: row.id})
+            SET d.title = row.title,
+                d.description = row.description,
+                d.user_id = row.user_id,
+                d.is_active = CASE WHEN $keep_closed AND d.valid_to > row.updated_at THEN false
+                                   ELSE row.is_active END,
+                d.created_at = row.created_at,
+                d.valid_from = row.created_at,
+                d.valid_to = CASE WHEN $keep_closed AND d.valid_to > row.updated_at THEN d.valid_to
+                                  WHEN row.valid_to IS NULL THEN null
+                                  ELSE coalesce(d.valid_to, row.valid_to) END
+            """, {"rows": decisions, "keep_closed": keep_closed}))
+        if events:
+            statements.append(("""
+            UNWIND $rows AS row
+            MERGE (d:Decision {id: row.decision_id})
+            MERGE (e:Event {id: row.id})
+            SET e.event_type = row.event_type,
+                e.description = row.description,
+                e.source = row.source,
+                e.user_id = row.user_id,
+                e.decision_id = row.decision_id,
+                e.created_at = row.created_at,
+                e.valid_from = row.created_at
+            MERGE (d)-[rel:HAS_EVENT]->(e)
+            SET rel.created_at = row.created_at,
+                rel.valid_from = row.created_at
+            """, {"rows": events}))
+        by_kind = {}
+        for edge in edges:
+            by_kind.setdefault(edge["kind"], []).append(edge)
+        for kind, rows in by_kind.items():
+            statements.append((EDGE_UPSERT_QUERIES[kind], {"rows": rows}))
+        if closed_events:
+            # Rows queued before valid-time tracking carry no deleted_at
+            statements.append(("""
+            UNWIND $rows AS row
+            MATCH (e:Event {id: row.id})
+            WITH e, coalesce(row.deleted_at, timestamp()) AS closed_at
+            SET e.valid_to = coalesce(e.valid_to, closed_at)
+            WITH e, closed_at
+            CALL {
+                WITH e, closed_at
+                MATCH (e)-[rel:HAS_EVENT|CAUSES]-()
+                SET rel.valid_to = coalesce(rel.valid_to, closed_at)
+            }
+            """, {"rows": closed_events}))
+        if statements:
+            self.execute_write_batch(statements)
+
+    def set_decision_scores(self, rows: list):
         """
-        return self.execute_query(query, {"event_id": event_id})
+        Store importance scores on Decision nodes with one UNWIND statement.
+
+        Args:
+            rows: Score dicts (id, importance, degree, downstream_reach)
+        """
+        if rows:
+            self.execute_write("""
+            UNWIND $rows AS row
+            MATCH (d:Decision {id: row.id})
+            SET d.importance = row.importance,
+                d.degree = row.degree,
+                d.downstream_reach = row.downstream_reach
+            """, {"rows": rows})
+
+
+class AsyncNeo4jDriver:
+    """
+    Asyncio counterpart of Neo4jDriver for use inside async request handlers,
+    so graph round trips don't block the event loop. Same managed-transaction
+    semantics, settings and stats; must be created and used on one event loop.
+    """
+    
+    def __init__(self):
+        self.driver = _init_async_neo4j_driver()
+        self.stats = QueryStats()
+    
+    async def close(self):
+        """Close the Neo4j connection"""
+        await self.driver.close()
+    
+    async def _execute(self, mode: str, work, timeout: Optional[float] = None):
+        """
+        Run await work(tx) in a managed read or write transaction and record timings.
+        timeout (seconds) is enforced server side and fails the transaction.
+        """
+        started = time.perf_counter()
+        timing = {"first_attempt": None, "attempts": 0}
+        
+        @unit_of_work(timeout=timeout)
+        async def tracked(tx):
+            timing["attempts"] += 1
+            if timing["first_attempt"] is None:
+                timing["first_attempt"] = time.perf_counter()
+            return await work(tx)
+        
+        error = False
+        try:
+            async with self.driver.session(database=NEO4J_DATABASE) as session:
+                if mode == "read":
+                    return await session.execute_read(tracked)
+                return await session.execute_write(tracked)
+        except Exception:
+            error = True
+            raise
+        finally:
+            finished = time.perf_counter()
+            pool_wait = (timing["first_attempt"] or finished) - started
+            self.stats.record(mode, (finished - started) * 1000, pool_wait * 1000, timing["attempts"], error)
+    
+    async def execute_read(self, query: str, parameters: dict = None, timeout: Optional[float] = None):
+        """Execute a read-only Cypher query and return results"""
+        async def work(tx):
+            result = await tx.run(query, parameters or {})
+            return await result.data()
+        
+        return await self._execute("read", work, timeout)
+    
+    async def execute_write(self, query: str, parameters: dict = None):
+        """Execute a Cypher query that writes and return results"""
+        async def work(tx):
+            result = await tx.run(query, parameters or {})
+            return await result.data()
+        
+        return await self._execute("write", work)
 
 
 # Global Neo4j driver instance
@@ -170,3 +395,22 @@ def close_neo4j():
     global neo4j_driver
     if neo4j_driver:
         neo4j_driver.close()
+        neo4j_driver = None
+
+
+# Global async Neo4j driver instance (created on the app's event loop)
+async_neo4j_driver: Optional[AsyncNeo4jDriver] = None
+
+def get_async_neo4j_driver() -> AsyncNeo4jDriver:
+    """Get or create async Neo4j driver instance"""
+    global async_neo4j_driver
+    if async_neo4j_driver is None:
+        async_neo4j_driver = AsyncNeo4jDriver()
+    return async_neo4j_driver
+
+async def close_async_neo4j():
+    """Close async Neo4j connection"""
+    global async_neo4j_driver
+    if async_neo4j_driver:
+        await async_neo4j_driver.close()
+        async_neo4j_driver = None
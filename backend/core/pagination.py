@@ -0,0 +1,111 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import tuple_
+
+
+# ==================== KEYSET (CURSOR) PAGINATION ====================
+#
+# Pages are ordered by (created_at, id) and continue strictly after the last
+# row of the previous page, so every page is one index range scan no matter
+# how deep it is. Cursors are opaque base64 tokens of that (created_at, id).
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode the position after a row as an opaque cursor.
+    
+    Example:
+        cursor = encode_cursor(event.created_at, event.id)
+    """
+    payload = json.dumps({"c": created_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        ValueError if the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def paginate(query, model, cursor: Optional[str], limit: int):
+    """
+    Order a select by (created_at, id) and restrict it to one page.
+    Fetches limit + 1 rows so next_cursor() can tell whether more exist.
+    
+    Raises:
+        ValueError if the cursor is malformed
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) > tuple_(created_at, row_id))
+    
+    return query.order_by(model.created_at, model.id).limit(limit + 1)
+
+
+def split_page(rows: list, limit: int) -> tuple[list, Optional[str]]:
+    """
+    Split the rows of a paginate() query into (page, next_cursor).
+    next_cursor is None on the last page.
+    """
+    if len(rows) <= limit:
+        return list(rows), None
+    
+    page = list(rows[:limit])
+    return page, encode_cursor(page[-1].created_at, page[-1].id)
+
+
+# ==================== SCORE-ORDERED PAGINATION ====================
+#
+# Same scheme for "most important first" lists: pages are ordered by
+# (importance DESC, id DESC) and continue strictly below the last row.
+
+def encode_score_cursor(score: float, row_id: int) -> str:
+    """Encode the position after a row of a score-ordered page."""
+    payload = json.dumps({"s": score, "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_score_cursor(cursor: str) -> tuple[float, int]:
+    """
+    Decode a cursor produced by encode_score_cursor.
+    
+    Raises:
+        ValueError if the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(payload["s"]), int(payload["i"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def paginate_by_score(query, model, cursor: Optional[str], limit: int):
+    """
+    Order a select by (importance, id) descending and restrict it to one page.
+    
+    Raises:
+        ValueError if the cursor is malformed
+    """
+    if cursor:
+        score, row_id = decode_score_cursor(cursor)
+        query = query.filter(tuple_(model.importance, model.id) < tuple_(score, row_id))
+    
+    return query.order_by(model.importance.desc(), model.id.desc()).limit(limit + 1)
+
+
+def split_score_page(rows: list, limit: int) -> tuple[list, Optional[str]]:
+    """Split the rows of a paginate_by_score() query into (page, next_cursor)."""
+    if len(rows) <= limit:
+        return list(rows), None
+    
+    page = list(rows[:limit])
+    return page, encode_score_cursor(page[-1].importance, page[-1].id)
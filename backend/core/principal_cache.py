@@ -0,0 +1,114 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+from dotenv import load_dotenv
+
+from .auth import Principal
+from .redis_client import get_redis
+
+load_dotenv()
+
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+
+
+class PrincipalCache:
+    """
+    Bounded TTL/LRU cache of authenticated principals keyed by user id.
+
+    Lookups hit the in-process LRU first, then Redis (shared by all workers)
+    when REDIS_URL is set. Entries live for at most ttl_seconds in each tier,
+    so a status/role change made elsewhere is visible within one TTL even
+    without explicit invalidation.
+    """
+
+    def __init__(self, ttl_seconds: int = PRINCIPAL_CACHE_TTL_SECONDS, max_size: int = PRINCIPAL_CACHE_MAX_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, tuple[float, Principal]]" = OrderedDict()
+
+    @staticmethod
+    def _redis_key(user_id: int) -> str:
+        return f"principal:{user_id}"
+
+    def _get_local(self, user_id: int) -> Optional[Principal]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+
+        self._entries.move_to_end(user_id)
+        return principal
+
+    def _set_local(self, principal: Principal):
+        self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, user_id: int) -> Optional[Principal]:
+        """
+        Get a cached principal.
+
+        Returns:
+            Principal if cached and fresh, None otherwise
+        """
+        principal = self._get_local(user_id)
+        if principal is not None:
+            return principal
+
+        redis = get_redis()
+        if redis is None:
+            return None
+
+        try:
+            raw = await redis.get(self._redis_key(user_id))
+        except Exception as e:
+            print(f"Error reading principal cache: {e}")
+            return None
+
+        if raw is None:
+            return None
+
+        principal = Principal.model_validate_json(raw)
+        self._set_local(principal)
+        return principal
+
+    async def set(self, principal: Principal):
+        """Cache a principal loaded from the database"""
+        self._set_local(principal)
+
+        redis = get_redis()
+        if redis is None:
+            return
+
+        try:
+            await redis.set(
+                self._redis_key(principal.id),
+                principal.model_dump_json(),
+                ex=self.ttl_seconds
+            )
+        except Exception as e:
+            print(f"Error writing principal cache: {e}")
+
+    async def invalidate(self, user_id: int):
+        """Drop a principal after its status or role changes"""
+        self._entries.pop(user_id, None)
+
+        redis = get_redis()
+        if redis is None:
+            return
+
+        try:
+            await redis.delete(self._redis_key(user_id))
+        except Exception as e:
+            print(f"Error invalidating principal cache: {e}")
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache()
@@ -0,0 +1,27 @@
+import os
+from typing import Optional
+import redis.asyncio as redis
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Redis connection settings (Redis features are skipped when unset)
+REDIS_URL = os.getenv("REDIS_URL")
+
+
+# Global Redis client instance
+redis_client: Optional[redis.Redis] = None
+
+def get_redis() -> Optional[redis.Redis]:
+    """Get or create the shared async Redis client (None if REDIS_URL is unset)"""
+    global redis_client
+    if redis_client is None and REDIS_URL:
+        redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+    return redis_client
+
+async def close_redis():
+    """Close Redis connection"""
+    global redis_client
+    if redis_client:
+        await redis_client.aclose()
+        redis_client = None
@@ -0,0 +1,86 @@
+from sqlalchemy import select, insert, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from datetime import datetime
+from . import models
+
+
+class RollupService:
+    """
+    Incremental maintenance of the daily analytics rollup tables.
+    Call from the same transaction as the decision/event write so the
+    rollups never drift from the source rows.
+    """
+
+    @staticmethod
+    async def _increment(db: AsyncSession, model, keys: dict, column: str, delta: int):
+        """Upsert a rollup row, adding delta to its counter."""
+        dialect = db.bind.dialect.name
+        insert_fn = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+        stmt = insert_fn(model.__table__).values(**keys, **{column: delta})
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: getattr(model.__table__.c, column) + stmt.excluded[column]}
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    async def record_decision(db: AsyncSession, user_id: int, created_at: datetime):
+        """Count a newly created decision."""
+        await RollupService._increment(
+            db,
+            models.DailyDecisionRollup,
+            {"user_id": user_id, "day": created_at.date()},
+            "decisions_created",
+            1
+        )
+
+    @staticmethod
+    async def record_event(db: AsyncSession, user_id: int, event_type: str, created_at: datetime, delta: int = 1):
+        """Count a created (delta=1) or deleted (delta=-1) event."""
+        await RollupService._increment(
+            db,
+            models.DailyEventRollup,
+            {"user_id": user_id, "day": created_at.date(), "event_type": event_type},
+            "events_created",
+            delta
+        )
+
+    @staticmethod
+    def backfill(db: Session) -> bool:
+        """
+        Populate empty rollup tables from existing decisions and events.
+
+        Returns:
+            True if a backfill ran, False if rollups already existed
+        """
+        has_rollups = db.execute(select(models.DailyDecisionRollup.user_id).limit(1)).first() \
+            or db.execute(select(models.DailyEventRollup.user_id).limit(1)).first()
+        if has_rollups:
+            return False
+
+        decision_day = func.date(models.Decision.created_at)
+        db.execute(insert(models.DailyDecisionRollup).from_select(
+            ["user_id", "day", "decisions_created"],
+            select(
+                models.Decision.user_id,
+                decision_day,
+                func.count(models.Decision.id)
+            ).group_by(models.Decision.user_id, decision_day)
+        ))
+
+        event_day = func.date(models.Event.created_at)
+        db.execute(insert(models.DailyEventRollup).from_select(
+            ["user_id", "day", "event_type", "events_created"],
+            select(
+                models.Event.user_id,
+                event_day,
+                models.Event.event_type,
+                func.count(models.Event.id)
+            ).group_by(models.Event.user_id, event_day, models.Event.event_type)
+        ))
+
+        db.commit()
+        return True
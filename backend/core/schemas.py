@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
-from typing import Optional
+from typing import Optional, Literal
 from datetime import datetime
 
 
@@ -40,6 +40,9 @@ class DecisionResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     is_active: bool
+    importance: float = 0.0
+    degree: int = 0
+    downstream_reach: int = 0
     
     class Config:
         from_attributes = True
@@ -111,3 +114,30 @@ class EventResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+# ==================== GRAPH EDGE SCHEMAS ====================
+
+class EdgeCreate(BaseModel):
+    """One relationship: CAUSES links events, PREDECESSOR / SUCCESSOR link decisions."""
+    kind: Literal["CAUSES", "PREDECESSOR", "SUCCESSOR"]
+    source_id: int = Field(..., gt=0)
+    target_id: int = Field(..., gt=0)
+    
+    @model_validator(mode='after')
+    def check_not_self_loop(self):
+        """Ensure the edge links two different nodes."""
+        if self.source_id == self.target_id:
+            raise ValueError('An edge cannot link a node to itself')
+        return self
+
+
+class EdgeBulkCreate(BaseModel):
+    """Schema for creating many edges in one request."""
+    edges: list[EdgeCreate] = Field(..., min_length=1, max_length=5000)
+
+
+class EdgeBulkResponse(BaseModel):
+    """Result of a bulk edge import."""
+    created: int
+    existing: int
@@ -1,241 +1,112 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from sqlalchemy import select, delete, literal_column, union_all, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from . import models, schemas
-from .graph_service import GraphService
+from .graph_sync import GraphOutboxService
+from .graph_projection import graph_projection, edge_endpoints
 
 
-class DecisionService:
-    """
-    Business logic for Decision operations.
-    Handles all CRUD operations on decisions.
-    """
-    
-    @staticmethod
-    def create_decision(db: Session, decision: schemas.DecisionCreate) -> models.Decision:
-        """
-        Create a new decision in the database.
-        Auto-syncs to Neo4j graph for temporal reasoning.
-        
-        Args:
-            db: Database session
-            decision: Decision data from schema
-            
-        Returns:
-            Created Decision object
-        """
-        db_decision = models.Decision(
-            title=decision.title,
-            description=decision.description,
-            context=decision.context
-        )
-        db.add(db_decision)
-        db.commit()
-        db.refresh(db_decision)
-        
-        # ✨ NEW: Sync to Neo4j graph automatically
-        GraphService.sync_decision_to_graph(db, db_decision.id)
-        
-        return db_decision
-
-    
-    
-    @staticmethod
-    def get_decision(db: Session, decision_id: int) -> models.Decision:
-        """
-        Retrieve a single decision by ID.
-        Only returns active decisions.
-        
-        Args:
-            db: Database session
-            decision_id: The decision's ID
-            
-        Returns:
-            Decision object or None if not found
-        """
-        return db.query(models.Decision).filter(
-            models.Decision.id == decision_id,
-            models.Decision.is_active == True
-        ).first()
-    
-    
-    @staticmethod
-    def get_all_decisions(
-        db: Session, 
-        skip: int = 0, 
-        limit: int = 10
-    ) -> list[models.Decision]:
-        """
-        Retrieve all active decisions with pagination.
-        
-        Args:
-            db: Database session
-            skip: Number of records to skip (for pagination)
-            limit: Maximum records to return
-            
-        Returns:
-            List of Decision objects
-        """
-        return db.query(models.Decision).filter(
-            models.Decision.is_active == True
-        ).offset(skip).limit(limit).all()
-    
-    
-    @staticmethod
-    def update_decision(
-        db: Session, 
-        decision_id: int, 
-        decision: schemas.DecisionUpdate
-    ) -> models.Decision:
-        """
-        Update an existing decision.
-        Only updates provided fields (partial update).
-        
-        Args:
-            db: Database session
-            decision_id: The decision's ID
-            decision: New data for the decision
-            
-        Returns:
-            Updated Decision object or None if not found
-        """
-        # Find the decision
-        db_decision = DecisionService.get_decision(db, decision_id)
-        if not db_decision:
-            return None
-        
-        # Update only provided fields
-        update_data = decision.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_decision, field, value)
-        
-        # Save to database
-        db.add(db_decision)
-        db.commit()
-        db.refresh(db_decision)
-        return db_decision
-    
-    
-    @staticmethod
-    def delete_decision(db: Session, decision_id: int) -> bool:
-        """
-        Soft delete a decision (mark as inactive).
-        Does not remove from database, just marks is_active=False.
-        
-        Args:
-            db: Database session
-            decision_id: The decision's ID
-            
-        Returns:
-            True if deleted, False if not found
-        """
-        db_decision = DecisionService.get_decision(db, decision_id)
-        if not db_decision:
-            return False
-        
-        # Soft delete - mark as inactive
-        db_decision.is_active = False
-        db.add(db_decision)
-        db.commit()
-        return True
+# Rows per multi-row INSERT (stays well under driver bind-parameter limits)
+EDGE_INSERT_CHUNK = 1000
 
 
-class EventService:
+class EdgeService:
     """
-    Business logic for Event operations.
-    Handles all CRUD operations on events.
+    Business logic for explicit graph edges (CAUSES / PREDECESSOR / SUCCESSOR).
+    Built for bulk imports: one ownership query and a few multi-row inserts per request.
     """
     
     @staticmethod
-    def create_event(db: Session, event: schemas.EventCreate) -> models.Event:
+    async def owned_endpoints(db: AsyncSession, edges: list[schemas.EdgeCreate], user_id: int) -> dict:
         """
-        Create a new event in the database.
-        Auto-syncs to Neo4j graph for temporal reasoning.
+        Look up every endpoint of the edges with one set-based query.
         
         Args:
             db: Database session
-            event: Event data from schema
+            edges: Requested edges
+            user_id: Owner both endpoints must belong to
             
         Returns:
-            Created Event object
-        """
-        db_event = models.Event(
-            decision_id=event.decision_id,
-            event_type=event.event_type,
-            source=event.source,
-            description=event.description
+            {(entity, id): decision_id} for the endpoints the user owns
+            (an event maps to its decision, a decision to itself)
+        """
+        ids = {"event": set(), "decision": set()}
+        for edge in edges:
+            entity = models.GRAPH_EDGE_KINDS[edge.kind]
+            ids[entity].update((edge.source_id, edge.target_id))
+        
+        owned = union_all(
+            select(literal_column("'event'").label("entity"), models.Event.id, models.Event.decision_id).filter(
+                models.Event.id.in_(ids["event"]),
+                models.Event.user_id == user_id
+            ),
+            select(literal_column("'decision'").label("entity"), models.Decision.id, models.Decision.id).filter(
+                models.Decision.id.in_(ids["decision"]),
+                models.Decision.user_id == user_id,
+                models.Decision.is_active == True
+            )
         )
-        db.add(db_event)
-        db.commit()
-        db.refresh(db_event)
-        
-        # NEW: Sync to Neo4j graph automatically
-        GraphService.sync_event_to_graph(db, db_event.id)
-        
-        return db_event
-
-
-    
+        rows = (await db.execute(owned)).all()
+        return {(entity, node_id): decision_id for entity, node_id, decision_id in rows}
     
     @staticmethod
-    def get_events(
-        db: Session, 
-        skip: int = 0, 
-        limit: int = 10
-    ) -> list[models.Event]:
+    async def create_edges(db: AsyncSession, edges: list[schemas.EdgeCreate], user_id: int) -> tuple[int, int]:
         """
-        Retrieve all events with pagination.
+        Create many edges in one transaction and queue them for Neo4j sync.
+        Edges that already exist (or repeat within the request) are skipped.
         
         Args:
             db: Database session
-            skip: Number of records to skip (for pagination)
-            limit: Maximum records to return
+            edges: Requested edges
+            user_id: Owner of every endpoint
             
         Returns:
-            List of Event objects
-        """
-        return db.query(models.Event).offset(skip).limit(limit).all()
-    
-    
-    @staticmethod
-    def get_recent_events(
-        db: Session, 
-        limit: int = 10
-    ) -> list[models.Event]:
-        """
-        Retrieve the most recent events.
-        Ordered by created_at descending.
-        
-        Args:
-            db: Database session
-            limit: Maximum records to return
+            (created, existing) counts
             
-        Returns:
-            List of Event objects ordered by newest first
-        """
-        return db.query(models.Event).order_by(
-            models.Event.created_at.desc()
-        ).limit(limit).all()
+        Raises:
+            ValueError if any endpoint does not exist or is not owned by the user
+        """
+        keys = list(dict.fromkeys((e.kind, e.source_id, e.target_id) for e in edges))
+        owned = await EdgeService.owned_endpoints(db, edges, user_id)
+        
+        missing = sorted({
+            (models.GRAPH_EDGE_KINDS[kind], node_id)
+            for kind, source_id, target_id in keys
+            for node_id in (source_id, target_id)
+            if (models.GRAPH_EDGE_KINDS[kind], node_id) not in owned
+        })
+        if missing:
+            listed = ", ".join(f"{entity} {node_id}" for entity, node_id in missing[:20])
+            raise ValueError(f"Not found or not yours: {listed}")
+        
+        table = models.GraphEdge.__table__
+        insert_fn = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+        now = datetime.utcnow()
+        created = []
+        for start in range(0, len(keys), EDGE_INSERT_CHUNK):
+            stmt = insert_fn(table).values([
+                {"user_id": user_id, "kind": kind, "source_id": source_id, "target_id": target_id, "created_at": now}
+                for kind, source_id, target_id in keys[start:start + EDGE_INSERT_CHUNK]
+            ]).on_conflict_do_nothing(
+                index_elements=["kind", "source_id", "target_id"]
+            ).returning(table.c.id, table.c.user_id, table.c.kind, table.c.source_id, table.c.target_id, table.c.created_at)
+            created.extend((await db.execute(stmt)).all())
+        
+        for edge in created:
+            entity = models.GRAPH_EDGE_KINDS[edge.kind]
+            GraphOutboxService.enqueue_edge(db, edge, owned[(entity, edge.source_id)])
+        await db.commit()
+        
+        for edge in created:
+            graph_projection.add_edge(*edge_endpoints(edge.id, edge.kind, edge.source_id, edge.target_id))
+        return len(created), len(keys) - len(created)
     
     @staticmethod
-    def get_events_by_decision(
-        db: Session, 
-        decision_id: int,
-        skip: int = 0, 
-        limit: int = 50
-    ) -> list[models.Event]:
-        """
-        Retrieve all events for a specific decision.
-        Ordered by created_at (oldest to newest).
-        
-        Args:
-            db: Database session
-            decision_id: The decision's ID
-            skip: Number of records to skip (for pagination)
-            limit: Maximum records to return
-            
-        Returns:
-            List of Event objects for this decision
-        """
-        return db.query(models.Event).filter(
-            models.Event.decision_id == decision_id
-        ).order_by(models.Event.created_at).offset(skip).limit(limit).all()
-
+    async def delete_event_edges(db: AsyncSession, event_id: int):
+        """Delete the CAUSES edges of an event being deleted (the graph closes them via the outbox)"""
+        edge = models.GraphEdge
+        await db.execute(delete(edge).filter(
+            edge.kind == "CAUSES",
+            or_(edge.source_id == event_id, edge.target_id == event_id)
+        ))
@@ -0,0 +1,324 @@
+import os
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from dotenv import load_dotenv
+
+from . import models
+from .database import AsyncSessionLocal
+from .llm_service import LLMService, get_llm_service, LLM_MODEL, PROMPT_VERSIONS
+
+load_dotenv()
+
+ROLLING_SUMMARY_ENABLED = os.getenv("ROLLING_SUMMARY_ENABLED", "true").lower() == "true"
+# Wait after an event write before refreshing, so a burst of events is folded in one call
+ROLLING_SUMMARY_DELAY_SECONDS = float(os.getenv("ROLLING_SUMMARY_DELAY_SECONDS", "2"))
+# Most events sent in one prompt; bigger backlogs are summarized chunk by chunk
+ROLLING_SUMMARY_CHUNK_EVENTS = int(os.getenv("ROLLING_SUMMARY_CHUNK_EVENTS", "50"))
+# Most summaries merged in one prompt when combining chunk summaries
+ROLLING_SUMMARY_FANOUT = int(os.getenv("ROLLING_SUMMARY_FANOUT", "8"))
+# Model calls in flight per refresh
+ROLLING_SUMMARY_CONCURRENCY = int(os.getenv("ROLLING_SUMMARY_CONCURRENCY", "4"))
+
+NO_EVENTS_SUMMARY = "No events recorded yet for this decision."
+
+
+def timeline_event(event: models.Event) -> dict:
+    """Event row → the timeline entry the LLM prompts and cache fingerprints use"""
+    return {
+        "event_id": event.id,
+        "event_type": event.event_type,
+        "description": event.description,
+        "source": event.source,
+        "timestamp": event.created_at
+    }
+
+
+class RollingSummaryService:
+    """
+    Per-decision summaries that are folded forward instead of recomputed.
+
+    The stored summary (decision_summaries) covers events up to
+    last_event_id. A refresh sends the model only the newer events plus the
+    previous summary, so its cost follows the number of new events rather
+    than the length of the history. Backlogs larger than
+    ROLLING_SUMMARY_CHUNK_EVENTS (a first summary of a long timeline) are
+    summarized per chunk, and the chunk summaries are merged in groups of
+    ROLLING_SUMMARY_FANOUT until one remains.
+
+    Events come from Postgres, so a refresh right after create_event sees the
+    event without waiting for the graph sync.
+    """
+
+    @staticmethod
+    async def load(db, decision_id: int) -> tuple:
+        """
+        Decision title, stored summary row and events not yet folded into it.
+
+        A row written with another model or prompt version is not used (its
+        events are all returned again) but is still returned, so the rewrite
+        can replace it. The same goes for a row missing events below its
+        last_event_id: ids are assigned before commit, so an event can
+        become visible after the summary moved past its id. That shows up as
+        fewer covered events (event_count) than events with id <=
+        last_event_id, and the timeline is folded again from the start.
+
+        Returns:
+            (title or None, row or None, usable previous summary or None, [event dicts])
+        """
+        title = (await db.execute(
+            select(models.Decision.title).filter(models.Decision.id == decision_id)
+        )).scalar()
+        if title is None:
+            return None, None, None, []
+
+        row = await db.get(models.DecisionSummary, decision_id)
+        usable = (
+            row is not None
+            and row.model == LLM_MODEL
+            and row.prompt_version == PROMPT_VERSIONS["rolling_summary"]
+        )
+        if usable:
+            covered = (await db.execute(
+                select(func.count(models.Event.id)).filter(
+                    models.Event.decision_id == decision_id,
+                    models.Event.id <= row.last_event_id
+                )
+            )).scalar()
+            usable = covered == row.event_count
+        watermark = row.last_event_id if usable else 0
+
+        events = (await db.execute(
+            select(models.Event).filter(
+                models.Event.decision_id == decision_id,
+                models.Event.id > watermark
+            ).order_by(models.Event.id)
+        )).scalars().all()
+
+        return title, row, row.summary if usable else None, [timeline_event(e) for e in events]
+
+    @staticmethod
+    async def fold(llm: LLMService, title: str, previous: Optional[str], events: list) -> str:
+        """Fold events into the previous summary, chunking big backlogs"""
+        if len(events) <= ROLLING_SUMMARY_CHUNK_EVENTS:
+            return await llm.fold_summary(title, previous, events)
+
+        semaphore = asyncio.Semaphore(ROLLING_SUMMARY_CONCURRENCY)
+
+        async def bounded(call):
+            async with semaphore:
+                return await call
+
+        chunks = [
+            events[start:start + ROLLING_SUMMARY_CHUNK_EVENTS]
+            for start in range(0, len(events), ROLLING_SUMMARY_CHUNK_EVENTS)
+        ]
+        summaries = await asyncio.gather(*[bounded(llm.fold_summary(title, None, chunk)) for chunk in chunks])
+
+        # Merge level by level; the previous summary joins the final merge
+        while len(summaries) > ROLLING_SUMMARY_FANOUT:
+            groups = [
+                summaries[start:start + ROLLING_SUMMARY_FANOUT]
+                for start in range(0, len(summaries), ROLLING_SUMMARY_FANOUT)
+            ]
+            summaries = await asyncio.gather(*[
+                bounded(llm.combine_summaries(title, None, group)) for group in groups
+            ])
+        return await llm.combine_summaries(title, previous, list(summaries))
+
+    @staticmethod
+    async def store(decision_id: int, row: Optional[models.DecisionSummary], summary: str,
+                    events: list, previous_count: int) -> bool:
+        """
+        Save the folded summary unless another refresh got there first
+        (compare-and-set on the row's last_event_id).
+
+        Returns:
+            True if stored
+        """
+        values = {
+            "summary": summary,
+            "last_event_id": events[-1]["event_id"],
+            "event_count": previous_count + len(events),
+            "model": LLM_MODEL,
+            "prompt_version": PROMPT_VERSIONS["rolling_summary"],
+            "updated_at": datetime.utcnow()
+        }
+        table = models.DecisionSummary.__table__
+        async with AsyncSessionLocal() as db:
+            if row is None:
+                insert_fn = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+                statement = insert_fn(table).values(decision_id=decision_id, **values).on_conflict_do_nothing()
+            else:
+                statement = update(table).where(
+                    table.c.decision_id == decision_id,
+                    table.c.last_event_id == row.last_event_id
+                ).values(**values)
+            result = await db.execute(statement)
+            await db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def refresh(decision_id: int, llm: Optional[LLMService] = None) -> Optional[str]:
+        """
+        Bring a decision's summary up to date with its events.
+
+        Returns:
+            The current summary, or None if the decision has no events (or no longer exists)
+        """
+        llm = llm or get_llm_service()
+        async with AsyncSessionLocal() as db:
+            title, row, previous, events = await RollingSummaryService.load(db, decision_id)
+
+        if not events:
+            return previous
+        summary = await RollingSummaryService.fold(llm, title, previous, events)
+        await RollingSummaryService.store(
+            decision_id, row, summary, events, row.event_count if previous is not None else 0
+        )
+        return summary
+
+    @staticmethod
+    async def stream_refresh(decision_id: int, llm: Optional[LLMService] = None) -> AsyncIterator[str]:
+        """
+        refresh() that yields the summary text as it is produced. A short
+        backlog is folded with a streamed completion; an up-to-date summary or
+        a chunked backlog is yielded whole. Errors are raised.
+        """
+        llm = llm or get_llm_service()
+        async with AsyncSessionLocal() as db:
+            title, row, previous, events = await RollingSummaryService.load(db, decision_id)
+
+        if not events:
+            yield previous or NO_EVENTS_SUMMARY
+            return
+
+        if len(events) > ROLLING_SUMMARY_CHUNK_EVENTS:
+            summary = await RollingSummaryService.fold(llm, title, previous, events)
+            yield summary
+        else:
+            parts = []
+            async for token in llm.stream_fold_summary(title, previous, events):
+                parts.append(token)
+                yield token
+            summary = "".join(parts).strip()
+
+        await RollingSummaryService.store(
+            decision_id, row, summary, events, row.event_count if previous is not None else 0
+        )
+
+    @staticmethod
+    async def reset(db, decision_id: int):
+        """Drop a decision's summary; call in the transaction that deletes one of its events"""
+        await db.execute(delete(models.DecisionSummary).filter(models.DecisionSummary.decision_id == decision_id))
+
+
+class RollingSummaryJob:
+    """
+    Background refreshes after event writes: at most one task per decision,
+    and events arriving while it runs trigger one more pass.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self._dirty = set()
+        self._refreshing = {}
+        self.stats = {"refreshes": 0, "errors": 0, "shared": 0}
+
+    def schedule(self, decision_id: int):
+        """Refresh the decision's summary soon (call after the event write commits)"""
+        if not ROLLING_SUMMARY_ENABLED:
+            return
+        if decision_id in self._tasks:
+            self._dirty.add(decision_id)
+            return
+        self._tasks[decision_id] = asyncio.create_task(self._run(decision_id))
+
+    def is_refreshing(self, decision_id: int) -> bool:
+        return decision_id in self._refreshing
+
+    async def refresh(self, decision_id: int) -> Optional[str]:
+        """
+        RollingSummaryService.refresh, joining the decision's refresh already
+        in flight (scheduled or requested) instead of starting a second one.
+        """
+        pending = self._refreshing.get(decision_id)
+        if pending is not None:
+            self.stats["shared"] += 1
+            return await asyncio.shield(pending)
+
+        async def run():
+            try:
+                return await RollingSummaryService.refresh(decision_id)
+            finally:
+                self._refreshing.pop(decision_id, None)
+
+        # A task, so one caller disconnecting doesn't cancel the others' result
+        task = asyncio.ensure_future(run())
+        self._refreshing[decision_id] = task
+        return await asyncio.shield(task)
+
+    async def stream_refresh(self, decision_id: int) -> AsyncIterator[str]:
+        """
+        RollingSummaryService.stream_refresh, registered like refresh() so
+        callers arriving meanwhile join it. Joining a refresh already in
+        flight yields its summary whole. Errors are raised.
+        """
+        pending = self._refreshing.get(decision_id)
+        if pending is not None:
+            self.stats["shared"] += 1
+            yield await asyncio.shield(pending) or NO_EVENTS_SUMMARY
+            return
+
+        tokens = asyncio.Queue()
+
+        async def run():
+            try:
+                parts = []
+                async for token in RollingSummaryService.stream_refresh(decision_id):
+                    parts.append(token)
+                    tokens.put_nowait(token)
+                return "".join(parts).strip()
+            finally:
+                self._refreshing.pop(decision_id, None)
+                tokens.put_nowait(None)
+
+        # A task, so the streaming client disconnecting doesn't cancel the others' result
+        task = asyncio.ensure_future(run())
+        self._refreshing[decision_id] = task
+        while (token := await tokens.get()) is not None:
+            yield token
+        await asyncio.shield(task)
+
+    async def _run(self, decision_id: int):
+        try:
+            while True:
+                await asyncio.sleep(ROLLING_SUMMARY_DELAY_SECONDS)
+                self._dirty.discard(decision_id)
+                try:
+                    await self.refresh(decision_id)
+                    self.stats["refreshes"] += 1
+                except Exception as e:
+                    print(f"Error refreshing summary of decision {decision_id}: {e}")
+                    self.stats["errors"] += 1
+                    break
+                if decision_id not in self._dirty:
+                    break
+        finally:
+            self._tasks.pop(decision_id, None)
+            self._dirty.discard(decision_id)
+
+    async def stop(self):
+        tasks = list(self._tasks.values()) + list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "pending": len(self._tasks)}
+
+
+# Global rolling summary job instance
+rolling_summary_job = RollingSummaryJob()
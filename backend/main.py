@@ -1,21 +1,40 @@
-from fastapi import FastAPI, Depends, HTTPException, Header
+from fastapi import FastAPI, Depends, HTTPException, Header, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from dotenv import load_dotenv
-from sqlalchemy import text
+from sqlalchemy import select, func, text
 from datetime import datetime
+from typing import Optional
 from core.schemas import DecisionCreate, DecisionUpdate, EventCreate
 import os
+import json
+import asyncio
 
-from core.database import engine, Base, get_db
+from core.database import engine, Base, get_async_db
 from core.init_db import init_db  # ✨ NEW
 from core.auth import (
-    UserRegister, UserLogin, Token, UserResponse,
-    hash_password, verify_password, create_access_token,
+    UserRegister, UserLogin, Token, UserResponse, Principal,
+    hash_password_async, verify_password_async, PasswordHasherBusy,
+    BCRYPT_RETRY_AFTER_SECONDS, create_access_token,
     decode_access_token, extract_token_from_header
 )
 from core.models import User
+from core.principal_cache import principal_cache
+from core.analytics_cache import analytics_cache
+from core.llm_cache import llm_insight_cache
+from core.llm_service import close_llm_service
+from core.summary_service import RollingSummaryService, rolling_summary_job, NO_EVENTS_SUMMARY
+from core.redis_client import close_redis
 from core import models, schemas, service
+from core.rollup_service import RollupService
+from core.graph_sync import GraphOutboxService, graph_sync_worker, graph_change_pruner, GRAPH_SYNC_ENABLED, epoch_ms
+from core.neo4j_db import close_neo4j, get_neo4j_driver, close_async_neo4j, get_async_neo4j_driver
+from core.graph_schema import ensure_graph_schema
+from core.graph_queries import GRAPH_MAX_DEPTH, GRAPH_MAX_RESULTS
+from core.graph_projection import graph_projection, graph_projection_manager, GRAPH_PROJECTION_ENABLED, DECISION
+from core.pagination import paginate, split_page, paginate_by_score, split_score_page, encode_cursor, decode_cursor
+from core.centrality_service import centrality_job, CENTRALITY_ENABLED
 
 load_dotenv()
 
@@ -39,8 +58,46 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Held so the task isn't garbage-collected before it finishes
+graph_schema_task: Optional[asyncio.Task] = None
+
+async def bootstrap_graph_schema():
+    """Constraints/indexes back every MERGE/MATCH on id; Neo4j being down must not block startup"""
+    try:
+        await asyncio.to_thread(ensure_graph_schema)
+    except Exception as e:
+        print(f"❌ Could not check graph schema: {e}")
+
+@app.on_event("startup")
+async def startup():
+    global graph_schema_task
+    graph_schema_task = asyncio.create_task(bootstrap_graph_schema())
+    graph_change_pruner.start()
+    if GRAPH_SYNC_ENABLED:
+        graph_sync_worker.start()
+    if GRAPH_PROJECTION_ENABLED:
+        graph_projection_manager.start()
+        if CENTRALITY_ENABLED:
+            centrality_job.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    if graph_schema_task is not None and not graph_schema_task.done():
+        graph_schema_task.cancel()
+        await asyncio.gather(graph_schema_task, return_exceptions=True)
+    await graph_sync_worker.stop()
+    await graph_change_pruner.stop()
+    await centrality_job.stop()
+    await rolling_summary_job.stop()
+    await graph_projection_manager.stop()
+    await close_async_neo4j()
+    close_neo4j()
+    await close_redis()
+    await close_llm_service()
+
 @app.get("/")
 async def root():
     return {
@@ -50,9 +107,9 @@ async def root():
     }
 
 @app.get("/health")
-async def health(db: Session = Depends(get_db)):
+async def health(db: AsyncSession = Depends(get_async_db)):
     try:
-        result = db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         db_status = "healthy"
     except Exception as e:
         print(f"Health check failed: {e}")
@@ -66,7 +123,7 @@ async def health(db: Session = Depends(get_db)):
 
 # ==================== DEPENDENCY: GET CURRENT USER ====================
 
-def get_current_user_from_token(authorization: str = Header(None), db: Session = Depends(get_db)) -> User:
+async def get_current_user_from_token(authorization: str = Header(None), db: AsyncSession = Depends(get_async_db)) -> Principal:
     """Dependency function to extract current user from JWT token"""
     token = extract_token_from_header(authorization)
     if not token:
@@ -76,13 +133,25 @@ def get_current_user_from_token(authorization: str = Header(None), db: Session =
     if not token_data:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    principal = await principal_cache.get(token_data.user_id)
+    if principal:
+        return principal
+    
+    # Scalar columns only: authentication never touches the user's decisions
+    user = (await db.execute(
+        select(
+            User.id, User.email, User.username,
+            User.role, User.status, User.is_active
+        ).filter(User.id == token_data.user_id)
+    )).mappings().first()
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     
-    return user
+    principal = Principal(**user)
+    await principal_cache.set(principal)
+    return principal
 
-def check_is_admin(current_user: User = Depends(get_current_user_from_token)) -> User:
+def check_is_admin(current_user: Principal = Depends(get_current_user_from_token)) -> Principal:
     """Dependency to check if user is admin"""
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
@@ -90,18 +159,33 @@ def check_is_admin(current_user: User = Depends(get_current_user_from_token)) ->
 
 # ==================== AUTHENTICATION ENDPOINTS ====================
 
+def password_pool_busy() -> HTTPException:
+    """503 returned when the bcrypt pool sheds a request"""
+    return HTTPException(
+        status_code=503,
+        detail="Authentication service is busy. Please retry shortly.",
+        headers={"Retry-After": str(BCRYPT_RETRY_AFTER_SECONDS)}
+    )
+
 @app.post("/api/auth/signup", response_model=Token)
-def signup(user_data: UserRegister, db: Session = Depends(get_db)):
+async def signup(user_data: UserRegister, db: AsyncSession = Depends(get_async_db)):
     """User signup endpoint - creates new account"""
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = (await db.execute(
+        select(User.id).filter(User.email == user_data.email)
+    )).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
+    existing_user = (await db.execute(
+        select(User.id).filter(User.username == user_data.username)
+    )).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Username already taken")
     
-    password_hash = hash_password(user_data.password)
+    try:
+        password_hash = await hash_password_async(user_data.password)
+    except PasswordHasherBusy:
+        raise password_pool_busy()
     
     new_user = User(
         email=user_data.email,
@@ -111,20 +195,26 @@ def signup(user_data: UserRegister, db: Session = Depends(get_db)):
         status="pending"  # ✨ NEW: Requires admin approval
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
     
     # Return pending status info
     return {"access_token": "pending_approval", "token_type": "pending"}
 
 @app.post("/api/auth/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """User login endpoint"""
-    user = db.query(User).filter(User.email == user_data.email).first()
+    user = (await db.execute(
+        select(User).filter(User.email == user_data.email)
+    )).scalars().first()
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    if not verify_password(user_data.password, user.password_hash):
+    try:
+        password_ok = await verify_password_async(user_data.password, user.password_hash)
+    except PasswordHasherBusy:
+        raise password_pool_busy()
+    
+    if not password_ok:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # ✨ NEW: Check approval status
@@ -144,9 +234,9 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.get("/api/auth/me", response_model=UserResponse)
-def get_current_user(
+async def get_current_user(
     authorization: str = Header(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user information from token"""
     token = extract_token_from_header(authorization)
@@ -157,19 +247,35 @@ def get_current_user(
     if not token_data:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = await db.get(User, token_data.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     return user
 
+# ==================== PAGINATION ====================
+
+def cursor_page(query, model, cursor: Optional[str], limit: int, by_score: bool = False):
+    """Keyset-paginate a query, turning a malformed cursor into a 400"""
+    try:
+        if by_score:
+            return paginate_by_score(query, model, cursor, limit)
+        return paginate(query, model, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    """List endpoints return bare arrays, so the next cursor travels in a header"""
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
 # ==================== PROTECTED DECISION ENDPOINTS ====================
 
 @app.post("/api/decisions", response_model=schemas.DecisionResponse)
 async def create_decision(
     decision: schemas.DecisionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Create a new decision (requires authentication)"""
     new_decision = models.Decision(
@@ -177,21 +283,26 @@ async def create_decision(
         user_id=current_user.id
     )
     db.add(new_decision)
-    db.commit()
-    db.refresh(new_decision)
+    await db.flush()
+    await RollupService.record_decision(db, current_user.id, new_decision.created_at)
+    GraphOutboxService.enqueue_decision(db, new_decision)
+    await db.commit()
+    await db.refresh(new_decision)
+    await analytics_cache.invalidate_user(current_user.id)
+    graph_projection.add_decision(new_decision.id, current_user.id, new_decision.is_active)
     return new_decision
 
 @app.get("/api/decisions/{decision_id}", response_model=schemas.DecisionResponse)
 async def get_decision(
     decision_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Get a decision by ID (must own it)"""
-    decision = db.query(models.Decision).filter(
+    decision = (await db.execute(select(models.Decision).filter(
         models.Decision.id == decision_id,
         models.Decision.user_id == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not decision:
         raise HTTPException(status_code=404, detail="Decision not found")
@@ -199,31 +310,37 @@ async def get_decision(
 
 @app.get("/api/decisions", response_model=list[schemas.DecisionResponse])
 async def list_decisions(
-    skip: int = 0,
-    limit: int = 10,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    sort: str = Query("created", pattern="^(created|importance)$"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
-    """List all decisions for current user"""
-    decisions = db.query(models.Decision).filter(
+    """List decisions for current user, oldest or most important first (next page cursor in X-Next-Cursor)"""
+    by_score = sort == "importance"
+    query = select(models.Decision).filter(
         models.Decision.user_id == current_user.id,
         models.Decision.is_active == True
-    ).offset(skip).limit(limit).all()
+    )
+    rows = (await db.execute(cursor_page(query, models.Decision, cursor, limit, by_score))).scalars().all()
     
+    decisions, next_cursor = split_score_page(rows, limit) if by_score else split_page(rows, limit)
+    set_next_cursor(response, next_cursor)
     return decisions
 
 @app.put("/api/decisions/{decision_id}", response_model=schemas.DecisionResponse)
 async def update_decision(
     decision_id: int,
     decision: schemas.DecisionUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Update a decision (must own it)"""
-    db_decision = db.query(models.Decision).filter(
+    db_decision = (await db.execute(select(models.Decision).filter(
         models.Decision.id == decision_id,
         models.Decision.user_id == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not db_decision:
         raise HTTPException(status_code=404, detail="Decision not found")
@@ -231,27 +348,33 @@ async def update_decision(
     for key, value in decision.dict(exclude_unset=True).items():
         setattr(db_decision, key, value)
     
-    db.commit()
-    db.refresh(db_decision)
+    GraphOutboxService.enqueue_decision(db, db_decision)
+    await db.commit()
+    await db.refresh(db_decision)
+    await analytics_cache.invalidate_user(current_user.id)
+    graph_projection.add_decision(db_decision.id, current_user.id, db_decision.is_active)
     return db_decision
 
 @app.delete("/api/decisions/{decision_id}")
 async def delete_decision(
     decision_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Delete a decision (must own it)"""
-    db_decision = db.query(models.Decision).filter(
+    db_decision = (await db.execute(select(models.Decision).filter(
         models.Decision.id == decision_id,
         models.Decision.user_id == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not db_decision:
         raise HTTPException(status_code=404, detail="Decision not found")
     
     db_decision.is_active = False
-    db.commit()
+    GraphOutboxService.enqueue_decision(db, db_decision)
+    await db.commit()
+    await analytics_cache.invalidate_user(current_user.id)
+    graph_projection.add_decision(db_decision.id, current_user.id, False)
     return {"message": "Decision deleted successfully"}
 
 # ==================== PROTECTED EVENT ENDPOINTS ====================
@@ -259,87 +382,105 @@ async def delete_decision(
 @app.post("/api/events", response_model=schemas.EventResponse)
 async def create_event(
     event: schemas.EventCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Create a new event (decision must be yours)"""
-    decision = db.query(models.Decision).filter(
+    decision = (await db.execute(select(models.Decision).filter(
         models.Decision.id == event.decision_id,
         models.Decision.user_id == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not decision:
         raise HTTPException(status_code=404, detail="Decision not found or not owned by you")
     
-    new_event = models.Event(**event.dict())
+    new_event = models.Event(**event.dict(), user_id=current_user.id)
     db.add(new_event)
-    db.commit()
-    db.refresh(new_event)
+    await db.flush()
+    await RollupService.record_event(db, current_user.id, new_event.event_type, new_event.created_at)
+    GraphOutboxService.enqueue_event(db, new_event)
+    await llm_insight_cache.invalidate_decision(db, new_event.decision_id)
+    await db.commit()
+    await db.refresh(new_event)
+    await analytics_cache.invalidate_user(current_user.id)
+    graph_projection.add_event(new_event.id, new_event.decision_id, current_user.id)
+    rolling_summary_job.schedule(new_event.decision_id)
     return new_event
 
 @app.get("/api/events", response_model=list[schemas.EventResponse])
 async def list_events(
-    skip: int = 0,
-    limit: int = 10,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
-    """List events for current user's decisions"""
-    user_decision_ids = db.query(models.Decision.id).filter(
-        models.Decision.user_id == current_user.id
-    ).all()
-    decision_ids = [d[0] for d in user_decision_ids]
-    
-    events = db.query(models.Event).filter(
-        models.Event.decision_id.in_(decision_ids)
-    ).offset(skip).limit(limit).all()
+    """List events for current user's decisions, oldest first (next page cursor in X-Next-Cursor)"""
+    query = select(models.Event).filter(
+        models.Event.user_id == current_user.id
+    )
+    rows = (await db.execute(cursor_page(query, models.Event, cursor, limit))).scalars().all()
     
+    events, next_cursor = split_page(rows, limit)
+    set_next_cursor(response, next_cursor)
     return events
 
 @app.get("/api/decisions/{decision_id}/events", response_model=list[schemas.EventResponse])
 async def get_decision_events(
     decision_id: int,
-    skip: int = 0,
-    limit: int = 50,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
-    """Get all events for a decision (must own it)"""
-    decision = db.query(models.Decision).filter(
+    """Get events for a decision, oldest first (must own it; next page cursor in X-Next-Cursor)"""
+    decision = (await db.execute(select(models.Decision).filter(
         models.Decision.id == decision_id,
         models.Decision.user_id == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not decision:
         raise HTTPException(status_code=404, detail="Decision not found")
     
-    events = db.query(models.Event).filter(
+    query = select(models.Event).filter(
         models.Event.decision_id == decision_id
-    ).offset(skip).limit(limit).all()
+    )
+    rows = (await db.execute(cursor_page(query, models.Event, cursor, limit))).scalars().all()
     
+    events, next_cursor = split_page(rows, limit)
+    set_next_cursor(response, next_cursor)
     return events
 
 @app.delete("/api/events/{event_id}")
 async def delete_event(
     event_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Delete an event (decision must be yours)"""
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
+    event = await db.get(models.Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    decision = db.query(models.Decision).filter(
+    decision = (await db.execute(select(models.Decision).filter(
         models.Decision.id == event.decision_id,
         models.Decision.user_id == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not decision:
         raise HTTPException(status_code=403, detail="Not authorized to delete this event")
     
-    db.delete(event)
-    db.commit()
+    await db.delete(event)
+    await service.EdgeService.delete_event_edges(db, event_id)
+    await RollupService.record_event(db, current_user.id, event.event_type, event.created_at, delta=-1)
+    GraphOutboxService.enqueue_event_delete(db, event)
+    await llm_insight_cache.invalidate_decision(db, event.decision_id)
+    await RollingSummaryService.reset(db, event.decision_id)
+    await db.commit()
+    await analytics_cache.invalidate_user(current_user.id)
+    graph_projection.remove_event(event_id)
+    rolling_summary_job.schedule(event.decision_id)
     return {"message": "Event deleted successfully"}
 
 # ==================== GRAPH ENDPOINTS ====================
@@ -347,21 +488,31 @@ async def delete_event(
 @app.get("/api/graph/timeline/{decision_id}")
 async def get_decision_timeline(
     decision_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    cursor: Optional[str] = None,
+    limit: int = Query(200, ge=1, le=1000),
+    as_of: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
-    """Get temporal timeline for a decision"""
+    """Get temporal timeline for a decision, one page at a time (as_of: the graph at a past instant)"""
     
-    decision = db.query(models.Decision).filter(
+    decision = (await db.execute(select(models.Decision).filter(
         models.Decision.id == decision_id,
         models.Decision.user_id == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not decision:
         raise HTTPException(status_code=404, detail="Decision not found")
-    events = db.query(models.Event).filter(
+    
+    if as_of is not None:
+        # Deleted events only survive in the graph, as closed valid-time intervals
+        return await get_timeline_as_of(decision, current_user.id, as_of, cursor, limit)
+    
+    query = select(models.Event).filter(
         models.Event.decision_id == decision_id
-    ).all()
+    )
+    rows = (await db.execute(cursor_page(query, models.Event, cursor, limit))).scalars().all()
+    events, next_cursor = split_page(rows, limit)
     
     print(f"📊 Timeline query: decision_id={decision_id}, found {len(events)} events")
     
@@ -378,81 +529,401 @@ async def get_decision_timeline(
             }
             for e in events
         ],
-        "event_count": len(events)
+        "event_count": len(events),
+        "next_cursor": next_cursor
+    }
+
+async def get_timeline_as_of(decision: models.Decision, user_id: int, as_of: datetime,
+                             cursor: Optional[str], limit: int) -> dict:
+    """Timeline page from Neo4j's valid-time intervals (same cursor format as the Postgres path)"""
+    from core.graph_queries import GraphQueries
+    
+    after = None
+    if cursor:
+        try:
+            after_at, after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = (epoch_ms(after_at), after_id)
+    
+    rows = await run_graph_query(GraphQueries.get_decision_timeline(
+        decision.id, user_id, as_of=epoch_ms(as_of), after=after, limit=limit + 1
+    ))
+    events, next_cursor = rows[:limit], None
+    if len(rows) > limit:
+        last = events[-1]
+        next_cursor = encode_cursor(datetime.utcfromtimestamp(last["valid_from"] / 1000), last["event_id"])
+    
+    return {
+        "decision_id": decision.id,
+        "decision_title": decision.title,
+        "as_of": as_of.isoformat(),
+        "timeline": [
+            {
+                "event_id": e["event_id"],
+                "event_type": e["event_type"],
+                "description": e["description"],
+                "source": e["source"],
+                "timestamp": datetime.utcfromtimestamp(e["valid_from"] / 1000).isoformat(),
+                "deleted_at": datetime.utcfromtimestamp(e["valid_to"] / 1000).isoformat() if e["valid_to"] else None
+            }
+            for e in events
+        ],
+        "event_count": len(events),
+        "next_cursor": next_cursor
     }
 
+@app.post("/api/graph/edges", response_model=schemas.EdgeBulkResponse)
+async def create_edges(
+    payload: schemas.EdgeBulkCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
+):
+    """Create many CAUSES (event → event) / PREDECESSOR / SUCCESSOR (decision → decision) edges at once (all ends must be yours)"""
+    try:
+        created, existing = await service.EdgeService.create_edges(db, payload.edges, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"created": created, "existing": existing}
+
 @app.get("/api/graph/stats")
 async def get_graph_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Get statistics about the knowledge graph"""
-    user_decisions = db.query(models.Decision).filter(
-        models.Decision.user_id == current_user.id
-    ).count()
-    
-    user_decision_ids = db.query(models.Decision.id).filter(
-        models.Decision.user_id == current_user.id
-    ).all()
-    decision_ids = [d[0] for d in user_decision_ids]
+    async def compute_stats():
+        user_decisions = (await db.execute(select(func.count(models.Decision.id)).filter(
+            models.Decision.user_id == current_user.id
+        ))).scalar()
+        
+        user_events = (await db.execute(select(func.count(models.Event.id)).filter(
+            models.Event.user_id == current_user.id
+        ))).scalar()
+        
+        return {
+            "status": "healthy",
+            "decisions_in_graph": user_decisions,
+            "events_in_graph": user_events,
+            "relationships": user_events * 2  
+        }
     
-    user_events = 0
-    if decision_ids:
-        user_events = db.query(models.Event).filter(
-            models.Event.decision_id.in_(decision_ids)
-        ).count()
+    return await analytics_cache.get_or_compute(current_user.id, "graph-stats", compute_stats)
+
+async def run_graph_query(query):
+    """Await a GraphQueries coroutine, mapping Neo4j timeouts/outages to HTTP errors"""
+    from neo4j.exceptions import Neo4jError, ServiceUnavailable
     
-    return {
-        "status": "healthy",
-        "decisions_in_graph": user_decisions,
-        "events_in_graph": user_events,
-        "relationships": user_events * 2  
-    }
+    try:
+        return await query
+    except ServiceUnavailable:
+        raise HTTPException(status_code=503, detail="Graph database unavailable")
+    except Neo4jError as e:
+        if "TransactionTimedOut" in (e.code or ""):
+            raise HTTPException(status_code=504, detail="Graph query timed out")
+        raise
 
 @app.get("/api/graph/related-decisions/{decision_id}")
 async def get_related_decisions(
     decision_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    max_hops: int = Query(3, ge=1, le=GRAPH_MAX_DEPTH),
+    limit: int = Query(10, ge=1, le=GRAPH_MAX_RESULTS),
+    as_of: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
-    """Get decisions related through the graph"""
-    decision = db.query(models.Decision).filter(
+    """Get decisions related through the graph (in-memory projection; Neo4j while it loads, for decisions it has not seen yet, or for as_of)"""
+    from core.graph_queries import GraphQueries
+    
+    decision = (await db.execute(select(models.Decision).filter(
         models.Decision.id == decision_id,
         models.Decision.user_id == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not decision:
         raise HTTPException(status_code=404, detail="Decision not found")
     
+    related = None
+    if graph_projection.ready and as_of is None:
+        # None: not in this worker's projection yet (e.g. created on another worker since the last refresh)
+        related = graph_projection.related_decisions(decision_id, max_hops=max_hops, limit=limit)
+    
+    if related is not None:
+        rows = (await db.execute(select(
+            models.Decision.id, models.Decision.title, models.Decision.description
+        ).filter(models.Decision.id.in_([r["decision_id"] for r in related])))).all()
+        details = {r.id: r for r in rows}
+        related = [
+            {
+                **r,
+                "title": details[r["decision_id"]].title,
+                "description": details[r["decision_id"]].description
+            }
+            for r in related if r["decision_id"] in details
+        ]
+    else:
+        related = await run_graph_query(GraphQueries.get_related_decisions(
+            decision_id, current_user.id, depth=max_hops, limit=limit,
+            as_of=epoch_ms(as_of) if as_of else None
+        ))
+    
     return {
         "decision_id": decision_id,
-        "related_decisions": [],
-        "count": 0
+        "related_decisions": related,
+        "count": len(related)
     }
 
-# ==================== LLM ANALYSIS ENDPOINTS ====================
+@app.get("/api/graph/path/{from_decision_id}/{to_decision_id}")
+async def get_decision_path(
+    from_decision_id: int,
+    to_decision_id: int,
+    max_hops: int = Query(6, ge=1, le=GRAPH_MAX_DEPTH * 2),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
+):
+    """Get the shortest path between two of your decisions (in-memory projection; Neo4j while it loads or for decisions it has not seen yet)"""
+    from core.graph_queries import GraphQueries
+    
+    decision_ids = {from_decision_id, to_decision_id}
+    if graph_projection.ready and decision_ids <= graph_projection.index[DECISION].keys():
+        if not all(graph_projection.owns_decision(d, current_user.id) for d in decision_ids):
+            raise HTTPException(status_code=404, detail="Decision not found")
+        path = graph_projection.shortest_path(from_decision_id, to_decision_id, max_hops=max_hops)
+    else:
+        owned = (await db.execute(select(func.count(models.Decision.id)).filter(
+            models.Decision.id.in_(decision_ids),
+            models.Decision.user_id == current_user.id
+        ))).scalar()
+        await db.commit()
+        if owned != len(decision_ids):
+            raise HTTPException(status_code=404, detail="Decision not found")
+        path = await run_graph_query(GraphQueries.get_shortest_path(
+            from_decision_id, to_decision_id, current_user.id, max_hops=max_hops
+        ))
+    
+    return {
+        "from_decision_id": from_decision_id,
+        "to_decision_id": to_decision_id,
+        "path": path or [],
+        "hops": len(path) - 1 if path else None
+    }
 
-@app.get("/api/llm/summarize/{decision_id}")
-async def summarize_decision(
+@app.get("/api/graph/causality/{event_id}")
+async def get_event_causality(
+    event_id: int,
+    depth: int = Query(3, ge=1, le=GRAPH_MAX_DEPTH),
+    limit: int = Query(20, ge=1, le=GRAPH_MAX_RESULTS),
+    as_of: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_user_from_token)
+):
+    """Get causes and effects of an event (CAUSES edges, must own it; as_of: at a past instant)"""
+    from core.graph_queries import GraphQueries
+    
+    chain = await run_graph_query(GraphQueries.get_event_causality_chain(
+        event_id, current_user.id, depth=depth, limit=limit,
+        as_of=epoch_ms(as_of) if as_of else None
+    ))
+    if not chain:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return chain
+
+@app.get("/api/graph/impact/{decision_id}")
+async def get_decision_impact(
     decision_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    depth: int = Query(3, ge=1, le=GRAPH_MAX_DEPTH),
+    as_of: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_user_from_token)
+):
+    """Get event count, downstream events and linked decisions (must own it; as_of: at a past instant)"""
+    from core.graph_queries import GraphQueries
+    
+    impact = await run_graph_query(GraphQueries.get_decision_impact(
+        decision_id, current_user.id, depth=depth,
+        as_of=epoch_ms(as_of) if as_of else None
+    ))
+    if not impact:
+        raise HTTPException(status_code=404, detail="Decision not found")
+    return impact
+
+@app.get("/api/graph/search")
+async def search_decisions(
+    query: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=GRAPH_MAX_RESULTS),
+    sort: str = Query("id", pattern="^(id|importance)$"),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
-    """Generate AI summary of decision timeline"""
-    from core.llm_service import LLMService
-    from core.graph_service import GraphService
+    """Search your decisions by title or description"""
+    from core.graph_queries import GraphQueries
     
-    decision = db.query(models.Decision).filter(
+    results = await run_graph_query(GraphQueries.search_decisions_by_pattern(
+        query, current_user.id, limit=limit, by_importance=sort == "importance"
+    ))
+    return {
+        "query": query,
+        "sort": sort,
+        "results": results,
+        "count": len(results)
+    }
+
+# ==================== LLM ANALYSIS ENDPOINTS ====================
+
+async def load_decision(db: AsyncSession, decision_id: int, user_id: int) -> models.Decision:
+    """The user's decision (404 if not yours), releasing the connection before model calls"""
+    decision = (await db.execute(select(models.Decision).filter(
         models.Decision.id == decision_id,
-        models.Decision.user_id == current_user.id
-    ).first()
+        models.Decision.user_id == user_id
+    ))).scalars().first()
     
     if not decision:
         raise HTTPException(status_code=404, detail="Decision not found")
     
-    events = GraphService.get_decision_timeline(decision_id)
-    llm = LLMService()
-    summary = llm.summarize_decision_timeline(decision.title, events)
+    # Hand the connection back to the pool before the (slow) model call
+    await db.commit()
+    return decision
+
+async def load_decision_timeline(db: AsyncSession, decision_id: int, user_id: int) -> tuple:
+    """
+    The user's decision and its events, oldest first (404 if not yours).
+    Read from Postgres: the graph may lag behind or be unreachable, and a
+    short timeline would be cached as the decision's insights.
+    """
+    from core.summary_service import timeline_event
+    
+    decision = await load_decision(db, decision_id, user_id)
+    events = (await db.execute(select(models.Event).filter(
+        models.Event.decision_id == decision_id
+    ).order_by(models.Event.created_at, models.Event.id))).scalars().all()
+    await db.commit()
+    return decision, [timeline_event(e) for e in events]
+
+async def cached_llm_call(decision: models.Decision, events: list, method: str, call):
+    """Serve an LLMService coroutine from the insight cache while model, prompt and timeline are unchanged"""
+    from core.llm_service import LLM_MODEL, PROMPT_VERSIONS
+    
+    cache_key = llm_insight_cache.fingerprint(method, LLM_MODEL, PROMPT_VERSIONS[method], decision.title, events)
+    return await llm_insight_cache.get_or_compute(decision.id, method, cache_key, call)
+
+async def load_decision_insights(db: AsyncSession, decision_id: int, user_id: int) -> tuple:
+    """The decision and its combined insights: one timeline fetch, one cached completion"""
+    from core.llm_service import get_llm_service
+    
+    decision, events = await load_decision_timeline(db, decision_id, user_id)
+    llm = get_llm_service()
+    insights = await cached_llm_call(decision, events, "insights",
+                                     lambda: llm.generate_insights(decision.title, events))
+    return decision, insights
+
+@app.get("/api/llm/insights/{decision_id}")
+async def get_decision_insights(
+    decision_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
+):
+    """Summary, risks/opportunities, next steps and quality score in one model call"""
+    decision, insights = await load_decision_insights(db, decision_id, current_user.id)
+    
+    return {
+        "decision_id": decision_id,
+        "decision_title": decision.title,
+        **insights
+    }
+
+def sse_event(event: str, data) -> str:
+    """One server-sent event; data is JSON so tokens with newlines stay on one line"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def stream_llm_call(decision: models.Decision, events: list, method: str, stream, finish):
+    """
+    SSE response for a streaming LLMService method. A cached result is sent
+    at once as "done"; otherwise each model delta is sent as a "token" event
+    and the finished result (finish(full_text)) is cached and sent as "done".
+    Failures end the stream with an "error" event and are not cached.
+    """
+    from core.llm_service import LLM_MODEL, PROMPT_VERSIONS
+    
+    cache_key = llm_insight_cache.fingerprint(method, LLM_MODEL, PROMPT_VERSIONS[method], decision.title, events)
+    cached = await llm_insight_cache.get(decision.id, method, cache_key)
+    
+    async def body():
+        if cached is not None:
+            yield sse_event("done", cached)
+            return
+        
+        parts = []
+        try:
+            async for token in stream():
+                parts.append(token)
+                yield sse_event("token", token)
+        except Exception as e:
+            yield sse_event("error", str(e))
+            return
+        
+        result = finish("".join(parts))
+        if llm_insight_cache.is_error(result):
+            yield sse_event("error", result["error"])
+            return
+        await llm_insight_cache.put(decision.id, method, cache_key, result)
+        yield sse_event("done", result)
+    
+    return StreamingResponse(body(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # let tokens through nginx unbuffered
+    })
+
+@app.get("/api/llm/insights/{decision_id}/stream")
+async def stream_decision_insights(
+    decision_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
+):
+    """Combined insights as server-sent events: JSON tokens, then the parsed result"""
+    from core.llm_service import get_llm_service
+    
+    decision, events = await load_decision_timeline(db, decision_id, current_user.id)
+    llm = get_llm_service()
+    return await stream_llm_call(decision, events, "insights",
+                                 lambda: llm.stream_insights(decision.title, events),
+                                 llm.parse_insights)
+
+@app.get("/api/llm/summarize/{decision_id}/stream")
+async def stream_decision_summary(
+    decision_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
+):
+    """Rolling decision summary as server-sent events, token by token"""
+    decision = await load_decision(db, decision_id, current_user.id)
+    
+    async def body():
+        parts = []
+        try:
+            # Joins a refresh in flight (and lets later ones join this) rather than folding the same events twice
+            async for token in rolling_summary_job.stream_refresh(decision.id):
+                parts.append(token)
+                yield sse_event("token", token)
+        except Exception as e:
+            yield sse_event("error", str(e))
+            return
+        yield sse_event("done", "".join(parts).strip())
+    
+    return StreamingResponse(body(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+@app.get("/api/llm/summarize/{decision_id}")
+async def summarize_decision(
+    decision_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
+):
+    """Rolling AI summary of the decision timeline (folds in only events added since the last one)"""
+    decision = await load_decision(db, decision_id, current_user.id)
+    
+    try:
+        summary = await rolling_summary_job.refresh(decision.id) or NO_EVENTS_SUMMARY
+    except Exception as e:
+        summary = f"Error generating summary: {str(e)}"
     
     return {
         "decision_id": decision_id,
@@ -460,27 +931,21 @@ async def summarize_decision(
         "summary": summary
     }
 
+# The single-purpose endpoints below are views of the combined insights
+
 @app.get("/api/llm/analyze-risks/{decision_id}")
 async def analyze_decision_risks(
     decision_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Identify risks and opportunities in decision"""
-    from core.llm_service import LLMService
-    from core.graph_service import GraphService
-    
-    decision = db.query(models.Decision).filter(
-        models.Decision.id == decision_id,
-        models.Decision.user_id == current_user.id
-    ).first()
+    decision, insights = await load_decision_insights(db, decision_id, current_user.id)
     
-    if not decision:
-        raise HTTPException(status_code=404, detail="Decision not found")
-    
-    events = GraphService.get_decision_timeline(decision_id)
-    llm = LLMService()
-    analysis = llm.analyze_decision_risks(decision.title, events)
+    if "error" in insights:
+        analysis = {"risks": [], "opportunities": [], "error": insights["error"]}
+    else:
+        analysis = insights["analysis"]
     
     return {
         "decision_id": decision_id,
@@ -491,24 +956,16 @@ async def analyze_decision_risks(
 @app.get("/api/llm/next-steps/{decision_id}")
 async def generate_next_steps(
     decision_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Generate recommended next steps"""
-    from core.llm_service import LLMService
-    from core.graph_service import GraphService
-    
-    decision = db.query(models.Decision).filter(
-        models.Decision.id == decision_id,
-        models.Decision.user_id == current_user.id
-    ).first()
-    
-    if not decision:
-        raise HTTPException(status_code=404, detail="Decision not found")
+    decision, insights = await load_decision_insights(db, decision_id, current_user.id)
     
-    events = GraphService.get_decision_timeline(decision_id)
-    llm = LLMService()
-    steps = llm.generate_next_steps(decision.title, events)
+    if "error" in insights:
+        steps = [f"Error generating steps: {insights['error']}"]
+    else:
+        steps = insights["next_steps"]
     
     return {
         "decision_id": decision_id,
@@ -518,24 +975,16 @@ async def generate_next_steps(
 @app.get("/api/llm/quality-score/{decision_id}")
 async def evaluate_decision_quality(
     decision_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Score decision-making quality"""
-    from core.llm_service import LLMService
-    from core.graph_service import GraphService
+    decision, insights = await load_decision_insights(db, decision_id, current_user.id)
     
-    decision = db.query(models.Decision).filter(
-        models.Decision.id == decision_id,
-        models.Decision.user_id == current_user.id
-    ).first()
-    
-    if not decision:
-        raise HTTPException(status_code=404, detail="Decision not found")
-    
-    events = GraphService.get_decision_timeline(decision_id)
-    llm = LLMService()
-    evaluation = llm.evaluate_decision_quality(decision.title, events)
+    if "error" in insights:
+        evaluation = {"score": 0, "error": insights["error"]}
+    else:
+        evaluation = insights["evaluation"]
     
     return {
         "decision_id": decision_id,
@@ -547,127 +996,122 @@ async def evaluate_decision_quality(
 @app.get("/api/analytics/decision/{decision_id}")
 async def get_decision_metrics(
     decision_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Get metrics for a specific decision"""
     from core.analytics_service import AnalyticsService
     
-    decision = db.query(models.Decision).filter(
+    decision = (await db.execute(select(models.Decision).filter(
         models.Decision.id == decision_id,
         models.Decision.user_id == current_user.id
-    ).first()
+    ))).scalars().first()
     
     if not decision:
         raise HTTPException(status_code=404, detail="Decision not found")
     
-    metrics = AnalyticsService.get_decision_metrics(db, decision_id)
+    metrics = await AnalyticsService.get_decision_metrics(db, decision_id)
     return metrics
 
 @app.get("/api/analytics/overview")
 async def get_all_metrics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Get analytics overview for current user"""
-    decisions = db.query(models.Decision).filter(
-        models.Decision.user_id == current_user.id,
-        models.Decision.is_active == True
-    ).all()
-    
-    total_decisions = len(decisions)
-    total_events = sum(len(d.events) for d in decisions)
-    avg_events = total_events / total_decisions if total_decisions > 0 else 0
+    from core.analytics_service import AnalyticsService
     
-    return {
-        "total_decisions": total_decisions,
-        "total_events": total_events,
-        "avg_events_per_decision": avg_events,
-        "decisions": [
-            {
-                "id": d.id,
-                "title": d.title,
-                "event_count": len(d.events),
-                "created_at": d.created_at
-            }
-            for d in decisions
-        ]
-    }
+    return await analytics_cache.get_or_compute(
+        current_user.id,
+        "overview",
+        lambda: AnalyticsService.get_all_decisions_metrics(db, user_id=current_user.id)
+    )
 
 @app.get("/api/analytics/event-types")
 async def get_event_distribution(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    days: Optional[int] = Query(None, ge=1, le=3650),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
-    """Get event type distribution for current user"""
-    user_decision_ids = db.query(models.Decision.id).filter(
-        models.Decision.user_id == current_user.id
-    ).all()
-    decision_ids = [d[0] for d in user_decision_ids]
-    
-    events = db.query(models.Event).filter(
-        models.Event.decision_id.in_(decision_ids) if decision_ids else False
-    ).all()
+    """Get event type distribution for current user (all time, or the last N days)"""
+    from core.analytics_service import AnalyticsService
     
-    distribution = {}
-    for event in events:
-        distribution[event.event_type] = distribution.get(event.event_type, 0) + 1
+    distribution = await analytics_cache.get_or_compute(
+        current_user.id,
+        "event-types",
+        lambda: AnalyticsService.get_event_type_distribution(db, user_id=current_user.id, days=days),
+        params={"days": days}
+    )
     
     return {
-        "event_type_distribution": distribution,
-        "total_events": len(events)
+        **distribution,
+        # Legacy keys kept for existing API clients
+        "event_type_distribution": {t["type"]: t["count"] for t in distribution["event_types"]},
+        "total_events": distribution["total"]
     }
 
 @app.get("/api/analytics/timeline")
 async def get_timeline_stats(
-    days: int = 30,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    days: int = Query(30, ge=1, le=3650),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
-    """Get decision creation timeline for current user"""
-    decisions = db.query(models.Decision).filter(
-        models.Decision.user_id == current_user.id
-    ).all()
+    """Get decision creation timeline for current user over the last N days"""
+    from core.analytics_service import AnalyticsService
     
-    timeline = {}
-    for decision in decisions:
-        date = decision.created_at.date()
-        timeline[str(date)] = timeline.get(str(date), 0) + 1
+    stats = await analytics_cache.get_or_compute(
+        current_user.id,
+        "timeline",
+        lambda: AnalyticsService.get_decision_timeline_stats(db, days=days, user_id=current_user.id),
+        params={"days": days}
+    )
+    timeline = {t["date"]: t["decisions_created"] for t in stats["timeline"]}
     
     return {
         "timeline": timeline,
-        "total_decisions": len(decisions),
+        "total_decisions": sum(timeline.values()),
         "days": days
     }
 
 @app.get("/api/analytics/status-summary")
 async def get_status_summary(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_token)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
 ):
     """Get decision status summary for current user"""
-    decisions = db.query(models.Decision).filter(
-        models.Decision.user_id == current_user.id
-    ).all()
+    from core.analytics_service import AnalyticsService
     
-    active = sum(1 for d in decisions if d.is_active)
-    inactive = len(decisions) - active
+    return await analytics_cache.get_or_compute(
+        current_user.id,
+        "status-summary",
+        lambda: AnalyticsService.get_decision_status_summary(db, user_id=current_user.id)
+    )
+
+@app.get("/api/dashboard")
+async def get_dashboard(
+    days: int = Query(30, ge=1, le=3650),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_from_token)
+):
+    """Get the full analytics dashboard payload for current user in one request"""
+    from core.analytics_service import AnalyticsService
     
-    return {
-        "active_decisions": active,
-        "inactive_decisions": inactive,
-        "total_decisions": len(decisions)
-    }
+    return await analytics_cache.get_or_compute(
+        current_user.id,
+        "dashboard",
+        lambda: AnalyticsService.get_dashboard(db, user_id=current_user.id, days=days),
+        params={"days": days}
+    )
 
 # ==================== ADMIN ENDPOINTS ====================
 
 @app.get("/api/admin/pending-users")
-def get_pending_users(
-    db: Session = Depends(get_db),
-    admin: User = Depends(check_is_admin)
+async def get_pending_users(
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(check_is_admin)
 ):
     """Get all pending user approvals"""
-    pending = db.query(User).filter(User.status == "pending").all()
+    pending = (await db.execute(select(User).filter(User.status == "pending"))).scalars().all()
     return [
         {
             "id": u.id,
@@ -679,13 +1123,13 @@ def get_pending_users(
     ]
 
 @app.post("/api/admin/approve-user/{user_id}")
-def approve_user(
+async def approve_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    admin: User = Depends(check_is_admin)
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(check_is_admin)
 ):
     """Approve a pending user"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -695,7 +1139,8 @@ def approve_user(
     user.status = "approved"
     user.approved_at = datetime.utcnow()
     user.approved_by_id = admin.id
-    db.commit()
+    await db.commit()
+    await principal_cache.invalidate(user.id)
     
     return {
         "message": f"User {user.email} approved",
@@ -704,13 +1149,13 @@ def approve_user(
     }
 
 @app.post("/api/admin/reject-user/{user_id}")
-def reject_user(
+async def reject_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    admin: User = Depends(check_is_admin)
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(check_is_admin)
 ):
     """Reject a pending user"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -718,7 +1163,8 @@ def reject_user(
         raise HTTPException(status_code=400, detail="User is not pending approval")
     
     user.status = "rejected"
-    db.commit()
+    await db.commit()
+    await principal_cache.invalidate(user.id)
     
     return {
         "message": f"User {user.email} rejected",
@@ -727,12 +1173,12 @@ def reject_user(
     }
 
 @app.get("/api/admin/all-users")
-def get_all_users(
-    db: Session = Depends(get_db),
-    admin: User = Depends(check_is_admin)
+async def get_all_users(
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(check_is_admin)
 ):
     """Get all users with their status"""
-    users = db.query(User).all()
+    users = (await db.execute(select(User))).scalars().all()
     return [
         {
             "id": u.id,
@@ -746,6 +1192,44 @@ def get_all_users(
         for u in users
     ]
 
+@app.get("/api/admin/cache-stats")
+async def get_cache_stats(
+    admin: Principal = Depends(check_is_admin)
+):
+    """Get cache hit/miss counters for this worker"""
+    return {
+        "analytics": analytics_cache.get_stats(),
+        "llm_insights": llm_insight_cache.get_stats(),
+        "rolling_summaries": rolling_summary_job.get_stats()
+    }
+
+@app.get("/api/admin/graph-sync-stats")
+async def get_graph_sync_stats(
+    admin: Principal = Depends(check_is_admin)
+):
+    """Get graph outbox backlog, lag and worker counters"""
+    return await graph_sync_worker.get_stats()
+
+@app.post("/api/admin/graph-sync/requeue")
+async def requeue_graph_sync(
+    decision_id: Optional[int] = None,
+    admin: Principal = Depends(check_is_admin)
+):
+    """Retry dead-lettered graph outbox rows (all, or one decision's)"""
+    return {"requeued": await graph_sync_worker.requeue_failed(decision_id)}
+
+@app.get("/api/admin/graph-driver-stats")
+async def get_graph_driver_stats(
+    admin: Principal = Depends(check_is_admin)
+):
+    """Get Neo4j query latency, retry and pool-wait stats for this worker"""
+    return {
+        "async": get_async_neo4j_driver().stats.snapshot(),
+        "sync": get_neo4j_driver().stats.snapshot(),
+        "projection": graph_projection.get_stats(),
+        "centrality": centrality_job.last_run
+    }
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,180 @@
+"""
+Rebuild the Neo4j graph from PostgreSQL.
+
+Streams decisions, then events, then edges, in id order through server-side
+cursors and writes them to Neo4j in large UNWIND batches on a pool of worker
+threads. Progress is checkpointed (last fully written id per table) so an
+interrupted run resumes where it stopped. Writes are idempotent MERGEs, so it
+is safe to run while the API (and its graph sync worker) is live: rows are
+read before they are written, so a decision soft-deleted in between arrives
+with a stale open payload. Resync writes keep a decision closed when the
+graph closed it after the row's updated_at; otherwise the Postgres state
+wins, so a reopen the graph missed is repaired.
+
+Usage:
+    python resync_graph.py                  # resume from checkpoint
+    python resync_graph.py --reset --wipe   # full rebuild from scratch
+"""
+import os
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import select
+
+from core.database import engine
+from core.models import Decision, Event, GraphEdge
+from core.neo4j_db import get_neo4j_driver, close_neo4j
+from core.graph_sync import GraphOutboxService
+from core.graph_schema import ensure_graph_schema
+
+
+TABLES = {
+    "decisions": (
+        Decision,
+        [Decision.id, Decision.user_id, Decision.title, Decision.description,
+         Decision.is_active, Decision.created_at, Decision.updated_at],
+        GraphOutboxService.stored_decision_payload
+    ),
+    "events": (
+        Event,
+        [Event.id, Event.decision_id, Event.user_id, Event.event_type,
+         Event.description, Event.source, Event.created_at],
+        GraphOutboxService.event_payload
+    ),
+    "edges": (
+        GraphEdge,
+        [GraphEdge.id, GraphEdge.user_id, GraphEdge.kind, GraphEdge.source_id,
+         GraphEdge.target_id, GraphEdge.created_at],
+        GraphOutboxService.edge_payload
+    ),
+}
+
+
+def load_checkpoint(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def wipe_graph(chunk_size: int = 10000):
+    """Delete every Decision/Event node in chunks"""
+    neo4j = get_neo4j_driver()
+    deleted = 0
+    while True:
+        result = neo4j.execute_write("""
+        MATCH (n) WHERE n:Decision OR n:Event
+        WITH n LIMIT $limit
+        DETACH DELETE n
+        RETURN count(*) AS deleted
+        """, {"limit": chunk_size})
+        count = result[0]["deleted"] if result else 0
+        deleted += count
+        if count < chunk_size:
+            break
+    print(f"✓ Wiped {deleted} nodes")
+
+
+def write_batch(table: str, payloads: list):
+    neo4j = get_neo4j_driver()
+    if table == "decisions":
+        neo4j.sync_batch(payloads, [], [], keep_closed=True)
+    elif table == "events":
+        neo4j.sync_batch([], payloads, [])
+    else:
+        neo4j.sync_batch([], [], [], payloads)
+
+
+def resync_table(table: str, checkpoint: dict, args) -> int:
+    """
+    Stream one table into Neo4j starting after its checkpointed id.
+
+    Returns:
+        Number of rows written
+    """
+    model, columns, to_payload = TABLES[table]
+    last_id = checkpoint.get(table, 0)
+    query = select(*columns).filter(model.id > last_id).order_by(model.id)
+
+    written = 0
+    started = time.perf_counter()
+    last_report = started
+    in_flight = deque()
+
+    def finish_oldest():
+        # Complete batches in submission order so the checkpoint never skips a gap
+        nonlocal written
+        future, batch_last_id, batch_size = in_flight.popleft()
+        future.result()
+        written += batch_size
+        checkpoint[table] = batch_last_id
+        save_checkpoint(args.checkpoint_file, checkpoint)
+
+    print(f"📊 Resyncing {table} after id {last_id}...")
+    with engine.connect() as conn, ThreadPoolExecutor(max_workers=args.workers) as pool:
+        result = conn.execution_options(stream_results=True, yield_per=args.batch_size).execute(query)
+        for rows in result.partitions():
+            payloads = [to_payload(row) for row in rows]
+            in_flight.append((pool.submit(write_batch, table, payloads), rows[-1].id, len(rows)))
+
+            # Bound memory: at most two batches queued per worker
+            while len(in_flight) >= args.workers * 2:
+                finish_oldest()
+
+            now = time.perf_counter()
+            if now - last_report >= args.report_every:
+                print(f"  {table}: {written} rows, {written / (now - started):.0f} rows/s, checkpoint id {checkpoint.get(table, last_id)}")
+                last_report = now
+
+        while in_flight:
+            finish_oldest()
+
+    elapsed = time.perf_counter() - started
+    rate = written / elapsed if elapsed else 0
+    print(f"✓ {table}: {written} rows in {elapsed:.1f}s ({rate:.0f} rows/s)")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per UNWIND batch")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel Neo4j writers")
+    parser.add_argument("--checkpoint-file", default=".graph_resync_checkpoint.json")
+    parser.add_argument("--reset", action="store_true", help="Ignore and overwrite the checkpoint")
+    parser.add_argument("--wipe", action="store_true", help="Delete graph nodes first (requires --reset)")
+    parser.add_argument("--only", choices=list(TABLES), help="Resync a single table")
+    parser.add_argument("--report-every", type=float, default=5.0, help="Seconds between progress lines")
+    args = parser.parse_args()
+
+    if args.wipe and not args.reset:
+        parser.error("--wipe only makes sense with --reset")
+
+    checkpoint = {} if args.reset else load_checkpoint(args.checkpoint_file)
+    if args.wipe:
+        wipe_graph()
+    # MERGE on id is a label scan per row without the unique constraints
+    ensure_graph_schema(create=True)
+
+    started = time.perf_counter()
+    total = 0
+    try:
+        for table in ([args.only] if args.only else list(TABLES)):
+            total += resync_table(table, checkpoint, args)
+    finally:
+        close_neo4j()
+
+    elapsed = time.perf_counter() - started
+    print(f"✨ Graph resync done: {total} rows in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
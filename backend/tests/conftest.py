@@ -0,0 +1,84 @@
+import os
+import sys
+import tempfile
+
+# Configure before the app is imported: a throwaway SQLite database and no
+# Redis, Neo4j sync, projection or background LLM work
+_tmpdir = tempfile.mkdtemp(prefix="contextweave-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["REDIS_URL"] = ""
+# Neo4j tests run only against TEST_NEO4J_URI; otherwise point at a closed port
+os.environ["NEO4J_URI"] = os.getenv("TEST_NEO4J_URI", "bolt://127.0.0.1:1")
+os.environ["NEO4J_MAX_RETRY_TIME_SECONDS"] = "0"
+os.environ["NEO4J_CONNECTION_TIMEOUT_SECONDS"] = "1"
+os.environ["GRAPH_SYNC_ENABLED"] = "false"
+os.environ["GRAPH_PROJECTION_ENABLED"] = "false"
+os.environ["ROLLING_SUMMARY_ENABLED"] = "false"
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import main
+from core.auth import create_access_token
+from core.database import SessionLocal, async_engine
+from core.models import User
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def user():
+    """An approved user, created directly (no bcrypt round trip)"""
+    db = SessionLocal()
+    try:
+        count = db.query(User).count()
+        user = User(
+            email=f"user{count}@example.com",
+            username=f"user{count}",
+            password_hash="x",
+            role="user",
+            status="approved"
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def auth_headers(user):
+    return {"Authorization": f"Bearer {create_access_token(user.id, user.email)}"}
+
+
+class QueryCounter:
+    """SQL statements issued on the async engine while active"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def count(self, table: str = None) -> int:
+        if table is None:
+            return len(self.statements)
+        return sum(1 for s in self.statements if f"FROM {table}" in s)
+
+
+@pytest.fixture
+def count_queries():
+    counter = QueryCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
@@ -0,0 +1,33 @@
+def test_status_summary_totals(client, auth_headers):
+    ids = [
+        client.post("/api/decisions", json={"title": f"Status {i}"}, headers=auth_headers).json()["id"]
+        for i in range(3)
+    ]
+    client.post("/api/events", json={"decision_id": ids[0], "event_type": "approved"}, headers=auth_headers)
+    client.delete(f"/api/decisions/{ids[2]}", headers=auth_headers)
+
+    summary = client.get("/api/analytics/status-summary", headers=auth_headers).json()
+    assert summary["total_decisions"] == 3
+    assert summary["active_decisions"] == 2
+    assert summary["inactive_decisions"] == 1
+    assert summary["statuses"] == {"approved": 1, "pending": 1}
+
+
+def test_overview_order_and_average(client, auth_headers):
+    ids = [
+        client.post("/api/decisions", json={"title": f"Overview {i}"}, headers=auth_headers).json()["id"]
+        for i in range(3)
+    ]
+    for _ in range(2):
+        client.post("/api/events", json={"decision_id": ids[2], "event_type": "note"}, headers=auth_headers)
+
+    overview = client.get("/api/analytics/overview", headers=auth_headers).json()
+    assert [d["id"] for d in overview["decisions"]] == ids
+    assert overview["avg_events_per_decision"] == 2 / 3
+
+
+def test_day_windows_are_bounded(client, auth_headers):
+    for path in ("/api/analytics/timeline", "/api/analytics/event-types", "/api/dashboard"):
+        assert client.get(f"{path}?days=1000000", headers=auth_headers).status_code == 422
+        assert client.get(f"{path}?days=0", headers=auth_headers).status_code == 422
+        assert client.get(f"{path}?days=3650", headers=auth_headers).status_code == 200
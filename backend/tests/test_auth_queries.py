@@ -0,0 +1,31 @@
+from core.principal_cache import principal_cache
+
+
+def get_decisions(client, headers, count_queries):
+    count_queries.statements.clear()
+    response = client.get("/api/decisions", headers=headers)
+    assert response.status_code == 200
+    return count_queries
+
+
+def test_principal_loaded_once_then_cached(client, user, auth_headers, count_queries):
+    client.post("/api/decisions", json={"title": "Query count"}, headers=auth_headers)
+    principal_cache._entries.clear()
+
+    cold = get_decisions(client, auth_headers, count_queries)
+    assert cold.count("users") == 1
+    assert cold.count() == 2  # principal + one page of decisions
+
+    warm = get_decisions(client, auth_headers, count_queries)
+    assert warm.count("users") == 0
+    assert warm.count() == 1  # just the page of decisions
+
+
+def test_query_count_independent_of_decision_count(client, user, auth_headers, count_queries):
+    client.get("/api/decisions", headers=auth_headers)  # warm the principal cache
+    before = get_decisions(client, auth_headers, count_queries).count()
+
+    for i in range(5):
+        client.post("/api/decisions", json={"title": f"Decision {i}"}, headers=auth_headers)
+
+    assert get_decisions(client, auth_headers, count_queries).count() == before
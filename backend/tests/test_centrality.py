@@ -0,0 +1,60 @@
+import numpy as np
+
+from core.centrality_service import CentralityService
+from core.graph_projection import GraphProjection, DECISION, EVENT, edge_endpoints
+
+
+def reference_reach(src, dst, kind, alive, decision, max_hops):
+    """Plain BFS, one decision at a time"""
+    successors = {}
+    for a, b in zip(src.tolist(), dst.tolist()):
+        if alive[b]:
+            successors.setdefault(a, set()).add(b)
+    first = successors.get(decision, set()) - {decision}
+    own_events = {n for n in first if kind[n] == EVENT}
+    seen = first | {decision}
+    frontier = first
+    for _ in range(max_hops):
+        frontier = {m for n in frontier for m in successors.get(n, ())} - seen
+        seen |= frontier
+    return len(seen) - 1 - len(own_events)
+
+
+def test_downstream_reach_matches_bfs():
+    rng = np.random.default_rng(7)
+    decisions_count, events_count = 60, 300
+    size = decisions_count + events_count
+    kind = np.array([DECISION] * decisions_count + [EVENT] * events_count, dtype=np.int8)
+    alive = rng.random(size) > 0.1
+
+    # HAS_EVENT edges, then random CAUSES (event → event) and SUCCESSOR (decision → decision) links
+    owner = rng.integers(0, decisions_count, events_count)
+    src = [owner, rng.integers(decisions_count, size, 400), rng.integers(0, decisions_count, 80)]
+    dst = [np.arange(decisions_count, size), rng.integers(decisions_count, size, 400), rng.integers(0, decisions_count, 80)]
+    src = np.concatenate(src).astype(np.int64)
+    dst = np.concatenate(dst).astype(np.int64)
+
+    decisions = np.nonzero((kind == DECISION) & alive)[0]
+    reach = CentralityService.downstream_reach(size, src, dst, kind, alive, decisions, 3)
+    assert reach.tolist() == [reference_reach(src, dst, kind, alive, d, 3) for d in decisions.tolist()]
+
+
+def test_downstream_reach_follows_predecessor_backwards():
+    """(a)-[:PREDECESSOR]->(b) makes b the earlier decision: b reaches a, not the other way round"""
+    projection = GraphProjection()
+    projection.load(
+        decisions=[(1, 1, True), (2, 1, True), (3, 1, True)],
+        events=[(10, 2, 1), (11, 2, 1), (12, 2, 1), (13, 3, 1)],
+        edges=[
+            edge_endpoints(1, "PREDECESSOR", 1, 2),
+            edge_endpoints(2, "SUCCESSOR", 1, 3)
+        ]
+    )
+    snapshot = projection.snapshot()
+    src, dst, kind, alive = snapshot["edge_src"], snapshot["edge_dst"], snapshot["kind"], snapshot["alive"]
+
+    decisions = np.asarray([projection.index[DECISION][d] for d in (1, 2, 3)])
+    reach = CentralityService.downstream_reach(snapshot["size"], src, dst, kind, alive, decisions, 3)
+    assert reach.tolist() == [reference_reach(src, dst, kind, alive, d, 3) for d in decisions.tolist()]
+    # 1 reaches 3 and its event but none of 2's; 2 reaches 1, 3 and 3's event
+    assert reach.tolist() == [2, 3, 0]
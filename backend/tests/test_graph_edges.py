@@ -0,0 +1,59 @@
+from core.auth import create_access_token
+from core.database import SessionLocal
+from core.models import GraphEdge, User
+
+
+def count_edges(user_id):
+    db = SessionLocal()
+    try:
+        return db.query(GraphEdge).filter(GraphEdge.user_id == user_id).count()
+    finally:
+        db.close()
+
+
+def other_user_headers():
+    db = SessionLocal()
+    try:
+        count = db.query(User).count()
+        other = User(email=f"other{count}@example.com", username=f"other{count}", password_hash="x", role="user", status="approved")
+        db.add(other)
+        db.commit()
+        return {"Authorization": f"Bearer {create_access_token(other.id, other.email)}"}
+    finally:
+        db.close()
+
+
+def test_bulk_edges_skip_existing(client, user, auth_headers):
+    d1, d2, d3 = [
+        client.post("/api/decisions", json={"title": f"Edge {i}"}, headers=auth_headers).json()["id"]
+        for i in range(3)
+    ]
+    first = client.post("/api/graph/edges", json={"edges": [
+        {"kind": "PREDECESSOR", "source_id": d2, "target_id": d1}
+    ]}, headers=auth_headers)
+    assert first.status_code == 200
+    assert first.json() == {"created": 1, "existing": 0}
+
+    # One already stored, one repeated within the request, one new
+    second = client.post("/api/graph/edges", json={"edges": [
+        {"kind": "PREDECESSOR", "source_id": d2, "target_id": d1},
+        {"kind": "SUCCESSOR", "source_id": d2, "target_id": d3},
+        {"kind": "SUCCESSOR", "source_id": d2, "target_id": d3}
+    ]}, headers=auth_headers)
+    assert second.status_code == 200
+    assert second.json() == {"created": 1, "existing": 1}
+    assert count_edges(user.id) == 2
+
+
+def test_bulk_edges_reject_foreign_endpoint(client, user, auth_headers):
+    mine = client.post("/api/decisions", json={"title": "Mine"}, headers=auth_headers).json()["id"]
+    theirs = client.post("/api/decisions", json={"title": "Theirs"}, headers=other_user_headers()).json()["id"]
+    before = count_edges(user.id)
+
+    response = client.post("/api/graph/edges", json={"edges": [
+        {"kind": "SUCCESSOR", "source_id": mine, "target_id": mine + 1000000},
+        {"kind": "SUCCESSOR", "source_id": mine, "target_id": theirs}
+    ]}, headers=auth_headers)
+    assert response.status_code == 404
+    assert f"decision {theirs}" in response.json()["detail"]
+    assert count_edges(user.id) == before
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+
+from core.database import SessionLocal
+from core.graph_sync import GraphChangePruner, GRAPH_CHANGES_RETENTION_SECONDS
+import main
+from core.graph_projection import GraphProjection, GraphProjectionManager, DECISION, EVENT
+from core.graph_queries import GraphQueries
+from core.models import GraphChange
+
+
+def test_refresh_applies_other_workers_changes(client, auth_headers):
+    """A worker whose projection missed the writes catches up from graph_changes"""
+    manager = GraphProjectionManager(GraphProjection())
+    client.portal.call(manager.rebuild)
+
+    decision_id = client.post("/api/decisions", json={"title": "Feed"}, headers=auth_headers).json()["id"]
+    kept, dropped = [
+        client.post("/api/events", json={"decision_id": decision_id, "event_type": "note"}, headers=auth_headers).json()["id"]
+        for _ in range(2)
+    ]
+    client.delete(f"/api/events/{dropped}", headers=auth_headers)
+    client.delete(f"/api/decisions/{decision_id}", headers=auth_headers)
+
+    client.portal.call(manager.refresh)
+    projection = manager.projection
+    decision_node = projection.index[DECISION][decision_id]
+    assert not projection.alive[decision_node]
+    assert projection.alive[projection.index[EVENT][kept]]
+    assert not projection.alive[projection.index[EVENT][dropped]]
+
+
+def test_refresh_replays_changes_committed_out_of_order(client, auth_headers):
+    manager = GraphProjectionManager(GraphProjection())
+    client.portal.call(manager.rebuild)
+    # As if a change with a much higher id had already been applied
+    manager._last_change_id += 1000
+
+    db = SessionLocal()
+    try:
+        db.add(GraphChange(
+            entity="decision",
+            entity_id=999999,
+            op="upsert",
+            payload={"id": 999999, "user_id": 1, "is_active": True}
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    client.portal.call(manager.refresh)
+    assert 999999 in manager.projection.index[DECISION]
+
+
+def test_pruner_drops_only_expired_changes(client):
+    """graph_changes is pruned even with the projection disabled (as in tests)"""
+    expired = datetime.utcnow() - timedelta(seconds=GRAPH_CHANGES_RETENTION_SECONDS + 60)
+    db = SessionLocal()
+    try:
+        old = GraphChange(entity="decision", entity_id=1, op="upsert", payload={}, created_at=expired)
+        recent = GraphChange(entity="decision", entity_id=1, op="upsert", payload={})
+        db.add_all([old, recent])
+        db.commit()
+        old_id, recent_id = old.id, recent.id
+    finally:
+        db.close()
+
+    client.portal.call(GraphChangePruner.prune_once)
+    db = SessionLocal()
+    try:
+        remaining = {c.id for c in db.query(GraphChange).filter(GraphChange.id.in_([old_id, recent_id]))}
+    finally:
+        db.close()
+    assert remaining == {recent_id}
+
+
+def test_path_falls_back_for_decisions_the_projection_has_not_seen(client, auth_headers, monkeypatch):
+    """E.g. created on another worker since the last refresh"""
+    a, b = [
+        client.post("/api/decisions", json={"title": f"Path {i}"}, headers=auth_headers).json()["id"]
+        for i in range(2)
+    ]
+
+    async def from_graph(from_id, to_id, user_id, max_hops=6):
+        return [{"type": "decision", "id": from_id}, {"type": "decision", "id": to_id}]
+
+    # A loaded projection that has not seen either decision
+    projection = GraphProjection()
+    projection.ready = True
+    monkeypatch.setattr(main, "graph_projection", projection)
+    monkeypatch.setattr(GraphQueries, "get_shortest_path", staticmethod(from_graph))
+
+    response = client.get(f"/api/graph/path/{a}/{b}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["hops"] == 1
+
+    # Not yours: 404 from the Postgres ownership check
+    assert client.get(f"/api/graph/path/{a}/{b + 1000000}", headers=auth_headers).status_code == 404
+
+
+def test_related_decisions_come_from_links():
+    projection = GraphProjection()
+    projection.load(
+        decisions=[(1, 1, True), (2, 1, True), (3, 1, True)],
+        events=[(10, 1, 1), (20, 2, 1), (30, 3, 1)]
+    )
+    assert projection.related_decisions(1) == []
+
+    projection.add_edge((EVENT, 10), (EVENT, 20), edge_id=1)
+    projection.add_edge((DECISION, 2), (DECISION, 3), edge_id=2)
+    assert projection.related_decisions(1, max_hops=4) == [
+        {"decision_id": 2, "distance": 3},
+        {"decision_id": 3, "distance": 4}
+    ]
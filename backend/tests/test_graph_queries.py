@@ -0,0 +1,76 @@
+import os
+import time
+
+import pytest
+
+from core.graph_queries import GraphQueries
+from core.neo4j_db import get_neo4j_driver
+
+pytestmark = pytest.mark.skipif(not os.getenv("TEST_NEO4J_URI"), reason="needs TEST_NEO4J_URI (a disposable Neo4j)")
+
+# Ids well clear of anything the other tests create
+USER_ID = 900001
+D1, D2, D3 = 900001, 900002, 900003
+E1, E2 = 900011, 900012
+
+
+@pytest.fixture
+def linked_graph():
+    """d1 -HAS_EVENT-> e1 -CAUSES-> e2 <-HAS_EVENT- d2 -SUCCESSOR-> d3, links made 5 s ago"""
+    now = int(time.time() * 1000)
+    created = now - 10000
+    linked = now - 5000
+    neo4j = get_neo4j_driver()
+    neo4j.sync_batch(
+        decisions=[
+            {"id": d, "user_id": USER_ID, "title": f"Decision {d}", "description": None,
+             "is_active": True, "created_at": created, "valid_to": None}
+            for d in (D1, D2, D3)
+        ],
+        events=[
+            {"id": e, "decision_id": d, "user_id": USER_ID, "event_type": "note",
+             "description": None, "source": None, "created_at": created}
+            for e, d in ((E1, D1), (E2, D2))
+        ],
+        closed_events=[],
+        edges=[
+            {"id": 900021, "user_id": USER_ID, "kind": "CAUSES", "source_id": E1, "target_id": E2, "created_at": linked},
+            {"id": 900022, "user_id": USER_ID, "kind": "SUCCESSOR", "source_id": D2, "target_id": D3, "created_at": linked},
+        ]
+    )
+    yield now
+    neo4j.execute_write("MATCH (n) WHERE n.user_id = $user_id DETACH DELETE n", {"user_id": USER_ID})
+
+
+def test_related_decisions_follow_links(client, linked_graph):
+    related = client.portal.call(lambda: GraphQueries.get_related_decisions(D1, USER_ID, depth=4))
+    assert [(r["decision_id"], r["distance"]) for r in related] == [(D2, 3), (D3, 4)]
+
+
+def test_related_decisions_as_of(client, linked_graph):
+    now = linked_graph
+    related = client.portal.call(lambda: GraphQueries.get_related_decisions(D1, USER_ID, depth=4, as_of=now - 1000))
+    assert [r["decision_id"] for r in related] == [D2, D3]
+
+    # Before the links existed nothing is related
+    assert client.portal.call(lambda: GraphQueries.get_related_decisions(D1, USER_ID, depth=4, as_of=now - 7000)) == []
+
+
+def test_resync_write_keeps_only_a_later_close(client, linked_graph):
+    now = linked_graph
+    neo4j = get_neo4j_driver()
+    payload = {"id": D3, "user_id": USER_ID, "title": f"Decision {D3}", "description": None,
+               "is_active": True, "created_at": now - 10000, "valid_to": None, "updated_at": now - 2000}
+    neo4j.sync_batch([{**payload, "is_active": False, "valid_to": now - 1000}], [], [])
+
+    def state():
+        query = "MATCH (d:Decision {id: $id}) RETURN d.is_active AS active, d.valid_to AS valid_to"
+        return neo4j.execute_read(query, {"id": D3})
+
+    # A resync payload read before the soft delete
+    neo4j.sync_batch([payload], [], [], keep_closed=True)
+    assert state() == [{"active": False, "valid_to": now - 1000}]
+
+    # Reopened in Postgres after the close, but the reopen never reached the graph
+    neo4j.sync_batch([{**payload, "updated_at": now - 500}], [], [], keep_closed=True)
+    assert state() == [{"active": True, "valid_to": None}]
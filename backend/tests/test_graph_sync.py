@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from neo4j.exceptions import ServiceUnavailable
+
+from core.database import SessionLocal
+from core.graph_sync import GraphSyncWorker
+from core.models import GraphOutbox
+
+
+def outbox_rows(decision_id):
+    db = SessionLocal()
+    try:
+        return db.query(GraphOutbox).filter(GraphOutbox.decision_id == decision_id).order_by(GraphOutbox.id).all()
+    finally:
+        db.close()
+
+
+def test_outage_pauses_without_spending_attempts(client, auth_headers, monkeypatch):
+    decision_id = client.post("/api/decisions", json={"title": "Outage"}, headers=auth_headers).json()["id"]
+
+    def unreachable(rows):
+        raise ServiceUnavailable("down")
+
+    monkeypatch.setattr(GraphSyncWorker, "_apply", staticmethod(unreachable))
+    worker = GraphSyncWorker()
+    assert client.portal.call(worker.drain_once) == 0
+    assert worker.stats["outages"] == 1
+    # Paused: nothing is claimed until the backoff ends
+    assert client.portal.call(worker.drain_once) == 0
+    assert worker.stats["outages"] == 1
+
+    [row] = outbox_rows(decision_id)
+    assert row.attempts == 0 and row.failed_at is None and row.next_attempt_at is None
+
+
+def test_requeue_refreshes_dead_lettered_decision_rows(client, auth_headers):
+    decision_id = client.post("/api/decisions", json={"title": "Before"}, headers=auth_headers).json()["id"]
+    db = SessionLocal()
+    try:
+        db.query(GraphOutbox).filter(GraphOutbox.decision_id == decision_id).update(
+            {"attempts": 8, "failed_at": datetime.utcnow()}
+        )
+        db.commit()
+    finally:
+        db.close()
+    client.put(f"/api/decisions/{decision_id}", json={"title": "After"}, headers=auth_headers)
+
+    assert client.portal.call(lambda: GraphSyncWorker.requeue_failed(decision_id)) == 1
+    rows = outbox_rows(decision_id)
+    assert [(r.payload["title"], r.attempts, r.failed_at) for r in rows] == [("After", 0, None), ("After", 0, None)]
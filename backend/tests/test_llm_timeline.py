@@ -0,0 +1,19 @@
+import main
+from core.database import AsyncSessionLocal
+
+
+def test_timeline_comes_from_postgres(client, auth_headers, user):
+    """Neo4j is unreachable in tests; the LLM timeline must not come back empty"""
+    decision_id = client.post("/api/decisions", json={"title": "Timeline"}, headers=auth_headers).json()["id"]
+    event_ids = [
+        client.post("/api/events", json={"decision_id": decision_id, "event_type": event_type}, headers=auth_headers).json()["id"]
+        for event_type in ("proposed", "approved")
+    ]
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            return await main.load_decision_timeline(db, decision_id, user.id)
+
+    decision, events = client.portal.call(load)
+    assert decision.id == decision_id
+    assert [(e["event_id"], e["event_type"]) for e in events] == list(zip(event_ids, ("proposed", "approved")))
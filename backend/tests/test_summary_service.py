@@ -0,0 +1,93 @@
+import asyncio
+
+from core import models
+from core.database import AsyncSessionLocal, SessionLocal
+from core.llm_service import LLM_MODEL, PROMPT_VERSIONS
+from core.summary_service import RollingSummaryService, RollingSummaryJob
+
+
+def store_summary(decision_id: int, last_event_id: int, event_count: int):
+    db = SessionLocal()
+    try:
+        db.merge(models.DecisionSummary(
+            decision_id=decision_id,
+            summary="So far",
+            last_event_id=last_event_id,
+            event_count=event_count,
+            model=LLM_MODEL,
+            prompt_version=PROMPT_VERSIONS["rolling_summary"]
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_load_refolds_when_an_event_committed_late(client, auth_headers):
+    decision_id = client.post("/api/decisions", json={"title": "Late"}, headers=auth_headers).json()["id"]
+    event_ids = [
+        client.post("/api/events", json={"decision_id": decision_id, "event_type": "note"}, headers=auth_headers).json()["id"]
+        for _ in range(2)
+    ]
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            return await RollingSummaryService.load(db, decision_id)
+
+    # Summary covers both events: nothing to fold
+    store_summary(decision_id, event_ids[1], 2)
+    _, _, previous, events = client.portal.call(load)
+    assert previous == "So far" and events == []
+
+    # Summary moved past event 0 before it was visible: fold everything again
+    store_summary(decision_id, event_ids[1], 1)
+    _, _, previous, events = client.portal.call(load)
+    assert previous is None
+    assert [e["event_id"] for e in events] == event_ids
+
+
+def test_refresh_joins_the_one_in_flight(client, monkeypatch):
+    calls = []
+
+    async def slow_refresh(decision_id, llm=None):
+        calls.append(decision_id)
+        await asyncio.sleep(0.05)
+        return "Summary"
+
+    monkeypatch.setattr(RollingSummaryService, "refresh", staticmethod(slow_refresh))
+    job = RollingSummaryJob()
+
+    async def concurrent():
+        return await asyncio.gather(job.refresh(7), job.refresh(7))
+
+    assert client.portal.call(concurrent) == ["Summary", "Summary"]
+    assert calls == [7]
+    assert job.get_stats()["shared"] == 1
+    assert not job.is_refreshing(7)
+
+
+def test_refresh_joins_a_streamed_one(client, monkeypatch):
+    calls = []
+
+    async def slow_stream(decision_id, llm=None):
+        calls.append(decision_id)
+        for token in ("Rolling ", "summary"):
+            await asyncio.sleep(0.02)
+            yield token
+
+    monkeypatch.setattr(RollingSummaryService, "stream_refresh", staticmethod(slow_stream))
+    job = RollingSummaryJob()
+
+    async def concurrent():
+        async def streamed():
+            return [token async for token in job.stream_refresh(7)]
+
+        async def joined():
+            await asyncio.sleep(0.01)
+            return await job.refresh(7)
+
+        return await asyncio.gather(streamed(), joined())
+
+    assert client.portal.call(concurrent) == [["Rolling ", "summary"], "Rolling summary"]
+    assert calls == [7]
+    assert job.get_stats()["shared"] == 1
+    assert not job.is_refreshing(7)
@@ -5,30 +5,17 @@ import graphApiService from '../services/graphApi';
 export default function AIInsights({ decision_id }) {
   const [activeTab, setActiveTab] = useState('summary');
 
-  // Fetch all AI insights
-  const { data: summary } = useQuery({
-    queryKey: ['summary', decision_id],
-    queryFn: () => graphApiService.getDecisionSummary(decision_id),
+  // Fetch all AI insights in one request (one model call)
+  const { data: insights } = useQuery({
+    queryKey: ['insights', decision_id],
+    queryFn: () => graphApiService.getDecisionInsights(decision_id),
     enabled: !!decision_id,
   });
 
-  const { data: risks } = useQuery({
-    queryKey: ['risks', decision_id],
-    queryFn: () => graphApiService.analyzeDecisionRisks(decision_id),
-    enabled: !!decision_id,
-  });
-
-  const { data: nextSteps } = useQuery({
-    queryKey: ['nextSteps', decision_id],
-    queryFn: () => graphApiService.generateNextSteps(decision_id),
-    enabled: !!decision_id,
-  });
-
-  const { data: quality } = useQuery({
-    queryKey: ['quality', decision_id],
-    queryFn: () => graphApiService.evaluateDecisionQuality(decision_id),
-    enabled: !!decision_id,
-  });
+  const summary = insights;
+  const risks = insights;
+  const nextSteps = insights;
+  const quality = insights;
 
   return (
     <div className="mt-4 p-4 bg-gradient-to-r from-purple-50 to-pink-50 rounded-lg border border-purple-200">
@@ -61,7 +48,7 @@ export default function AIInsights({ decision_id }) {
       <div className="bg-white p-3 rounded border border-purple-100 min-h-20">
         {activeTab === 'summary' && summary && (
           <div>
-            <p className="text-sm text-gray-700">{summary.summary}</p>
+            <p className="text-sm text-gray-700">{summary.summary ?? summary.error}</p>
           </div>
         )}
 
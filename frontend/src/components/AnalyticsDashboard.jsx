@@ -2,20 +2,15 @@ import { useQuery } from '@tanstack/react-query';
 import graphApiService from '../services/graphApi';
 
 export default function AnalyticsDashboard() {
-  const { data: overview, isLoading: overviewLoading } = useQuery({
-    queryKey: ['analyticsOverview'],
-    queryFn: () => graphApiService.getAnalyticsOverview(),
+  // One request for the whole dashboard payload
+  const { data: dashboard, isLoading: overviewLoading } = useQuery({
+    queryKey: ['dashboard'],
+    queryFn: () => graphApiService.getDashboard(),
   });
 
-  const { data: eventTypes } = useQuery({
-    queryKey: ['eventTypeDistribution'],
-    queryFn: () => graphApiService.getEventTypeDistribution(),
-  });
-
-  const { data: statusSummary } = useQuery({
-    queryKey: ['statusSummary'],
-    queryFn: () => graphApiService.getStatusSummary(),
-  });
+  const overview = dashboard?.overview;
+  const eventTypes = dashboard?.event_types;
+  const statusSummary = dashboard?.status_summary;
 
   if (overviewLoading) {
     return <div className="p-4 text-center text-gray-600">Loading analytics...</div>;
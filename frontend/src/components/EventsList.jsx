@@ -1,7 +1,14 @@
 import { useDecisionEvents, useDeleteEvent } from '../hooks/useDecisions';
 
 export default function EventsList({ decision_id }) {
-  const { data: events = [], isLoading, error } = useDecisionEvents(decision_id);
+  const {
+    data: events = [],
+    isLoading,
+    error,
+    hasNextPage,
+    fetchNextPage,
+    isFetchingNextPage,
+  } = useDecisionEvents(decision_id);
   const deleteEventMutation = useDeleteEvent();
 
   if (isLoading) return <div className="text-sm text-gray-500">Loading events...</div>;
@@ -41,6 +48,15 @@ export default function EventsList({ decision_id }) {
           </button>
         </div>
       ))}
+      {hasNextPage && (
+        <button
+          onClick={() => fetchNextPage()}
+          disabled={isFetchingNextPage}
+          className="w-full py-1 text-xs text-blue-700 bg-blue-50 rounded hover:bg-blue-100 disabled:opacity-50"
+        >
+          {isFetchingNextPage ? 'Loading...' : 'Load more events'}
+        </button>
+      )}
     </div>
   );
 }
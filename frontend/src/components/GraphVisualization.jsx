@@ -46,7 +46,7 @@ const GraphVisualization = memo(({ decision_id }) => {
 
       console.log(`📊 Loading graph data for decision: ${decision_id}${isPolling ? ' (polling)' : ''}`);
 
-      const timeline = await graphApiService.getDecisionTimeline(decision_id);
+      const timeline = await graphApiService.getFullDecisionTimeline(decision_id);
       console.log('✅ Timeline loaded:', timeline);
 
       const graphStats = await graphApiService.getGraphStats();
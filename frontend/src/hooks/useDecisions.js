@@ -1,19 +1,33 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { apiService } from '../services/api'
 
 // ==================== QUERIES (Read) ====================
 
 /**
- * Fetch all decisions with pagination
- * @param {number} skip - Records to skip
- * @param {number} limit - Max records to return
+ * Cursor-paginated list: data is every page loaded so far, flattened.
+ * Call fetchNextPage() to load more while hasNextPage is true.
  */
-export function useDecisions(skip = 0, limit = 10) {
-  return useQuery({
-    queryKey: ['decisions', skip, limit],
-    queryFn: () => apiService.getDecisions(skip, limit),
-    staleTime: 1000 * 60 * 2, // Cache for 2 minutes
+function usePagedQuery(queryKey, fetchPage, options = {}) {
+  const query = useInfiniteQuery({
+    queryKey,
+    queryFn: ({ pageParam }) => fetchPage(pageParam),
+    initialPageParam: null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined,
+    ...options,
   })
+  return { ...query, data: query.data?.pages.flatMap((page) => page.items) }
+}
+
+/**
+ * Fetch decisions, oldest first, a page at a time
+ * @param {number} limit - Decisions per page
+ */
+export function useDecisions(limit = 20) {
+  return usePagedQuery(
+    ['decisions', limit],
+    (cursor) => apiService.getDecisions(cursor, limit),
+    { staleTime: 1000 * 60 * 2 } // Cache for 2 minutes
+  )
 }
 
 /**
@@ -89,13 +103,13 @@ export function useDeleteDecision() {
 // ==================== EVENT HOOKS ====================
 
 /**
- * Fetch all events
+ * Fetch all events, a page at a time
  */
-export function useEvents(skip = 0, limit = 10) {
-  return useQuery({
-    queryKey: ['events', skip, limit],
-    queryFn: () => apiService.getEvents(skip, limit),
-  })
+export function useEvents(limit = 10) {
+  return usePagedQuery(
+    ['events', limit],
+    (cursor) => apiService.getEvents(cursor, limit)
+  )
 }
 
 /**
@@ -121,14 +135,14 @@ export function useCreateEvent() {
 }
 
 /**
- * Fetch all events for a specific decision (temporal timeline)
+ * Fetch the events of a specific decision (temporal timeline), a page at a time
  */
-export function useDecisionEvents(decision_id, skip = 0, limit = 50) {
-  return useQuery({
-    queryKey: ['decisionEvents', decision_id, skip, limit],
-    queryFn: () => apiService.getDecisionEvents(decision_id, skip, limit),
-    enabled: !!decision_id, // Only run if decision_id is provided
-  })
+export function useDecisionEvents(decision_id, limit = 50) {
+  return usePagedQuery(
+    ['decisionEvents', decision_id, limit],
+    (cursor) => apiService.getDecisionEvents(decision_id, cursor, limit),
+    { enabled: !!decision_id } // Only run if decision_id is provided
+  )
 }
 
 
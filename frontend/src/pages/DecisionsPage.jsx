@@ -12,7 +12,14 @@ export default function DecisionsPage() {
   const [expandedGraphs, setExpandedGraphs] = useState(new Set());
 
   // Fetch decisions from database
-  const { data: decisions = [], isLoading, error } = useDecisions();
+  const {
+    data: decisions = [],
+    isLoading,
+    error,
+    hasNextPage,
+    fetchNextPage,
+    isFetchingNextPage,
+  } = useDecisions();
   
   // Create decision mutation
   const createMutation = useCreateDecision();
@@ -172,6 +179,15 @@ export default function DecisionsPage() {
                       </div>
                     </div>
                   ))}
+                  {hasNextPage && (
+                    <button
+                      onClick={() => fetchNextPage()}
+                      disabled={isFetchingNextPage}
+                      className="w-full py-2 text-sm text-blue-700 bg-blue-50 rounded hover:bg-blue-100 disabled:opacity-50"
+                    >
+                      {isFetchingNextPage ? 'Loading...' : 'Load more decisions'}
+                    </button>
+                  )}
                 </div>
               )}
             </div>
@@ -18,6 +18,12 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// List endpoints return a bare array; the next page's cursor comes in X-Next-Cursor
+const toPage = (response) => ({
+  items: response.data,
+  nextCursor: response.headers['x-next-cursor'] || null,
+});
+
 export const apiService = {
   // Health check
   async getHealth() {
@@ -35,11 +41,11 @@ export const apiService = {
     return response.data;
   },
 
-  async getDecisions(skip = 0, limit = 10) {
+  async getDecisions(cursor = null, limit = 20) {
     const response = await api.get('/api/decisions', {
-      params: { skip, limit }
+      params: { cursor, limit }
     });
-    return response.data;
+    return toPage(response);
   },
 
   async getDecision(id) {
@@ -77,11 +83,11 @@ export const apiService = {
     return response.data;
   },
 
-  async getEvents(skip = 0, limit = 10) {
+  async getEvents(cursor = null, limit = 10) {
     const response = await api.get('/api/events', {
-      params: { skip, limit }
+      params: { cursor, limit }
     });
-    return response.data;
+    return toPage(response);
   },
 
   async getRecentEvents(limit = 10) {
@@ -92,11 +98,11 @@ export const apiService = {
   },
 
   // Get all events for a specific decision (temporal timeline)
-  async getDecisionEvents(decision_id, skip = 0, limit = 50) {
+  async getDecisionEvents(decision_id, cursor = null, limit = 50) {
     const response = await api.get(`/api/decisions/${decision_id}/events`, {
-      params: { skip, limit }
+      params: { cursor, limit }
     });
-    return response.data;
+    return toPage(response);
   },
 
   // Delete an event
@@ -10,11 +10,24 @@ export const graphApiService = {
     return response.data;
   },
 
-  async getDecisionTimeline(decision_id) {
-    const response = await api.get(`/api/graph/timeline/${decision_id}`);
+  async getDecisionTimeline(decision_id, params = {}) {
+    const response = await api.get(`/api/graph/timeline/${decision_id}`, { params });
     return response.data;
   },
 
+  // The whole timeline: follows next_cursor across pages of up to 1000 events
+  async getFullDecisionTimeline(decision_id) {
+    const first = await graphApiService.getDecisionTimeline(decision_id, { limit: 1000 });
+    const timeline = [...first.timeline];
+    let cursor = first.next_cursor;
+    while (cursor) {
+      const page = await graphApiService.getDecisionTimeline(decision_id, { limit: 1000, cursor });
+      timeline.push(...page.timeline);
+      cursor = page.next_cursor;
+    }
+    return { ...first, timeline, event_count: timeline.length, next_cursor: null };
+  },
+
   async getRelatedDecisions(decision_id) {
     const response = await api.get(`/api/graph/related-decisions/${decision_id}`);
     return response.data;
@@ -37,6 +50,11 @@ export const graphApiService = {
     return response.data;
   },
 
+  async getDecisionInsights(decision_id) {
+    const response = await api.get(`/api/llm/insights/${decision_id}`);
+    return response.data;
+  },
+
   async getDecisionSummary(decision_id) {
     const response = await api.get(`/api/llm/summarize/${decision_id}`);
     return response.data;
@@ -83,6 +101,13 @@ export const graphApiService = {
     const response = await api.get('/api/analytics/status-summary');
     return response.data;
   },
+
+  async getDashboard(days = 30) {
+    const response = await api.get('/api/dashboard', {
+      params: { days },
+    });
+    return response.data;
+  },
 };
 
 export default graphApiService;